@@ -1,133 +1,190 @@
 import os
+import sys
 import logging
+import importlib
 from flask import Flask, render_template, send_from_directory
 from werkzeug.middleware.proxy_fix import ProxyFix
 from database import db
+from config import Config
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
-
-# Create the app instance directly for Replit compatibility
-app = Flask(__name__)
-app.secret_key = os.environ.get("SESSION_SECRET", "govtracker2-secret-key")
-app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
-
-# Database configuration
-database_url = os.environ.get('DATABASE_URL', 'postgresql://localhost/govtracker2')
-if database_url.startswith('postgres://'):
-    database_url = database_url.replace('postgres://', 'postgresql://', 1)
-
-app.config["SQLALCHEMY_DATABASE_URI"] = database_url
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-    "connect_args": {"sslmode": "prefer"}
-}
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-# Initialize database
-db.init_app(app)
-
-# Import models to ensure tables are created
-try:
-    from models import curator, activity, discord_server, response_tracking, task_report, user
-    logging.info("Models imported successfully")
-except ImportError as e:
-    logging.warning(f"Could not import models: {e}")
-
-# Register blueprints (with error handling for missing routes)
-try:
-    from routes.dashboard import dashboard_bp
-    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
-except ImportError:
-    logging.warning("Dashboard blueprint not found")
-    
-try:
-    from routes.curators import curators_bp
-    app.register_blueprint(curators_bp, url_prefix='/api/curators')
-except ImportError:
-    logging.warning("Curators blueprint not found")
-    
-try:
-    from routes.activities import activities_bp
-    app.register_blueprint(activities_bp, url_prefix='/api/activities')
-except ImportError:
-    logging.warning("Activities blueprint not found")
-    
-try:
-    from routes.servers import servers_bp
-    app.register_blueprint(servers_bp, url_prefix='/api/servers')
-except ImportError:
-    logging.warning("Servers blueprint not found")
-    
-try:
-    from routes.task_reports import task_reports_bp
-    app.register_blueprint(task_reports_bp, url_prefix='/api/task-reports')
-except ImportError:
-    logging.warning("Task reports blueprint not found")
-    
-try:
-    from routes.settings import settings_bp
-    app.register_blueprint(settings_bp, url_prefix='/api/settings')
-except ImportError:
-    logging.warning("Settings blueprint not found")
-    
-try:
-    from routes.backup import backup_bp
-    app.register_blueprint(backup_bp, url_prefix='/api/backup')
-except ImportError:
-    logging.warning("Backup blueprint not found")
-
-# Static file serving
-@app.route('/static/<path:filename>')
-def serve_static(filename):
-    return send_from_directory('static', filename)
-
-# Main route to serve React app
-@app.route('/')
-@app.route('/<path:path>')
-def serve_react_app(path=''):
+# Blueprints registered by the 'api' component: (module, attribute, URL prefix)
+BLUEPRINTS = [
+    ('routes.dashboard', 'dashboard_bp', '/api/dashboard'),
+    ('routes.curators', 'curators_bp', '/api/curators'),
+    ('routes.activities', 'activities_bp', '/api/activities'),
+    ('routes.servers', 'servers_bp', '/api/servers'),
+    ('routes.task_reports', 'task_reports_bp', '/api/task-reports'),
+    ('routes.settings', 'settings_bp', '/api/settings'),
+    ('routes.backup', 'backup_bp', '/api/backup'),
+    ('routes.system', 'system_bp', '/api/system'),
+]
+
+
+def create_app(components=None):
+    """Build the Flask app with only the requested components.
+
+    - ``api``: REST blueprints and the React frontend routes
+    - ``scheduler``: APScheduler jobs (ratings, backups)
+    - ``bot``: the Discord bot in a background thread (BOT_MODE=embedded)
+    - ``migrations``: db.create_all() and additive schema upgrades
+
+    Defaults to Config.APP_COMPONENTS. The scheduler and the bot run in one
+    process only, chosen by leader election. Schema work is left out of
+    normal startup; run ``python -m utils.schema`` after upgrading instead.
+    """
+    components = set(Config.APP_COMPONENTS if components is None else components)
+
+    # Configure logging
+    logging.basicConfig(level=Config.LOG_LEVEL)
+
+    app = Flask(__name__)
+    app.secret_key = os.environ.get("SESSION_SECRET", "govtracker2-secret-key")
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
+
+    # Database configuration
+    database_url = os.environ.get('DATABASE_URL', 'postgresql://localhost/govtracker2')
+    if database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_recycle": 300,
+        "pool_pre_ping": True
+    }
+    if database_url.startswith('postgresql'):
+        # sslmode is a libpq option; other drivers (SQLite for local runs, MySQL) reject it
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"]["connect_args"] = {"sslmode": "prefer"}
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+    # Initialize database
+    db.init_app(app)
+
+    # Import models so every mapper and relationship is configured
     try:
-        return render_template('index.html')
-    except:
-        return send_from_directory('static', 'index.html')
-
-# Initialize scheduler (with error handling)
-try:
-    from scheduler import init_scheduler
-    init_scheduler(app)
-except ImportError:
-    logging.warning("Scheduler not available")
-
-# Create tables within app context
-with app.app_context():
+        import models  # noqa: F401
+    except ImportError as e:
+        logging.warning(f"Could not import models: {e}")
+
+    if 'api' in components:
+        register_api(app)
+
+    if 'migrations' in components:
+        upgrade_database(app)
+
+    singletons = components & {'scheduler', 'bot'}
+    if singletons:
+        start_singleton_components(app, singletons)
+
+    logging.info(f"App created with components: {', '.join(sorted(components)) or 'none'}")
+    return app
+
+
+def register_api(app):
+    """Register REST blueprints (imported only when the API is served) and frontend routes"""
+    for module_name, attribute, url_prefix in BLUEPRINTS:
+        try:
+            module = importlib.import_module(module_name)
+            app.register_blueprint(getattr(module, attribute), url_prefix=url_prefix)
+        except ImportError:
+            logging.warning(f"{module_name} blueprint not found")
+
+    # Static file serving
+    @app.route('/static/<path:filename>')
+    def serve_static(filename):
+        return send_from_directory('static', filename)
+
+    # Main route to serve React app
+    @app.route('/')
+    @app.route('/<path:path>')
+    def serve_react_app(path=''):
+        try:
+            return render_template('index.html')
+        except:
+            return send_from_directory('static', 'index.html')
+
+
+def upgrade_database(app):
+    """Create missing tables and apply additive schema upgrades"""
+    with app.app_context():
+        try:
+            db.create_all()
+            from utils.schema import upgrade_schema, backfill_daily_rollup
+            upgrade_schema()
+            backfill_daily_rollup()
+            logging.info("Database tables created successfully")
+        except Exception as e:
+            logging.error(f"Failed to create database tables: {e}")
+
+
+def start_embedded_bot(app):
+    """Start the Discord bot in a background thread (BOT_MODE=embedded)"""
     try:
-        db.create_all()
-        logging.info("Database tables created successfully")
+        discord_token = os.environ.get('DISCORD_TOKEN')
+        if Config.BOT_MODE != 'embedded':
+            logging.info(f"Discord bot not started - BOT_MODE is {Config.BOT_MODE}")
+        elif discord_token and discord_token != 'your-discord-bot-token':
+            from discord_bot.bot import start_discord_bot
+            import threading
+
+            def run_discord_bot():
+                try:
+                    start_discord_bot(app=app)
+                except Exception as e:
+                    logging.error(f"Discord bot failed to start: {e}")
+
+            # Start Discord bot in separate thread
+            discord_thread = threading.Thread(target=run_discord_bot, daemon=True)
+            discord_thread.start()
+            logging.info("Discord bot thread started")
+        else:
+            logging.info("Discord bot not started - no token provided")
     except Exception as e:
-        logging.error(f"Failed to create database tables: {e}")
+        logging.warning(f"Could not initialize Discord bot: {e}")
 
-# Initialize Discord bot in background (with error handling)
-try:
-    discord_token = os.environ.get('DISCORD_TOKEN')
-    if discord_token and discord_token != 'your-discord-bot-token':
-        from discord_bot.bot import start_discord_bot
-        import threading
 
-        def run_discord_bot():
+def start_singleton_components(app, components):
+    """Run the scheduler and/or embedded bot in one process only"""
+
+    def start_singletons():
+        if 'scheduler' in components:
+            try:
+                from scheduler import init_scheduler
+                init_scheduler(app)
+            except ImportError:
+                logging.warning("Scheduler not available")
+        if 'bot' in components:
+            start_embedded_bot(app)
+
+    def stop_singletons():
+        if 'scheduler' in components:
             try:
-                start_discord_bot()
-            except Exception as e:
-                logging.error(f"Discord bot failed to start: {e}")
-
-        # Start Discord bot in separate thread
-        discord_thread = threading.Thread(target=run_discord_bot, daemon=True)
-        discord_thread.start()
-        logging.info("Discord bot thread started")
+                from scheduler import stop_scheduler
+                stop_scheduler()
+            except ImportError:
+                pass
+        # Only stop the bot if it was started (importing discord.py just to find out is slow)
+        bot_module = sys.modules.get('discord_bot.bot')
+        if 'bot' in components and bot_module is not None:
+            bot_module.stop_discord_bot()
+
+    # Every web worker creates the app; only the elected leader runs the singletons
+    if Config.LEADER_ELECTION:
+        import atexit
+        from utils.leader import start_leader_election
+        atexit.register(start_leader_election(app, start_singletons, stop_singletons).stop)
     else:
-        logging.info("Discord bot not started - no token provided")
-except Exception as e:
-    logging.warning(f"Could not initialize Discord bot: {e}")
+        start_singletons()
+
+
+def __getattr__(name):
+    # `from app import app` builds the default app on first use, so importing
+    # create_app or db from this module stays cheap
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    create_app().run(host='0.0.0.0', port=5000, debug=True)
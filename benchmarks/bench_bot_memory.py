@@ -0,0 +1,148 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Measure the bot's memory footprint under each discord.py cache profile.
+
+Usage: python benchmarks/bench_bot_memory.py [--guilds 50] [--messages 100000]
+
+Each profile runs in a fresh subprocess. It builds a discord.Client with
+the profile's intents and caches, then feeds gateway payloads straight
+into its connection state (GUILD_CREATE with channels and members,
+MESSAGE_CREATE and MESSAGE_REACTION_ADD), so no network or token is
+needed. Reports RSS after startup, after guilds load and after the
+message workload, plus what discord.py ended up caching.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TIMESTAMP = '2025-01-01T00:00:00+00:00'
+
+
+def rss_mb():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def guild_payload(guild_id, channels, members):
+    return {
+        'id': str(guild_id),
+        'name': f'guild-{guild_id}',
+        'flags': 0,
+        'member_count': members,
+        'channels': [
+            {'id': str(guild_id * 100 + i), 'type': 0, 'name': f'channel-{i}', 'position': i,
+             'permission_overwrites': [], 'guild_id': str(guild_id)}
+            for i in range(channels)
+        ],
+        'members': [
+            {'user': {'id': str(10000 + m), 'username': f'user{m}', 'discriminator': '0', 'avatar': None},
+             'flags': 0, 'roles': [], 'joined_at': TIMESTAMP, 'deaf': False, 'mute': False}
+            for m in range(members)
+        ],
+        'roles': [{'id': str(guild_id), 'name': '@everyone', 'permissions': '0', 'position': 0,
+                   'color': 0, 'hoist': False, 'managed': False, 'mentionable': False}],
+        'emojis': [], 'stickers': [], 'features': [], 'voice_states': [], 'presences': [],
+        'threads': [], 'stage_instances': [], 'guild_scheduled_events': []
+    }
+
+
+def message_payload(message_id, guild_id, channel_id, user_id):
+    return {
+        'id': str(message_id), 'channel_id': str(channel_id), 'guild_id': str(guild_id),
+        'author': {'id': str(user_id), 'username': f'user{user_id}', 'discriminator': '0', 'avatar': None},
+        'member': {'flags': 0, 'roles': [], 'joined_at': TIMESTAMP, 'deaf': False, 'mute': False},
+        'content': 'Нужна помощь куратора с отчётом по заданию, посмотрите пожалуйста',
+        'timestamp': TIMESTAMP, 'edited_timestamp': None, 'tts': False, 'mention_everyone': False,
+        'mentions': [], 'mention_roles': [], 'attachments': [], 'embeds': [], 'pinned': False,
+        'type': 0, 'flags': 0
+    }
+
+
+def reaction_payload(message_id, guild_id, channel_id, user_id):
+    return {
+        'message_id': str(message_id), 'channel_id': str(channel_id), 'guild_id': str(guild_id),
+        'user_id': str(user_id), 'emoji': {'id': None, 'name': '👍'}, 'burst': False, 'type': 0,
+        'member': {'user': {'id': str(user_id), 'username': f'user{user_id}', 'discriminator': '0', 'avatar': None},
+                   'flags': 0, 'roles': [], 'joined_at': TIMESTAMP, 'deaf': False, 'mute': False}
+    }
+
+
+async def run_profile(name, guilds, channels, members, messages):
+    import discord
+    from discord_bot.profiles import get_profile
+
+    profile = get_profile(name)
+    client = discord.Client(**profile.client_options())
+    state = client._connection
+    gc.collect()
+    result = {'profile': profile.describe(), 'rss_start_mb': rss_mb()}
+
+    guild_ids = [1000000 + g for g in range(guilds)]
+    for guild_id in guild_ids:
+        state.parse_guild_create(guild_payload(guild_id, channels, members))
+    gc.collect()
+    result['rss_guilds_mb'] = rss_mb()
+
+    started = time.perf_counter()
+    for n in range(messages):
+        guild_id = guild_ids[n % guilds]
+        channel_id = guild_id * 100 + n % channels
+        user_id = 10000 + n % members
+        message_id = 10 ** 17 + n
+        state.parse_message_create(message_payload(message_id, guild_id, channel_id, user_id))
+        if n % 5 == 0:
+            state.parse_message_reaction_add(reaction_payload(message_id, guild_id, channel_id, 10000 + (n + 1) % members))
+    result['events_per_sec'] = round(messages * 1.2 / (time.perf_counter() - started))
+    gc.collect()
+    result['rss_end_mb'] = rss_mb()
+    result['cached_messages'] = len(state._messages or [])
+    result['cached_users'] = len(state._users)
+    result['cached_members'] = sum(len(guild._members) for guild in client.guilds)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--guilds', type=int, default=50)
+    parser.add_argument('--channels', type=int, default=20, help='text channels per guild')
+    parser.add_argument('--members', type=int, default=200, help='members per guild in GUILD_CREATE')
+    parser.add_argument('--messages', type=int, default=100000)
+    parser.add_argument('--profiles', default='default,lean')
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = asyncio.run(run_profile(args.child, args.guilds, args.channels, args.members, args.messages))
+        print(json.dumps(result))
+        return
+
+    print(f"{args.guilds} guilds x {args.channels} channels x {args.members} members, "
+          f"{args.messages:,} messages (+20% reactions)\n")
+    print(f"{'profile':<10}{'start MB':>10}{'guilds MB':>11}{'end MB':>10}{'delta MB':>10}"
+          f"{'messages':>10}{'members':>9}{'users':>8}{'events/s':>10}")
+    for name in args.profiles.split(','):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', name,
+             '--guilds', str(args.guilds), '--channels', str(args.channels),
+             '--members', str(args.members), '--messages', str(args.messages)],
+            capture_output=True, text=True, check=True, cwd=ROOT
+        ).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{name:<10}{r['rss_start_mb']:>10.1f}{r['rss_guilds_mb']:>11.1f}{r['rss_end_mb']:>10.1f}"
+              f"{r['rss_end_mb'] - r['rss_start_mb']:>10.1f}{r['cached_messages']:>10}{r['cached_members']:>9}"
+              f"{r['cached_users']:>8}{r['events_per_sec']:>10}")
+        print(f"          {r['profile']}")
+
+
+if __name__ == '__main__':
+    main()
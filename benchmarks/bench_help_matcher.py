@@ -0,0 +1,85 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Benchmark help request detection: keyword loop vs compiled matcher.
+
+Usage: python benchmarks/bench_help_matcher.py [--messages 10000] [--keywords 4]
+
+Reports messages/sec for the previous per-keyword ``in`` loop (plus role
+mention check) and for HelpRequestMatcher over the same synthetic stream.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.help_matcher import HelpRequestMatcher  # noqa: E402
+
+WORDS = [
+    'привет', 'как', 'дела', 'сервер', 'отчёт', 'задание', 'проверь', 'сегодня',
+    'hello', 'report', 'task', 'done', 'please', 'check', 'thanks', 'server'
+]
+ROLE_ID = '1329213001814773781'
+
+
+def make_messages(count, keywords, help_ratio=0.05):
+    random.seed(42)
+    messages = []
+    for _ in range(count):
+        words = random.choices(WORDS, k=random.randint(3, 40))
+        roll = random.random()
+        if roll < help_ratio:
+            words.insert(random.randrange(len(words) + 1), random.choice(keywords).capitalize())
+        elif roll < help_ratio * 1.5:
+            words.append(f'<@&{ROLE_ID}>')
+        messages.append(' '.join(words))
+    return messages
+
+
+def loop_detector(keywords, role_id):
+    mention = f'<@&{role_id}>'
+
+    def detect(content):
+        content_lower = content.lower()
+        is_help_request = any(keyword in content_lower for keyword in keywords)
+        return is_help_request or mention in content
+
+    return detect
+
+
+def run(name, detect, messages, rounds):
+    best = None
+    hits = 0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hits = sum(1 for content in messages if detect(content))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    rate = len(messages) / best
+    print(f"{name:<18} {rate:>12,.0f} msg/s  {best * 1000:8.2f} ms per {len(messages):,}  ({hits} help requests)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=10000)
+    parser.add_argument('--keywords', type=int, default=4, help='number of keywords per server')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    keywords = ['куратор', 'curator', 'help', 'помощь']
+    keywords += [f'keyword{i}' for i in range(max(0, args.keywords - len(keywords)))]
+    keywords = keywords[:args.keywords]
+    messages = make_messages(args.messages, keywords)
+
+    matcher = HelpRequestMatcher(keywords, ROLE_ID)
+    baseline = run('keyword loop', loop_detector(keywords, ROLE_ID), messages, args.rounds)
+    compiled = run('compiled matcher', matcher.is_help_request, messages, args.rounds)
+
+    print(f"speedup: {compiled / baseline:.2f}x; target 10,000 msg/s "
+          f"{'met' if compiled >= 10000 else 'NOT met'}")
+
+
+if __name__ == '__main__':
+    main()
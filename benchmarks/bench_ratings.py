@@ -0,0 +1,133 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Benchmark the hourly rating recompute: per-curator loop vs grouped aggregates.
+
+Usage: python benchmarks/bench_ratings.py [--curators 2000] [--activities 100] [--chunk-size 1000]
+
+Seeds a temporary SQLite database with synthetic curators, activities and
+responses, then times the previous loop (calculate_curator_rating per
+curator, ORM commit) and update_all_ratings, counting SQL statements for
+each. Both must produce the same points and levels. BENCH_DATABASE_URL
+selects another database; all its tables are dropped, so never point it
+at real data.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATABASE_URL'] = os.environ.get('BENCH_DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'govtracker_bench_ratings.db')}")
+os.environ['LOG_LEVEL'] = 'WARNING'
+
+from sqlalchemy import event, insert  # noqa: E402
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+from database import db  # noqa: E402
+from models.activity import Activity  # noqa: E402
+from models.curator import Curator  # noqa: E402
+from models.discord_server import DiscordServer  # noqa: E402
+from models.response_tracking import ResponseTracking  # noqa: E402
+from utils.rating import calculate_curator_rating, update_all_ratings  # noqa: E402
+
+
+def seed(curators, activities_per_curator):
+    random.seed(42)
+    db.drop_all()
+    db.create_all()
+    server = DiscordServer(server_id='1', name='Bench')
+    db.session.add(server)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    db.session.execute(insert(Curator), [
+        {'discord_id': str(1000 + i), 'name': f'curator{i}', 'total_points': 0, 'rating_level': 'Ужасно'}
+        for i in range(curators)
+    ])
+    curator_ids = [row.id for row in db.session.query(Curator.id)]
+
+    types = list(Config.RATING_POINTS)
+    activity_rows = []
+    response_rows = []
+    for curator_id in curator_ids:
+        for _ in range(random.randint(0, activities_per_curator * 2)):
+            activity_type = random.choice(types)
+            activity_rows.append({
+                'curator_id': curator_id, 'server_id': server.id, 'type': activity_type,
+                'points': Config.RATING_POINTS[activity_type],
+                'timestamp': now - timedelta(days=random.uniform(0, 45))
+            })
+        for _ in range(random.randint(0, activities_per_curator // 5)):
+            mention = now - timedelta(days=random.uniform(0, 45))
+            seconds = random.choice([random.randint(5, 60), random.randint(61, 299), random.randint(300, 3600)])
+            response_rows.append({
+                'curator_id': curator_id, 'server_id': server.id, 'mention_timestamp': mention,
+                'response_timestamp': mention + timedelta(seconds=seconds), 'response_time_seconds': seconds
+            })
+    db.session.execute(insert(Activity), activity_rows)
+    db.session.execute(insert(ResponseTracking), response_rows)
+    db.session.commit()
+    return len(activity_rows), len(response_rows)
+
+
+def reset_ratings():
+    db.session.query(Curator).update({'total_points': 0, 'rating_level': 'Ужасно'})
+    db.session.commit()
+
+
+def snapshot():
+    return {row.id: (row.total_points, row.rating_level)
+            for row in db.session.query(Curator.id, Curator.total_points, Curator.rating_level)}
+
+
+def loop_update():
+    for curator in Curator.query.all():
+        rating_data = calculate_curator_rating(curator.id)
+        curator.total_points = rating_data['total_points']
+        curator.rating_level = rating_data['level']
+    db.session.commit()
+
+
+def run(name, func):
+    reset_ratings()
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    event.remove(db.engine, 'before_cursor_execute', count)
+    print(f"{name:<22} {elapsed * 1000:>10.1f} ms  {statements[0]:>7} statements")
+    return snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--curators', type=int, default=2000)
+    parser.add_argument('--activities', type=int, default=100, help='average activities per curator')
+    parser.add_argument('--chunk-size', type=int, default=Config.RATING_UPDATE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    app = create_app(components=[])
+    with app.app_context():
+        activities, responses = seed(args.curators, args.activities)
+        print(f"{args.curators} curators, {activities} activities, {responses} responses\n")
+
+        expected = run('per-curator loop', loop_update)
+        actual = run(f'bulk (chunk {args.chunk_size})', lambda: update_all_ratings(chunk_size=args.chunk_size))
+
+        mismatches = [curator_id for curator_id in expected if expected[curator_id] != actual.get(curator_id)]
+        if mismatches:
+            print(f"\n{len(mismatches)} curators differ, e.g. {mismatches[0]}: "
+                  f"{expected[mismatches[0]]} vs {actual.get(mismatches[0])}")
+            sys.exit(1)
+        print("\nSame points and levels for every curator")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Measure cold start time of the app for different component sets.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--importtime]
+
+Each scenario runs in a fresh interpreter (so nothing is cached between
+runs) and times `import app` plus `create_app(components)`. The total
+also includes interpreter startup. --importtime prints the slowest
+imports of the full startup, from `python -X importtime`.
+
+Uses DATABASE_URL if set, otherwise a temporary SQLite database.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = [
+    ('import only', None),
+    ('no components', []),
+    ('api', ['api']),
+    ('api + scheduler', ['api', 'scheduler']),
+    ('api + migrations', ['api', 'migrations']),
+    ('everything', ['api', 'scheduler', 'bot', 'migrations']),
+]
+
+CHILD = '''
+import time
+started = time.perf_counter()
+import app
+components = {components!r}
+if components is not None:
+    app.create_app(components)
+print(round((time.perf_counter() - started) * 1000, 1))
+'''
+
+
+def child_env():
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'govtracker_bench_startup.db')}")
+    env['LOG_LEVEL'] = 'WARNING'
+    env.pop('DISCORD_TOKEN', None)  # never connect the bot
+    env['PYTHONPATH'] = ROOT
+    return env
+
+
+def run_scenario(components, runs):
+    inner = []
+    total = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', CHILD.format(components=components)],
+            capture_output=True, text=True, check=True, cwd=ROOT, env=child_env()
+        ).stdout
+        total.append((time.perf_counter() - started) * 1000)
+        inner.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(inner), statistics.median(total)
+
+
+def print_importtime(limit=15):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD.format(components=SCENARIOS[-1][1])],
+        capture_output=True, text=True, cwd=ROOT, env=child_env()
+    )
+    top_level = []
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package", nested imports indented
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name[1:].rstrip()
+        if not name.startswith(' '):
+            top_level.append((int(cumulative_us), name))
+    print("\nSlowest top-level imports ('everything'):")
+    for cumulative_us, name in sorted(top_level, reverse=True)[:limit]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--importtime', action='store_true')
+    args = parser.parse_args()
+
+    print(f"Median of {args.runs} fresh interpreters\n")
+    print(f"{'scenario':<20}{'import+create ms':>18}{'process ms':>12}")
+    for name, components in SCENARIOS:
+        inner, total = run_scenario(components, args.runs)
+        print(f"{name:<20}{inner:>18.1f}{total:>12.1f}")
+
+    if args.importtime:
+        print_importtime()
+
+
+if __name__ == '__main__':
+    main()
@@ -18,7 +18,75 @@ class Config:
     
     # Discord bot configuration
     DISCORD_TOKEN = os.environ.get('DISCORD_TOKEN', 'your-discord-bot-token')
-    
+
+    # 'embedded' runs the bot in a thread of the web app; 'external' means it is
+    # started separately with `python -m discord_bot`
+    BOT_MODE = os.environ.get('BOT_MODE', 'embedded')
+
+    # Parts of the app create_app() starts: api, scheduler, bot, migrations (comma-separated).
+    # Schema work is not part of normal startup; run `python -m utils.schema` after upgrades
+    APP_COMPONENTS = [
+        component.strip()
+        for component in os.environ.get('APP_COMPONENTS', 'api,scheduler,bot').split(',')
+        if component.strip()
+    ]
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+
+    # Gateway sharding (unset = Discord's recommended count) and health reporting
+    BOT_SHARD_COUNT = int(os.environ['BOT_SHARD_COUNT']) if os.environ.get('BOT_SHARD_COUNT') else None
+    BOT_SHARD_HEARTBEAT_SECONDS = int(os.environ.get('BOT_SHARD_HEARTBEAT_SECONDS', 30))
+
+    # Bot activity ingestion (write-behind batching)
+    INGEST_BATCH_SIZE = int(os.environ.get('INGEST_BATCH_SIZE', 500))  # flush after this many rows
+    INGEST_FLUSH_INTERVAL_MS = int(os.environ.get('INGEST_FLUSH_INTERVAL_MS', 250))  # or after this long
+    INGEST_QUEUE_MAXSIZE = int(os.environ.get('INGEST_QUEUE_MAXSIZE', 20000))  # producers wait when full
+
+    # Default help request keywords for servers without their own list
+    HELP_KEYWORDS = ['куратор', 'curator', 'help', 'помощь']
+
+    # Unanswered help requests stop being tracked after this long
+    PENDING_RESPONSE_TTL_SECONDS = int(os.environ.get('PENDING_RESPONSE_TTL_SECONDS', 3600))
+
+    # Curator reminders: merge window per channel and send budgets (requests, per seconds)
+    REMINDER_COALESCE_MS = int(os.environ.get('REMINDER_COALESCE_MS', 1000))
+    REMINDER_CHANNEL_RATE_LIMIT = (5, 5)  # Discord's per-channel message route
+    REMINDER_GLOBAL_RATE_LIMIT = (25, 1)  # half of the global limit, the rest is left for other bot traffic
+
+    # Catch-up after downtime: channels walked at once, how far back unseen channels go
+    BACKFILL_ON_STARTUP = os.environ.get('BACKFILL_ON_STARTUP', 'true').lower() == 'true'
+    BACKFILL_CONCURRENCY = int(os.environ.get('BACKFILL_CONCURRENCY', 4))
+    BACKFILL_MAX_AGE_HOURS = int(os.environ.get('BACKFILL_MAX_AGE_HOURS', 24))
+    BACKFILL_REACTIONS = os.environ.get('BACKFILL_REACTIONS', 'true').lower() == 'true'
+    WATERMARK_FLUSH_SECONDS = 60
+
+    # discord.py cache/intent profile: 'default' or 'lean' (see discord_bot/profiles.py)
+    BOT_PROFILE = os.environ.get('BOT_PROFILE', 'default')
+    # Override the profile's message cache size (tracking works from raw event ids, so it can stay small)
+    BOT_MAX_MESSAGES = int(os.environ['BOT_MAX_MESSAGES']) if os.environ.get('BOT_MAX_MESSAGES') else None
+
+    # Record gateway events the bot handles to this gzip JSONL file for replay (see discord_bot/replay.py)
+    EVENT_CAPTURE_PATH = os.environ.get('EVENT_CAPTURE_PATH')
+
+    # Event loop watchdog: lag sampling interval and the lag that counts as a stall
+    LOOP_WATCHDOG_ENABLED = os.environ.get('LOOP_WATCHDOG_ENABLED', 'true').lower() == 'true'
+    LOOP_LAG_INTERVAL_MS = int(os.environ.get('LOOP_LAG_INTERVAL_MS', 100))
+    LOOP_STALL_THRESHOLD_MS = int(os.environ.get('LOOP_STALL_THRESHOLD_MS', 250))
+
+    # Web app -> bot commands from processes without the bot: poll interval and how long rows are kept
+    BOT_BRIDGE_POLL_SECONDS = float(os.environ.get('BOT_BRIDGE_POLL_SECONDS', 2))
+    BOT_COMMAND_RETENTION_HOURS = 24
+
+    # Leader election between web workers: only the leader runs the scheduler and the embedded bot.
+    # Backend 'auto' uses a PostgreSQL advisory lock / MySQL GET_LOCK, or a lock file on other databases
+    LEADER_ELECTION = os.environ.get('LEADER_ELECTION', 'true').lower() == 'true'
+    LEADER_BACKEND = os.environ.get('LEADER_BACKEND', 'auto')
+    LEADER_LOCK_NAME = os.environ.get('LEADER_LOCK_NAME', 'govtracker2-singletons')
+    LEADER_LOCK_FILE = os.environ.get('LEADER_LOCK_FILE')
+    LEADER_CHECK_SECONDS = int(os.environ.get('LEADER_CHECK_SECONDS', 15))
+
+    # Worker threads for the bot's blocking database calls
+    BOT_DB_POOL_SIZE = int(os.environ.get('BOT_DB_POOL_SIZE', 4))
+
     # Application settings
     SECRET_KEY = os.environ.get('SESSION_SECRET', 'govtracker2-secret-key')
     
@@ -45,6 +113,16 @@ class Config:
     RESPONSE_TIME_GOOD = 60
     RESPONSE_TIME_POOR = 300
 
+    # Bucket size of the bot's incremental rating window (precision of the 30-day edge)
+    RATING_BUCKET_SECONDS = 3600
+    # How often the bot rebuilds its rating counters from the database
+    RATING_ENGINE_RESYNC_SECONDS = 3600
+    # Curators per chunk (grouped queries + one UPDATE + commit) in the hourly rating recompute
+    RATING_UPDATE_CHUNK_SIZE = int(os.environ.get('RATING_UPDATE_CHUNK_SIZE', '1000'))
+
+    # How long server list metrics (activity/curator/reaction counts, response time) are reused; 0 disables
+    SERVER_METRICS_CACHE_SECONDS = int(os.environ.get('SERVER_METRICS_CACHE_SECONDS', 30))
+
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'postgresql://localhost/govtracker2_dev')
@@ -1,7 +1,6 @@
 # GovTracker2 Python Migration by Replit Agent
-from .bot import start_discord_bot, get_bot_instance
-from .monitoring import MessageMonitor
-from .notifications import NotificationManager
+# Submodules are imported on first use: discord_bot.bot imports the web app,
+# which must not happen before `python -m discord_bot` has set BOT_MODE.
 
 __all__ = [
     'start_discord_bot',
@@ -9,3 +8,15 @@ __all__ = [
     'MessageMonitor',
     'NotificationManager'
 ]
+
+def __getattr__(name):
+    if name in ('start_discord_bot', 'get_bot_instance'):
+        from . import bot
+        return getattr(bot, name)
+    if name == 'MessageMonitor':
+        from .monitoring import MessageMonitor
+        return MessageMonitor
+    if name == 'NotificationManager':
+        from .notifications import NotificationManager
+        return NotificationManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
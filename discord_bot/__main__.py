@@ -0,0 +1,59 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Run the Discord bot outside the web app.
+
+    python -m discord_bot                                  # all shards, one process
+    python -m discord_bot --shard-count 8 --workers 4      # 8 shards over 4 processes
+    python -m discord_bot --shard-count 8 --shard-ids 0,1  # only shards 0 and 1
+    python -m discord_bot --profile lean                   # minimal discord.py caches
+
+Each worker process owns a fixed subset of shards, and with it the guilds
+Discord routes to those shards. All workers write through the same ingest
+path to the shared database and report health to bot_shard_status.
+"""
+import argparse
+import logging
+import os
+
+# The web app must not start its own embedded bot or scheduler in these processes
+os.environ['BOT_MODE'] = 'external'
+os.environ['APP_COMPONENTS'] = ''
+
+from discord_bot.sharding import partition_shards, run_worker, supervise  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the GovTracker2 Discord bot')
+    parser.add_argument('--shard-count', type=int, default=None,
+                        help='total number of shards (default: BOT_SHARD_COUNT or Discord recommendation)')
+    parser.add_argument('--shard-ids', default=None,
+                        help='comma-separated shard ids to run in this process')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of worker processes to split the shards across')
+    parser.add_argument('--profile', choices=['default', 'lean'], default=None,
+                        help='discord.py cache/intent profile (default: BOT_PROFILE)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    from config import Config
+    shard_count = args.shard_count or Config.BOT_SHARD_COUNT
+
+    if args.shard_ids:
+        if not shard_count:
+            parser.error('--shard-ids requires --shard-count (or BOT_SHARD_COUNT)')
+        shard_ids = [int(shard_id) for shard_id in args.shard_ids.split(',')]
+        if any(shard_id < 0 or shard_id >= shard_count for shard_id in shard_ids):
+            parser.error(f'shard ids must be between 0 and {shard_count - 1}')
+        run_worker(shard_ids, shard_count, args.profile)
+    elif args.workers > 1:
+        if not shard_count:
+            parser.error('--workers requires --shard-count (or BOT_SHARD_COUNT)')
+        supervise(partition_shards(shard_count, args.workers), shard_count, args.profile)
+    else:
+        # Single process: AutoShardedBot runs every shard itself
+        from discord_bot.bot import start_discord_bot
+        start_discord_bot(shard_count=shard_count, profile=args.profile)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+# GovTracker2 Python Migration by Replit Agent
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+import discord
+from database import db
+from config import Config
+from models.activity import Activity
+from models.response_tracking import ResponseTracking
+from models.channel_watermark import ChannelWatermark
+from utils.server_cache import server_cache
+from .ingest import WriteTracker
+from .pending import PendingRequest
+
+# Messages fetched per history page (Discord's maximum)
+PAGE_SIZE = 100
+
+
+def naive_utc(value):
+    """Discord timestamps are timezone-aware; the database stores naive UTC"""
+    return value.replace(tzinfo=None) if value and value.tzinfo else value
+
+
+def find_existing(message_ids):
+    """Keys already stored for these messages: activity (type, message_id, curator_id) and answered mention ids"""
+    activity_keys = set(
+        db.session.query(Activity.type, Activity.message_id, Activity.curator_id)
+        .filter(Activity.message_id.in_(message_ids))
+        .all()
+    )
+    answered = {
+        mention_id for (mention_id,) in
+        db.session.query(ResponseTracking.mention_message_id)
+        .filter(ResponseTracking.mention_message_id.in_(message_ids))
+        .all()
+    }
+    return activity_keys, answered
+
+
+class BackfillEngine:
+    """Catches up on messages sent while the bot was offline.
+
+    Walks ``channel.history(after=watermark)`` for every text channel of the
+    tracked guilds this process owns, several channels at a time. Messages go
+    through the same classification as live tracking (help requests, replies
+    to them, curator messages and reactions), rows already in the database
+    are skipped, and the rest are written through the ingest queue's bulk
+    inserts. A channel's watermark advances after each page's rows are
+    written, so an interrupted backfill resumes where it stopped. Live
+    traffic moves a watermark past the gap only once that channel's
+    backfill has finished.
+    """
+
+    def __init__(self, bot, concurrency=None, max_age_hours=None):
+        self.bot = bot
+        self.monitor = bot.monitor
+        self.semaphore = asyncio.Semaphore(concurrency or Config.BACKFILL_CONCURRENCY)
+        self.max_age = timedelta(hours=max_age_hours or Config.BACKFILL_MAX_AGE_HOURS)
+        self._seen = {}  # channel id -> watermark dict from live traffic, flushed periodically
+        self._caught_up = set()  # channel ids whose history before live_since has been backfilled
+        self._flusher = None
+        self.live_since = None  # messages from this moment on are handled by live events
+        self.running = False
+        self.stats = {
+            'channels': 0, 'messages': 0, 'activities': 0, 'responses': 0,
+            'duplicates': 0, 'errors': 0, 'last_run_seconds': None
+        }
+
+    def note_seen(self, message):
+        """Record a live message as processed (advances its channel watermark)"""
+        current = self._seen.get(message.channel.id)
+        if current is None or message.id > current['last_message_id']:
+            self._seen[message.channel.id] = {
+                'channel_id': str(message.channel.id),
+                'guild_id': str(message.guild.id),
+                'last_message_id': message.id,
+                'last_message_at': naive_utc(discord.utils.snowflake_time(message.id))
+            }
+
+    def start(self):
+        """Start periodic flushing of live watermarks; call before connecting to the gateway"""
+        self.live_since = discord.utils.utcnow()
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush_watermarks()
+
+    async def flush_watermarks(self):
+        """Save live watermarks of caught-up channels; the others are held until their backfill finishes"""
+        channel_ids = [channel_id for channel_id in self._seen if channel_id in self._caught_up]
+        if not channel_ids:
+            return
+        marks = [self._seen.pop(channel_id) for channel_id in channel_ids]
+        try:
+            await self.bot.db.run(ChannelWatermark.advance, marks)
+        except Exception as e:
+            logging.error(f"Error saving channel watermarks: {e}")
+            for mark in marks:
+                self._seen.setdefault(int(mark['channel_id']), mark)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(Config.WATERMARK_FLUSH_SECONDS)
+            await self.flush_watermarks()
+
+    async def run(self):
+        """Backfill every tracked guild handled by this process"""
+        if self.running:
+            logging.info("Backfill already running")
+            return self.stats
+        self.running = True
+        started = time.perf_counter()
+        try:
+            guilds = [
+                guild for guild in self.bot.guilds
+                if server_cache.is_tracked(guild.id) and self.bot.owns_guild(guild.id)
+            ]
+            watermarks = await self.bot.db.run(ChannelWatermark.get_for_guilds, [guild.id for guild in guilds])
+
+            jobs = []
+            for guild in guilds:
+                server = server_cache.get_active(guild.id)
+                for channel in guild.text_channels:
+                    permissions = channel.permissions_for(guild.me)
+                    if permissions.read_messages and permissions.read_message_history:
+                        jobs.append(self.backfill_channel(channel, server, watermarks.get(str(channel.id))))
+
+            logging.info(f"Backfill started: {len(jobs)} channels in {len(guilds)} guilds")
+            await asyncio.gather(*jobs)
+        finally:
+            self.running = False
+            self.stats['last_run_seconds'] = round(time.perf_counter() - started, 1)
+            logging.info(f"Backfill finished: {self.stats}")
+        return self.stats
+
+    async def backfill_channel(self, channel, server, last_message_id=None):
+        """Process one channel's history after its watermark"""
+        async with self.semaphore:
+            if last_message_id:
+                after = discord.Object(id=last_message_id)
+            else:
+                # Never seen: only look back BACKFILL_MAX_AGE_HOURS
+                after = discord.utils.utcnow() - self.max_age
+            # Newer messages arrive as live events and are tracked by the monitor
+            before = self.live_since or discord.utils.utcnow()
+            open_requests = {}  # help requests found in this channel's backfill
+            page = []
+            try:
+                async for message in channel.history(limit=None, after=after, before=before, oldest_first=True):
+                    page.append(message)
+                    if len(page) >= PAGE_SIZE:
+                        await self._process_page(channel, server, page, open_requests)
+                        page = []
+                if page:
+                    await self._process_page(channel, server, page, open_requests)
+                self.stats['channels'] += 1
+                self._caught_up.add(channel.id)
+            except discord.Forbidden:
+                self._caught_up.add(channel.id)
+                logging.debug(f"Backfill skipped channel {channel.id}: no access")
+            except Exception as e:
+                self.stats['errors'] += 1
+                logging.error(f"Backfill failed for channel {channel.id}: {e}")
+
+            self._resume_open_requests(server, open_requests)
+
+    async def _process_page(self, channel, server, messages, open_requests):
+        matcher = self.monitor.get_matcher(server)
+        activities = []
+        responses = []
+
+        for message in messages:
+            if message.author.bot:
+                continue
+            timestamp = naive_utc(message.created_at)
+
+            trigger = matcher.match(message.content)
+            if trigger:
+                open_requests[str(message.id)] = PendingRequest(
+                    str(message.id), str(channel.guild.id), str(channel.id), str(message.author.id),
+                    server.id, trigger, timestamp, timestamp + self.monitor.pending.ttl
+                )
+
+            curator_id = await self.monitor.get_curator_id(message.author.id)
+            if curator_id is not None:
+                reference_id = message.reference.message_id if message.reference else None
+                if reference_id:
+                    # Replies only count when they answer a help request
+                    pending = self._take_pending(str(reference_id), open_requests)
+                    if pending is not None:
+                        responses.append(self.monitor.response_row(
+                            curator_id, server, pending, str(message.id), str(channel.id), timestamp
+                        ))
+                else:
+                    activities.append(self.monitor.message_activity(message, server, curator_id, timestamp))
+
+            # Reaction times are unknown, so backfilled reactions are dated at message time
+            if Config.BACKFILL_REACTIONS:
+                for reaction in message.reactions:
+                    async for user in reaction.users():
+                        if user.bot:
+                            continue
+                        reactor_id = await self.monitor.get_curator_id(user.id)
+                        if reactor_id is None:
+                            continue
+                        # As in live tracking, the first curator reaction on a help request answers it
+                        pending = self._take_pending(str(message.id), open_requests)
+                        if pending is not None:
+                            responses.append(self.monitor.response_row(
+                                reactor_id, server, pending, f"reaction_{reaction.emoji}", str(channel.id), timestamp
+                            ))
+                        else:
+                            activities.append(self.monitor.reaction_activity(message.id, channel.id, reaction.emoji, server, reactor_id, timestamp))
+
+        # Advance the watermark only once the page's rows are written, so a crash re-walks the page
+        tracker = WriteTracker()
+        if await self._write(activities, responses, tracker):
+            await self.bot.ingest.wait_flushed()
+        if tracker.failed:
+            raise RuntimeError(f"ingest failed to write {tracker.failed} rows of a page ending at message {messages[-1].id}")
+        self.stats['messages'] += len(messages)
+
+        last = messages[-1]
+        await self.bot.db.run(ChannelWatermark.advance, [{
+            'channel_id': str(channel.id),
+            'guild_id': str(channel.guild.id),
+            'last_message_id': last.id,
+            'last_message_at': naive_utc(last.created_at)
+        }])
+
+    def _take_pending(self, message_id, open_requests):
+        """Remove and return the help request a curator answered, found in this backfill or tracked live"""
+        pending = open_requests.pop(message_id, None) or self.monitor.pending.get(message_id)
+        if message_id in self.monitor.pending:
+            self.monitor.pending.pop(message_id)
+            self.monitor.reminders.cancel(message_id)
+        return pending
+
+    async def _write(self, activities, responses, tracker=None):
+        """Skip rows that are already stored, then queue the rest for bulk insert; returns rows queued"""
+        message_ids = list({row['message_id'] for row in activities} | {row['mention_message_id'] for row in responses})
+        if not message_ids:
+            return 0
+        queued = 0
+        activity_keys, answered = await self.bot.db.run(find_existing, message_ids)
+
+        for row in activities:
+            key = (row['type'], row['message_id'], row['curator_id'])
+            if key in activity_keys:
+                self.stats['duplicates'] += 1
+                continue
+            activity_keys.add(key)
+            await self.bot.ingest.put_activity(tracker, **row)
+            self.stats['activities'] += 1
+            queued += 1
+
+        for row in responses:
+            if row['mention_message_id'] in answered:
+                self.stats['duplicates'] += 1
+                continue
+            answered.add(row['mention_message_id'])
+            await self.bot.ingest.put_response(tracker, **row)
+            self.stats['responses'] += 1
+            queued += 1
+        return queued
+
+    def _resume_open_requests(self, server, open_requests):
+        """Track help requests that are still unanswered and not yet expired"""
+        now = datetime.utcnow()
+        for pending in open_requests.values():
+            if pending.expires_at <= now or pending.message_id in self.monitor.pending:
+                continue
+            record = self.monitor.pending.add(
+                pending.message_id, pending.guild_id, pending.channel_id, pending.author_id,
+                pending.server_id, pending.trigger, pending.timestamp
+            )
+            if record is not None:
+                self.monitor.reminders.schedule(record, server)
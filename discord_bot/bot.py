@@ -4,82 +4,240 @@ from discord.ext import commands
 import os
 import logging
 import asyncio
+import math
+import socket
 from datetime import datetime
 from models.curator import Curator
 from models.discord_server import DiscordServer
 from models.activity import Activity
 from models.response_tracking import ResponseTracking
+from models.bot_shard_status import BotShardStatus
 from database import db
-from app import app
+from utils.server_cache import server_cache
+from utils.curator_index import curator_index
+from utils.rating_engine import IncrementalRatingEngine
+from config import Config
 from .monitoring import MessageMonitor
 from .notifications import NotificationManager
+from .ingest import IngestQueue
+from .db_executor import DatabaseExecutor
+from .backfill import BackfillEngine
+from .profiles import get_profile
+from .replay import EventRecorder
+from .watchdog import LoopWatchdog
+from .bridge import CommandBridge
 
 # Configure Discord logging
 discord.utils.setup_logging(level=logging.INFO)
 
-# Bot configuration - disable privileged intents that require approval
-intents = discord.Intents.default()
-intents.message_content = True
-intents.reactions = True
-intents.guilds = True
-# Disable privileged intents to avoid authorization issues
-# intents.members = True  # This requires approval in Discord Developer Portal
 
-class GovTrackerBot(commands.Bot):
-    def __init__(self):
+def shard_for_guild(guild_id, shard_count):
+    """Shard that receives a guild's events (Discord's sharding formula)"""
+    return (int(guild_id) >> 22) % shard_count
+
+
+class GovTrackerBot(commands.AutoShardedBot):
+    def __init__(self, shard_ids=None, shard_count=None, profile=None, app=None):
+        # shard_ids=None runs every shard in this process; otherwise this process
+        # owns only the given shards and other processes run the rest
+        self.profile = profile or get_profile()
         super().__init__(
             command_prefix='!gt',
-            intents=intents,
-            help_command=None
+            help_command=None,
+            shard_ids=shard_ids,
+            shard_count=shard_count,
+            **self.profile.client_options()
         )
+        logging.info(f"Bot profile {self.profile.describe()}")
+        
+        self.process_name = f"{socket.gethostname()}:{os.getpid()}"
+        self.started_at = datetime.utcnow()
+        self.shard_states = {}  # shard id -> connecting/ready/disconnected
         
+        if app is None:
+            from app import app
+        self.db = DatabaseExecutor(app)
         self.monitor = MessageMonitor(self)
         self.notification_manager = NotificationManager(self)
-        self.tracked_servers = {}
+        self.backfill = BackfillEngine(self)
+        self._backfill_started = False
+        
+        # Incremental ratings need every activity of a curator, which a process
+        # owning only some shards does not see; those levels are computed from the database
+        self.ratings = IncrementalRatingEngine() if shard_ids is None else None
+        self.ingest = IngestQueue(self.db, self.ratings)
+        
+        # Commands from web app processes other than this one (non-leader workers, or all with BOT_MODE=external)
+        self.bridge = CommandBridge(self)
+        
+        # Loop lag histogram and stall attribution
+        self.watchdog = LoopWatchdog() if Config.LOOP_WATCHDOG_ENABLED else None
+        
+        # Optional capture of handled events for offline replay
+        self.recorder = EventRecorder(Config.EVENT_CAPTURE_PATH) if Config.EVENT_CAPTURE_PATH else None
+    
+    def owns_guild(self, guild_id):
+        """True if this process receives the guild's gateway events"""
+        if self.shard_ids is None or not self.shard_count:
+            return True
+        return shard_for_guild(guild_id, self.shard_count) in self.shard_ids
+    
+    @property
+    def tracked_servers(self):
+        """Active tracked servers keyed by guild id (served from the config cache)"""
+        return server_cache.active_servers()
         
     async def setup_hook(self):
         """Called when the bot is starting up"""
         logging.info("GovTracker2 Bot is starting up...")
         
-        # Load tracked servers from database
+        if self.watchdog is not None:
+            self.watchdog.start()
+        
+        # Read the command cursor first so cache changes made while loading are not missed
+        await self.bridge.start()
+        
+        # Load tracked servers and curator identities from database
         await self.load_tracked_servers()
+        await self.load_curator_index()
+        
+        # Flushes take rating levels from the counters, so load them before ingestion starts
+        if self.ratings is not None:
+            await self.ingest.load_ratings()
         
-        # Start monitoring tasks
-        self.monitor.start_monitoring()
+        # Start activity ingestion and monitoring tasks
+        self.ingest.start()
+        self.backfill.start()
+        await self.monitor.start_monitoring()
+        if self.ratings is not None:
+            asyncio.create_task(self.resync_ratings())
+        asyncio.create_task(self.report_shard_health())
         
         logging.info("Bot setup completed")
     
+    async def close(self):
+        """Flush queued activity rows and report shards stopped before disconnecting"""
+        await self.stop_tracking()
+        if self.is_ready():
+            await self.save_shard_status('stopped')
+        await super().close()
+        self.db.shutdown(wait=False)
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        self.bridge.stop()
+    
+    async def stop_tracking(self):
+        """Stop background tracking work and write out everything still in memory"""
+        await self.backfill.stop()
+        try:
+            await self.ingest.stop()
+        except Exception as e:
+            logging.error(f"Error flushing ingest queue on shutdown: {e}")
+        self.monitor.reminders.stop()
+        try:
+            await self.monitor.pending.stop()
+        except Exception as e:
+            logging.error(f"Error saving pending help requests on shutdown: {e}")
+        if self.recorder is not None:
+            self.recorder.close()
+    
     async def load_tracked_servers(self):
-        """Load tracked servers from database"""
+        """Load server configuration from database into the config cache"""
         try:
-            with app.app_context():
-                servers = DiscordServer.get_active_servers()
-                
-                for server in servers:
-                    self.tracked_servers[int(server.server_id)] = {
-                        'id': server.id,
-                        'name': server.name,
-                        'curator_role_id': server.curator_role_id,
-                        'is_active': server.is_active
-                    }
-                
-                logging.info(f"Loaded {len(self.tracked_servers)} tracked servers")
+            # Inactive servers are cached too so toggling them needs no reload
+            await self.db.run(lambda: server_cache.load(DiscordServer.query.all()))
+            
+            logging.info(f"Loaded {len(self.tracked_servers)} tracked servers")
         
         except Exception as e:
             logging.error(f"Error loading tracked servers: {e}")
     
+    async def load_curator_index(self):
+        """Load Discord id -> curator id index from database"""
+        try:
+            await self.db.run(
+                lambda: curator_index.load(db.session.query(Curator.id, Curator.discord_id).all())
+            )
+        
+        except Exception as e:
+            logging.error(f"Error loading curator index: {e}")
+    
+    async def resync_ratings(self):
+        """Rebuild incremental rating counters from the database periodically.
+
+        Picks up activities written outside the bot (API, deletions) so the
+        in-memory counters cannot drift for longer than one interval. The
+        first load happens in setup_hook.
+        """
+        while True:
+            await asyncio.sleep(Config.RATING_ENGINE_RESYNC_SECONDS)
+            await self.ingest.resync_ratings()
+    
+    async def report_shard_health(self):
+        """Write the status of this process's shards to bot_shard_status periodically"""
+        await self.wait_until_ready()
+        while not self.is_closed():
+            await self.save_shard_status()
+            await asyncio.sleep(Config.BOT_SHARD_HEARTBEAT_SECONDS)
+    
+    async def save_shard_status(self, status=None):
+        """Report current shard health; ``status`` overrides every shard's state"""
+        try:
+            guild_counts = {}
+            for guild in self.guilds:
+                guild_counts[guild.shard_id] = guild_counts.get(guild.shard_id, 0) + 1
+            
+            shards = []
+            for shard_id, shard in self.shards.items():
+                latency = shard.latency
+                shards.append({
+                    'shard_id': shard_id,
+                    'shard_count': self.shard_count,
+                    'status': status or self.shard_states.get(shard_id, 'connecting'),
+                    'guild_count': guild_counts.get(shard_id, 0),
+                    'latency_ms': int(latency * 1000) if math.isfinite(latency) else None
+                })
+            
+            if shards:
+                await self.db.run(BotShardStatus.report, shards, self.process_name, self.started_at)
+        except Exception as e:
+            logging.error(f"Error reporting shard health: {e}")
+    
+    async def on_shard_connect(self, shard_id):
+        self.shard_states[shard_id] = 'connecting'
+    
+    async def on_shard_ready(self, shard_id):
+        logging.info(f"Shard {shard_id}/{self.shard_count} ready")
+        self.shard_states[shard_id] = 'ready'
+        await self.save_shard_status()
+    
+    async def on_shard_resumed(self, shard_id):
+        self.shard_states[shard_id] = 'ready'
+        await self.save_shard_status()
+    
+    async def on_shard_disconnect(self, shard_id):
+        logging.warning(f"Shard {shard_id}/{self.shard_count} disconnected")
+        self.shard_states[shard_id] = 'disconnected'
+    
     async def on_ready(self):
         """Called when bot is ready"""
         logging.info(f'{self.user} has connected to Discord!')
-        logging.info(f'Bot is in {len(self.guilds)} guilds')
+        logging.info(f'Bot is in {len(self.guilds)} guilds (shards {self.shard_ids or "all"} of {self.shard_count})')
         
-        # List tracked servers
+        # List tracked servers handled by this process
         for guild_id, server_info in self.tracked_servers.items():
+            if not self.owns_guild(guild_id):
+                continue
             guild = self.get_guild(guild_id)
             if guild:
                 logging.info(f"Monitoring server: {guild.name} ({guild_id})")
             else:
-                logging.warning(f"Bot is not in server {server_info['name']} ({guild_id})")
+                logging.warning(f"Bot is not in server {server_info.name} ({guild_id})")
+        
+        # Catch up on messages sent while the bot was offline (once per process)
+        if Config.BACKFILL_ON_STARTUP and not self._backfill_started:
+            self._backfill_started = True
+            asyncio.create_task(self.backfill.run())
         
         # Set bot status
         await self.change_presence(
@@ -89,60 +247,25 @@ class GovTrackerBot(commands.Bot):
             )
         )
     
-    async def on_message(self, message):
-        """Handle incoming messages"""
-        # Ignore bot messages
-        if message.author.bot:
-            return
-        
-        # Only process messages from tracked servers
-        if message.guild and message.guild.id in self.tracked_servers:
-            await self.monitor.process_message(message)
-        
-        # Process commands
-        await self.process_commands(message)
-    
-    async def on_reaction_add(self, reaction, user):
-        """Handle reaction additions"""
-        if user.bot:
-            return
-        
-        # Only process reactions from tracked servers
-        if reaction.message.guild and reaction.message.guild.id in self.tracked_servers:
-            await self.monitor.process_reaction(reaction, user, 'add')
-    
-    async def on_reaction_remove(self, reaction, user):
-        """Handle reaction removals"""
-        if user.bot:
-            return
-        
-        # Only process reactions from tracked servers
-        if reaction.message.guild and reaction.message.guild.id in self.tracked_servers:
-            await self.monitor.process_reaction(reaction, user, 'remove')
-        await self.change_presence(activity=activity)
-    
     async def on_guild_join(self, guild):
         """Called when bot joins a new guild"""
         logging.info(f"Joined guild: {guild.name} ({guild.id})")
         
         # Check if this server should be tracked
-        with app.app_context():
+        def refresh_server_config():
             server = DiscordServer.find_by_server_id(str(guild.id))
-            if server and server.is_active:
-                self.tracked_servers[guild.id] = {
-                    'id': server.id,
-                    'name': server.name,
-                    'role_tag_id': server.role_tag_id,
-                    'is_active': server.is_active
-                }
-                logging.info(f"Now tracking server: {guild.name}")
+            if server:
+                server_cache.refresh(server)
+        
+        await self.db.run(refresh_server_config)
+        if server_cache.is_tracked(guild.id):
+            logging.info(f"Now tracking server: {guild.name}")
     
     async def on_guild_remove(self, guild):
         """Called when bot leaves a guild"""
         logging.info(f"Left guild: {guild.name} ({guild.id})")
         
-        if guild.id in self.tracked_servers:
-            del self.tracked_servers[guild.id]
+        server_cache.invalidate(guild.id)
     
     async def on_message(self, message):
         """Handle incoming messages"""
@@ -152,42 +275,46 @@ class GovTrackerBot(commands.Bot):
         
         # Only process messages from tracked servers
         if message.guild and message.guild.id in self.tracked_servers:
+            if self.recorder is not None:
+                self.recorder.message(message)
             await self.monitor.process_message(message)
         
         # Process bot commands
         await self.process_commands(message)
     
-    async def on_reaction_add(self, reaction, user):
-        """Handle reaction additions"""
-        if user.bot:
+    async def on_raw_reaction_add(self, payload):
+        """Handle reaction additions, including on messages outside the message cache"""
+        if payload.member and payload.member.bot or payload.user_id == self.user.id:
             return
         
-        if reaction.message.guild and reaction.message.guild.id in self.tracked_servers:
-            await self.monitor.process_reaction(reaction, user, 'add')
+        if payload.guild_id and payload.guild_id in self.tracked_servers:
+            if self.recorder is not None:
+                self.recorder.reaction(payload, 'add')
+            await self.monitor.process_reaction(payload, 'add')
     
-    async def on_reaction_remove(self, reaction, user):
+    async def on_raw_reaction_remove(self, payload):
         """Handle reaction removals"""
-        if user.bot:
+        if payload.user_id == self.user.id:
             return
         
-        if reaction.message.guild and reaction.message.guild.id in self.tracked_servers:
-            await self.monitor.process_reaction(reaction, user, 'remove')
+        if payload.guild_id and payload.guild_id in self.tracked_servers:
+            if self.recorder is not None:
+                self.recorder.reaction(payload, 'remove')
+            await self.monitor.process_reaction(payload, 'remove')
     
-    async def on_message_edit(self, before, after):
+    async def on_raw_message_edit(self, payload):
         """Handle message edits"""
-        if after.author.bot:
-            return
-        
-        if after.guild and after.guild.id in self.tracked_servers:
-            await self.monitor.process_message_edit(before, after)
+        if payload.guild_id and payload.guild_id in self.tracked_servers:
+            if self.recorder is not None:
+                self.recorder.edit(payload)
+            await self.monitor.process_message_edit(payload)
     
-    async def on_message_delete(self, message):
+    async def on_raw_message_delete(self, payload):
         """Handle message deletions"""
-        if message.author.bot:
-            return
-        
-        if message.guild and message.guild.id in self.tracked_servers:
-            await self.monitor.process_message_delete(message)
+        if payload.guild_id and payload.guild_id in self.tracked_servers:
+            if self.recorder is not None:
+                self.recorder.delete(payload)
+            await self.monitor.process_message_delete(payload.message_id)
 
 # Bot instance
 bot = None
@@ -197,11 +324,16 @@ def get_bot_instance():
     global bot
     return bot
 
-async def main():
+async def main(shard_ids=None, shard_count=None, profile=None, app=None):
     """Main bot function"""
     global bot
     
-    bot = GovTrackerBot()
+    bot = GovTrackerBot(
+        shard_ids=shard_ids,
+        shard_count=shard_count or Config.BOT_SHARD_COUNT,
+        profile=get_profile(profile),
+        app=app
+    )
     
     # Add bot commands
     await setup_commands(bot)
@@ -248,6 +380,35 @@ async def setup_commands(bot):
             inline=True
         )
         
+        ingest_metrics = bot.ingest.get_metrics()
+        embed.add_field(
+            name="Ingest Queue",
+            value=f"Depth {ingest_metrics['queue_depth']}, "
+                  f"flush avg {ingest_metrics['avg_flush_ms']}ms / max {ingest_metrics['max_flush_ms']}ms",
+            inline=False
+        )
+        
+        dispatch_metrics = bot.monitor.reminders.dispatcher.get_metrics()
+        embed.add_field(
+            name="Help Requests",
+            value=f"Pending {len(bot.monitor.pending)}, reminders scheduled {len(bot.monitor.reminders)}\n"
+                  f"Reminder messages sent {dispatch_metrics['sent']} (merged {dispatch_metrics['merged']}), "
+                  f"throttled {dispatch_metrics['throttled']}, failed {dispatch_metrics['failed']}",
+            inline=False
+        )
+        
+        if bot.watchdog is not None:
+            loop_metrics = bot.watchdog.get_metrics()
+            worst = max(loop_metrics['stalls_by_handler'].items(), key=lambda item: item[1], default=None)
+            embed.add_field(
+                name="Event Loop",
+                value=f"Lag p50 ≤{loop_metrics['lag']['p50_ms']}ms, p99 ≤{loop_metrics['lag']['p99_ms']}ms, "
+                      f"max {loop_metrics['lag']['max_ms']}ms\n"
+                      f"Stalls over {loop_metrics['threshold_ms']}ms: {loop_metrics['stalls']}"
+                      + (f" (most in {worst[0]}: {worst[1]})" if worst else ""),
+                inline=False
+            )
+        
         await ctx.send(embed=embed)
     
     @bot.command(name='stats')
@@ -257,49 +418,72 @@ async def setup_commands(bot):
             await ctx.send("This server is not being tracked.")
             return
         
+        def load_server_stats():
+            server = DiscordServer.find_by_server_id(str(ctx.guild.id))
+            if not server:
+                return None
+            
+            active_curators = server.get_active_curators()
+            top_curators = sorted(active_curators, key=lambda x: x.total_points, reverse=True)[:5]
+            return {
+                'activity_count': server.get_activity_count(days=30),
+                'active_curators': len(active_curators),
+                'top_curators': [(c.name, c.total_points) for c in top_curators]
+            }
+        
         try:
-            with app.app_context():
-                server = DiscordServer.find_by_server_id(str(ctx.guild.id))
-                if not server:
-                    await ctx.send("Server not found in database.")
-                    return
-                
-                # Get statistics
-                activity_count = server.get_activity_count(days=30)
-                active_curators = server.get_active_curators()
-                
-                embed = discord.Embed(
-                    title=f"Statistics for {ctx.guild.name}",
-                    color=discord.Color.blue()
-                )
-                
-                embed.add_field(
-                    name="Activities (30 days)",
-                    value=activity_count,
-                    inline=True
-                )
-                
+            stats = await bot.db.run(load_server_stats)
+            if not stats:
+                await ctx.send("Server not found in database.")
+                return
+            
+            embed = discord.Embed(
+                title=f"Statistics for {ctx.guild.name}",
+                color=discord.Color.blue()
+            )
+            
+            embed.add_field(
+                name="Activities (30 days)",
+                value=stats['activity_count'],
+                inline=True
+            )
+            
+            embed.add_field(
+                name="Active Curators",
+                value=stats['active_curators'],
+                inline=True
+            )
+            
+            if stats['top_curators']:
+                curator_list = "\n".join([f"• {name} ({points} pts)" for name, points in stats['top_curators']])
                 embed.add_field(
-                    name="Active Curators",
-                    value=len(active_curators),
-                    inline=True
+                    name="Top Curators",
+                    value=curator_list,
+                    inline=False
                 )
-                
-                if active_curators:
-                    top_curators = sorted(active_curators, key=lambda x: x.total_points, reverse=True)[:5]
-                    curator_list = "\n".join([f"• {c.name} ({c.total_points} pts)" for c in top_curators])
-                    embed.add_field(
-                        name="Top Curators",
-                        value=curator_list,
-                        inline=False
-                    )
-                
-                await ctx.send(embed=embed)
+            
+            await ctx.send(embed=embed)
         
         except Exception as e:
             logging.error(f"Error in stats command: {e}")
             await ctx.send("An error occurred while fetching statistics.")
     
+    @bot.command(name='backfill')
+    @commands.has_permissions(administrator=True)
+    async def backfill_command(ctx):
+        """Catch up on messages missed while the bot was offline"""
+        if bot.backfill.running:
+            await ctx.send("Backfill is already running.")
+            return
+        
+        await ctx.send("Backfill started...")
+        stats = await bot.backfill.run()
+        await ctx.send(
+            f"Backfill finished in {stats['last_run_seconds']}s: {stats['messages']} messages scanned, "
+            f"{stats['activities']} activities and {stats['responses']} responses added, "
+            f"{stats['duplicates']} duplicates skipped"
+        )
+    
     @bot.command(name='help')
     async def help_command(ctx):
         """Show help information"""
@@ -321,6 +505,12 @@ async def setup_commands(bot):
             inline=False
         )
         
+        embed.add_field(
+            name="!gtbackfill",
+            value="Catch up on messages missed while the bot was offline (administrators)",
+            inline=False
+        )
+        
         embed.add_field(
             name="!gthelp",
             value="Show this help message",
@@ -331,10 +521,20 @@ async def setup_commands(bot):
         
         await ctx.send(embed=embed)
 
-def start_discord_bot():
-    """Start the Discord bot"""
+def stop_discord_bot(timeout=30):
+    """Close the running bot from another thread (e.g. when this process loses leadership)"""
+    if bot is None or bot.is_closed():
+        return
+    try:
+        future = asyncio.run_coroutine_threadsafe(bot.close(), bot.loop)
+        future.result(timeout)
+    except Exception as e:
+        logging.error(f"Error stopping Discord bot: {e}")
+
+def start_discord_bot(shard_ids=None, shard_count=None, profile=None, app=None):
+    """Start the Discord bot (optionally only the given shards) for ``app`` (default: app.app)"""
     try:
-        asyncio.run(main())
+        asyncio.run(main(shard_ids, shard_count, profile, app))
     except KeyboardInterrupt:
         logging.info("Bot stopped by user")
     except Exception as e:
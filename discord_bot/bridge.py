@@ -0,0 +1,119 @@
+# GovTracker2 Python Migration by Replit Agent
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from config import Config
+from models.bot_command import BotCommand
+from models.curator import Curator
+from models.discord_server import DiscordServer
+from utils.server_cache import server_cache
+from utils.curator_index import curator_index
+
+
+class CommandBridge:
+    """Bot side of the web app bridge: runs commands from the bot_commands table.
+
+    Each bot process polls for commands newer than its cursor. Ids can
+    commit out of order under concurrent web workers, so commands from the
+    last few seconds are read again and skipped if already handled.
+    """
+
+    # Commands newer than this are re-read in case a lower id commits late
+    SETTLE = timedelta(seconds=10)
+
+    def __init__(self, bot, poll_seconds=None):
+        self.bot = bot
+        self.poll_seconds = poll_seconds or Config.BOT_BRIDGE_POLL_SECONDS
+        self.cursor = 0
+        self._handled = set()  # ids above the cursor that already ran
+        self._task = None
+        self._last_prune = None
+        self.stats = {'received': 0, 'failed': 0}
+        self.handlers = {
+            'refresh_server': self.refresh_server,
+            'invalidate_server': self.invalidate_server,
+            'refresh_curator': self.refresh_curator,
+            'remove_curator': self.remove_curator,
+            'reload_caches': self.reload_caches,
+            'backup_notification': self.backup_notification,
+        }
+
+    async def start(self):
+        """Start after the current newest command; call before loading caches so no change is missed"""
+        try:
+            self.cursor = await self.bot.db.run(BotCommand.latest_id)
+        except Exception as e:
+            logging.error(f"Error reading bot command cursor: {e}")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.poll()
+            except Exception as e:
+                logging.error(f"Error polling bot commands: {e}")
+
+    async def poll(self):
+        commands = await self.bot.db.run(BotCommand.fetch_after, self.cursor)
+        settled_before = datetime.utcnow() - self.SETTLE
+        for command in commands:
+            if command['id'] not in self._handled:
+                self._handled.add(command['id'])
+                await self.handle(command)
+            created_at = datetime.fromisoformat(command['created_at'])
+            if created_at < settled_before and command['id'] > self.cursor:
+                self.cursor = command['id']
+        self._handled = {command_id for command_id in self._handled if command_id > self.cursor}
+
+        if self._last_prune is None or datetime.utcnow() - self._last_prune > timedelta(hours=1):
+            self._last_prune = datetime.utcnow()
+            await self.bot.db.run(BotCommand.prune, Config.BOT_COMMAND_RETENTION_HOURS)
+
+    async def handle(self, command):
+        handler = self.handlers.get(command['command'])
+        if handler is None:
+            logging.warning(f"Unknown bot command {command['command']} ({command['id']})")
+            return
+        self.stats['received'] += 1
+        try:
+            await handler(**command['payload'])
+            logging.debug(f"Bot command {command['id']} {command['command']} done")
+        except Exception as e:
+            self.stats['failed'] += 1
+            logging.error(f"Error running bot command {command['command']} ({command['id']}): {e}")
+
+    async def refresh_server(self, guild_id):
+        def refresh():
+            server = DiscordServer.find_by_server_id(guild_id)
+            if server:
+                server_cache.refresh(server)
+            else:
+                server_cache.invalidate(guild_id)
+        await self.bot.db.run(refresh)
+
+    async def invalidate_server(self, guild_id):
+        server_cache.invalidate(guild_id)
+
+    async def refresh_curator(self, discord_id):
+        def refresh():
+            curator = Curator.find_by_discord_id(discord_id)
+            if curator:
+                curator_index.add(curator)
+        await self.bot.db.run(refresh)
+
+    async def remove_curator(self, discord_id):
+        curator_index.remove(discord_id)
+
+    async def reload_caches(self):
+        await self.bot.load_tracked_servers()
+        await self.bot.load_curator_index()
+
+    async def backup_notification(self, backup_info, success=True):
+        await self.bot.notification_manager.send_backup_notification(backup_info, success=success)
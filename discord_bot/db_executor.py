@@ -0,0 +1,46 @@
+# GovTracker2 Python Migration by Replit Agent
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from database import db
+from config import Config
+
+
+class DatabaseExecutor:
+    """Runs blocking SQLAlchemy work for the bot on a dedicated thread pool.
+
+    Each job runs inside its own Flask app context, and Flask-SQLAlchemy
+    scopes sessions to the app context, so every job gets a fresh session
+    that is removed when the job ends. Jobs should return plain values
+    rather than ORM instances, since those are detached once the job ends.
+    """
+
+    def __init__(self, app, pool_size=None):
+        self.app = app
+        self.pool_size = pool_size or Config.BOT_DB_POOL_SIZE
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.pool_size,
+            thread_name_prefix='govtracker-db'
+        )
+
+    async def run(self, func, *args, **kwargs):
+        """Run ``func(*args, **kwargs)`` on the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(self._call, func, args, kwargs)
+        )
+
+    def _call(self, func, args, kwargs):
+        with self.app.app_context():
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                db.session.rollback()
+                raise
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs and wait for running ones to finish"""
+        self._executor.shutdown(wait=wait)
+        logging.info("Bot database executor shut down")
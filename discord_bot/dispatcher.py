@@ -0,0 +1,178 @@
+# GovTracker2 Python Migration by Replit Agent
+import asyncio
+import logging
+import time
+from datetime import datetime
+from config import Config
+
+# Discord rejects messages longer than this
+MESSAGE_LIMIT = 2000
+
+
+def format_elapsed(elapsed_seconds):
+    """Format a waiting time for reminder messages"""
+    minutes = elapsed_seconds // 60
+    seconds = elapsed_seconds % 60
+    if minutes > 0:
+        return f"{minutes} минут {seconds} секунд" if seconds > 0 else f"{minutes} минут"
+    return f"{seconds} секунд"
+
+
+def jump_url(guild_id, channel_id, message_id):
+    """Build a message link from ids, without fetching the message"""
+    return f"https://discord.com/channels/{guild_id}/{channel_id}/{message_id}"
+
+
+class TokenBucket:
+    """Token bucket for one rate-limit route: ``capacity`` requests per ``per`` seconds"""
+
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated')
+
+    def __init__(self, capacity, per):
+        self.capacity = capacity
+        self.rate = capacity / per
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self):
+        """Seconds until a token is available (0 if one is available now)"""
+        self._refill(time.monotonic())
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self._refill(time.monotonic())
+        self.tokens -= 1
+
+
+class ReminderDispatcher:
+    """Sends curator reminders, merging those due in the same channel.
+
+    The first reminder for a channel opens a short coalescing window; every
+    reminder that becomes due in that channel before the message goes out is
+    folded into the same message (one role ping, a list of jump links).
+    Sends respect a per-channel bucket (Discord's message route is limited
+    per channel) and a global bucket shared by all channels. While a channel
+    waits for budget, new reminders keep merging into its next message.
+    """
+
+    def __init__(self, bot, is_pending=None, on_failed=None, coalesce_ms=None):
+        self.bot = bot
+        self.is_pending = is_pending  # answered requests are dropped from queued messages
+        self.on_failed = on_failed  # called with message ids whose reminder could not be sent
+        self.coalesce = (coalesce_ms if coalesce_ms is not None else Config.REMINDER_COALESCE_MS) / 1000
+        self._queues = {}  # channel id -> {message id: (pending request, role id)}
+        self._buckets = {}
+        self._global = TokenBucket(*Config.REMINDER_GLOBAL_RATE_LIMIT)
+        self._tasks = set()
+        self.stats = {'reminders': 0, 'sent': 0, 'merged': 0, 'throttled': 0, 'failed': 0}
+
+    def enqueue(self, pending, role_id):
+        """Queue a due reminder for a pending help request"""
+        queue = self._queues.get(pending.channel_id)
+        if queue is None:
+            queue = self._queues[pending.channel_id] = {}
+            task = asyncio.create_task(self._drain(pending.channel_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        # A reminder still waiting in the queue is simply kept (not duplicated)
+        queue[pending.message_id] = (pending, role_id)
+
+    def get_metrics(self):
+        metrics = dict(self.stats)
+        metrics['queued'] = sum(len(queue) for queue in self._queues.values())
+        metrics['channels'] = len(self._queues)
+        return metrics
+
+    def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        self._queues.clear()
+
+    def _bucket(self, channel_id):
+        bucket = self._buckets.get(channel_id)
+        if bucket is None:
+            bucket = self._buckets[channel_id] = TokenBucket(*Config.REMINDER_CHANNEL_RATE_LIMIT)
+        return bucket
+
+    async def _drain(self, channel_id):
+        try:
+            await asyncio.sleep(self.coalesce)
+            bucket = self._bucket(channel_id)
+
+            while self._queues.get(channel_id):
+                delay = max(bucket.delay(), self._global.delay())
+                if delay > 0:
+                    self.stats['throttled'] += 1
+                    await asyncio.sleep(delay)
+                    continue
+
+                batch = self._take_batch(channel_id)
+                if not batch:
+                    continue
+                bucket.consume()
+                self._global.consume()
+                await self._send(channel_id, batch)
+
+            self._queues.pop(channel_id, None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._queues.pop(channel_id, None)
+            logging.error(f"Error in reminder dispatcher for channel {channel_id}: {e}")
+
+    def _take_batch(self, channel_id):
+        """Take as many queued reminders as fit into one message, oldest request first"""
+        queue = self._queues[channel_id]
+        items = sorted(queue.values(), key=lambda item: item[0].timestamp)
+        batch = []
+        length = 100  # header with role mentions
+        for pending, role_id in items:
+            if self.is_pending and not self.is_pending(pending.message_id):
+                del queue[pending.message_id]
+                continue
+            # Link plus elapsed time, role mention and bullet
+            line_length = len(jump_url(pending.guild_id, pending.channel_id, pending.message_id)) + 60
+            if batch and length + line_length > MESSAGE_LIMIT:
+                break
+            batch.append((pending, role_id))
+            length += line_length
+            del queue[pending.message_id]
+        return batch
+
+    def format_message(self, batch):
+        now = datetime.utcnow()
+        roles = ' '.join(dict.fromkeys(f"<@&{role_id}>" for _, role_id in batch))
+
+        if len(batch) == 1:
+            pending = batch[0][0]
+            elapsed = int((now - pending.timestamp).total_seconds())
+            return f"⚠️ {roles} Запрос помощи без ответа уже {format_elapsed(elapsed)}!\n" \
+                   f"Сообщение: {jump_url(pending.guild_id, pending.channel_id, pending.message_id)}"
+
+        lines = [f"⚠️ {roles} Запросы помощи без ответа: {len(batch)}"]
+        for pending, _ in batch:
+            elapsed = int((now - pending.timestamp).total_seconds())
+            lines.append(f"• {format_elapsed(elapsed)}: {jump_url(pending.guild_id, pending.channel_id, pending.message_id)}")
+        return '\n'.join(lines)
+
+    async def _send(self, channel_id, batch):
+        message_ids = [pending.message_id for pending, _ in batch]
+        try:
+            channel = self.bot.get_channel(int(channel_id))
+            if channel is None:
+                raise LookupError(f"channel {channel_id} not found")
+
+            await channel.send(self.format_message(batch))
+            self.stats['sent'] += 1
+            self.stats['reminders'] += len(batch)
+            self.stats['merged'] += len(batch) - 1
+            logging.info(f"Reminder sent in channel {channel_id} for {len(batch)} help request(s)")
+        except Exception as e:
+            self.stats['failed'] += 1
+            logging.error(f"Could not send reminder: {e}")
+            if self.on_failed:
+                self.on_failed(message_ids)
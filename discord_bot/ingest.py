@@ -0,0 +1,357 @@
+# GovTracker2 Python Migration by Replit Agent
+import asyncio
+import logging
+import time
+from sqlalchemy import insert, update, bindparam, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from models.curator import Curator
+from models.activity import Activity
+from models.response_tracking import ResponseTracking
+from models.curator_server_daily import CuratorServerDaily
+from database import db
+from config import Config
+
+# Queue items that are not rows; each carries a future resolved when the flush loop reaches it
+MARKERS = ('flushed', 'resync')
+
+
+class WriteTracker:
+    """Counts failed writes of the rows queued with it, for callers that must know their rows were stored"""
+
+    __slots__ = ('failed',)
+
+    def __init__(self):
+        self.failed = 0
+
+
+class IngestQueue:
+    """Bounded write-behind queue for Activity and ResponseTracking rows.
+
+    Event handlers enqueue plain row dicts; a single background task drains
+    the queue and writes each batch in one transaction with multi-row
+    inserts, once ``batch_size`` rows are waiting or ``flush_interval_ms``
+    has passed since the first row of the batch arrived.
+
+    Markers travel through the queue in order with the rows: a flush marker
+    resolves once every row queued before it has been written, and a rating
+    engine resync reads its database snapshot at that point, before any row
+    queued after it.
+    """
+
+    def __init__(self, db_executor, rating_engine=None, batch_size=None, flush_interval_ms=None, max_size=None):
+        self.db_executor = db_executor
+        self.rating_engine = rating_engine
+        self.batch_size = batch_size or Config.INGEST_BATCH_SIZE
+        self.flush_interval = (flush_interval_ms or Config.INGEST_FLUSH_INTERVAL_MS) / 1000
+        self.queue = asyncio.Queue(maxsize=max_size or Config.INGEST_QUEUE_MAXSIZE)
+        self._task = None
+        self.metrics = {
+            'enqueued': 0,
+            'flushed_rows': 0,
+            'failed_rows': 0,
+            'flush_count': 0,
+            'max_queue_depth': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0
+        }
+
+    def start(self):
+        """Start the background flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logging.info(f"Ingest queue started (batch={self.batch_size}, interval={self.flush_interval * 1000:.0f}ms)")
+
+    async def stop(self):
+        """Flush everything still queued and stop the background task"""
+        if self._task:
+            # Sentinel makes the flush loop write its current batch and exit
+            await self.queue.put(None)
+            await self._task
+            self._task = None
+
+        batch = []
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is None:
+                continue
+            if item[0] in MARKERS:
+                if item[0] == 'resync':
+                    self.rating_engine.cancel_resync()
+                item[1].set_result(None)
+                continue
+            batch.append(item)
+        if batch:
+            await self._flush(batch)
+        logging.info("Ingest queue stopped")
+
+    async def load_ratings(self):
+        """Load the rating engine from the database now; call before the first event is queued"""
+        try:
+            engine = await self.db_executor.run(self.rating_engine.build_from_db)
+            self.rating_engine.adopt(engine)
+        except Exception as e:
+            self.rating_engine.cancel_resync()
+            logging.error(f"Error loading rating counters: {e}")
+
+    async def resync_ratings(self):
+        """Reload the rating engine from the database in order with the queued writes.
+
+        Events recorded after the marker is queued are journaled by the
+        engine and replayed onto the reloaded counters, since their rows
+        are not in the snapshot yet.
+        """
+        if self._task is None:
+            await self.load_ratings()
+            return
+        done = asyncio.get_running_loop().create_future()
+        await self.queue.put(('resync', done))
+        # No await between queueing the marker and starting the journal
+        self.rating_engine.begin_resync()
+        await done
+
+    async def wait_flushed(self):
+        """Wait until every row queued so far has been written or has failed (counted on its WriteTracker)"""
+        if self._task is None:
+            return
+        done = asyncio.get_running_loop().create_future()
+        await self.queue.put(('flushed', done))
+        await done
+
+    async def put_activity(self, tracker=None, **row):
+        """Queue an Activity row (column name -> value); a failed write is counted on ``tracker``"""
+        await self._put(('activity', row, tracker))
+        if self.rating_engine:
+            self.rating_engine.record_activity(row['curator_id'], row['type'], row['points'], row.get('timestamp'))
+
+    async def put_response(self, tracker=None, **row):
+        """Queue a ResponseTracking row (column name -> value); a failed write is counted on ``tracker``"""
+        await self._put(('response', row, tracker))
+        if self.rating_engine:
+            self.rating_engine.record_response(row['curator_id'], row['response_time_seconds'], row.get('mention_timestamp'))
+
+    async def _put(self, item):
+        await self.queue.put(item)
+        self.metrics['enqueued'] += 1
+        depth = self.queue.qsize()
+        if depth > self.metrics['max_queue_depth']:
+            self.metrics['max_queue_depth'] = depth
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is None:
+                break
+            if item[0] in MARKERS:
+                await self._marker(*item)
+                continue
+            batch = [item]
+            marker = None
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                if item[0] in MARKERS:
+                    marker = item
+                    break
+                batch.append(item)
+
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                self.metrics['failed_rows'] += len(batch)
+                self._count_failed(batch, [row for _, row, _ in batch])
+                logging.error(f"Error flushing ingest batch: {e}")
+            if marker is not None:
+                await self._marker(*marker)
+
+    async def _marker(self, kind, done):
+        if kind == 'resync':
+            await self.load_ratings()
+        done.set_result(None)
+
+    async def _flush(self, batch):
+        started = time.perf_counter()
+        activities = [row for kind, row, _ in batch if kind == 'activity']
+        responses = [row for kind, row, _ in batch if kind == 'response']
+
+        # Levels come from the in-memory counters once loaded; otherwise the flush recomputes from the DB
+        rating_levels = None
+        if self.rating_engine and self.rating_engine.loaded:
+            touched = {row['curator_id'] for row in activities} | {row['curator_id'] for row in responses}
+            rating_levels = {curator_id: self.rating_engine.get_level(curator_id) for curator_id in touched}
+
+        # Blocking DB work runs on the bot's database executor
+        failed = await self.db_executor.run(write_batch, activities, responses, rating_levels)
+        written = len(batch) - len(failed)
+        self._count_failed(batch, failed)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.metrics['flush_count'] += 1
+        self.metrics['flushed_rows'] += written
+        self.metrics['failed_rows'] += len(batch) - written
+        self.metrics['last_flush_ms'] = round(elapsed_ms, 2)
+        self.metrics['max_flush_ms'] = max(self.metrics['max_flush_ms'], round(elapsed_ms, 2))
+        self.metrics['total_flush_ms'] += elapsed_ms
+        logging.debug(f"Ingest flush: {written}/{len(batch)} rows in {elapsed_ms:.1f}ms")
+
+    def _count_failed(self, batch, failed_rows):
+        """Count failed rows on the trackers they were queued with"""
+        if not failed_rows:
+            return
+        failed_ids = {id(row) for row in failed_rows}
+        for _, row, tracker in batch:
+            if tracker is not None and id(row) in failed_ids:
+                tracker.failed += 1
+
+    def get_metrics(self):
+        """Snapshot of queue depth and flush latency counters"""
+        metrics = dict(self.metrics)
+        metrics['queue_depth'] = self.queue.qsize()
+        metrics['avg_flush_ms'] = round(metrics['total_flush_ms'] / metrics['flush_count'], 2) if metrics['flush_count'] else 0.0
+        metrics['total_flush_ms'] = round(metrics['total_flush_ms'], 2)
+        return metrics
+
+
+def write_batch(activities, responses, rating_levels=None):
+    """Write a batch of rows in one transaction; returns the rows that could not be written.
+
+    Called on the database executor. If the batch insert fails (e.g. a curator was deleted meanwhile) rows are
+    retried one by one so a single bad row does not drop the whole batch.
+    """
+    try:
+        _insert_rows(activities, responses, rating_levels)
+        db.session.commit()
+        return []
+    except Exception as e:
+        db.session.rollback()
+        logging.warning(f"Batch insert of {len(activities) + len(responses)} rows failed, retrying row by row: {e}")
+
+    failed = []
+    for activity in activities:
+        if not _insert_single([activity], [], rating_levels):
+            failed.append(activity)
+    for response in responses:
+        if not _insert_single([], [response], rating_levels):
+            failed.append(response)
+    return failed
+
+
+def _insert_single(activities, responses, rating_levels):
+    try:
+        _insert_rows(activities, responses, rating_levels)
+        db.session.commit()
+        return 1
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Dropping ingest row {activities or responses}: {e}")
+        return 0
+
+
+class _DuplicateRows(Exception):
+    """Raised inside a savepoint when MySQL skipped rows without saying which"""
+
+
+def insert_activities(rows):
+    """Insert Activity rows, silently skipping any whose (message_id, type, curator_id) already exists.
+
+    Returns the rows actually inserted (dicts with at least curator_id,
+    server_id, type, points and timestamp), so replayed events add no points
+    or rollup counts. One statement on PostgreSQL and SQLite (ON CONFLICT DO
+    NOTHING ... RETURNING); on MySQL one INSERT IGNORE, with a key lookup
+    only when that batch really contained duplicates.
+    """
+    if not rows:
+        return []
+    table = Activity.__table__
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        statement = dialect_insert(table).on_conflict_do_nothing().returning(
+            table.c.curator_id, table.c.server_id, table.c.type, table.c.points, table.c.timestamp
+        )
+        return [dict(row._mapping) for row in db.session.execute(statement, rows)]
+
+    if dialect in ('mysql', 'mariadb'):
+        try:
+            with db.session.begin_nested():
+                result = db.session.execute(insert(table).prefix_with('IGNORE'), rows)
+                if result.rowcount != len(rows):
+                    raise _DuplicateRows()
+            return rows
+        except _DuplicateRows:
+            pass
+
+    # Find the keys that already exist and insert only the new rows
+    keys = {(row.get('message_id'), row['type'], row['curator_id']) for row in rows if row.get('message_id')}
+    existing = set()
+    if keys:
+        existing = set(db.session.execute(
+            table.select()
+            .with_only_columns(table.c.message_id, table.c.type, table.c.curator_id)
+            .where(tuple_(table.c.message_id, table.c.type, table.c.curator_id).in_(list(keys)))
+        ).all())
+    new_rows = []
+    for row in rows:
+        key = (row.get('message_id'), row['type'], row['curator_id'])
+        if key[0] is None or key not in existing:
+            new_rows.append(row)
+            if key[0] is not None:
+                existing.add(key)
+    if new_rows:
+        db.session.execute(insert(table), new_rows)
+    return new_rows
+
+
+def _insert_rows(activities, responses, rating_levels=None):
+    inserted = insert_activities(activities)
+    if len(inserted) < len(activities):
+        logging.info(f"Ingest skipped {len(activities) - len(inserted)} duplicate activities")
+    if responses:
+        db.session.execute(insert(ResponseTracking), responses)
+
+    CuratorServerDaily.record(inserted)
+
+    # Apply point deltas of the rows actually inserted with one executemany UPDATE
+    point_deltas = {}
+    for row in inserted:
+        point_deltas[row['curator_id']] = point_deltas.get(row['curator_id'], 0) + (row.get('points') or 0)
+    if point_deltas:
+        curators = Curator.__table__
+        db.session.execute(
+            update(curators)
+            .where(curators.c.id == bindparam('b_id'))
+            .values(total_points=curators.c.total_points + bindparam('b_delta')),
+            [{'b_id': curator_id, 'b_delta': delta} for curator_id, delta in point_deltas.items()]
+        )
+
+    touched = {row['curator_id'] for row in activities} | {row['curator_id'] for row in responses}
+    if rating_levels is None:
+        # Refresh rating level once per touched curator instead of once per event
+        from utils.rating import calculate_curator_rating
+        rating_levels = {curator_id: calculate_curator_rating(curator_id)['level'] for curator_id in touched}
+
+    levels = [
+        {'b_id': curator_id, 'b_level': rating_levels[curator_id]}
+        for curator_id in touched if curator_id in rating_levels
+    ]
+    if levels:
+        curators = Curator.__table__
+        db.session.execute(
+            update(curators)
+            .where(curators.c.id == bindparam('b_id'))
+            .values(rating_level=bindparam('b_level')),
+            levels
+        )
@@ -2,356 +2,265 @@
 import logging
 import re
 from datetime import datetime, timedelta
-from models.curator import Curator
-from models.discord_server import DiscordServer
-from models.activity import Activity
-from models.response_tracking import ResponseTracking
-from database import db
-from app import app
 from config import Config
+from utils.server_cache import server_cache
+from utils.curator_index import curator_index
+from utils.help_matcher import HelpRequestMatcher
+from .pending import PendingStore
+from .reminders import ReminderScheduler
 import asyncio
 
 class MessageMonitor:
     def __init__(self, bot):
         self.bot = bot
-        self.keywords = ['куратор', 'curator', 'help', 'помощь']
-        self.pending_responses = {}  # Track messages waiting for curator responses
-        self.notification_tasks = {}  # Track active notification tasks
+        self.matchers = {}  # guild id -> (config version, HelpRequestMatcher)
+        self.pending = PendingStore(bot.db)  # Help requests waiting for curator responses
+        self.reminders = ReminderScheduler(bot, self.pending)  # Curator reminders for pending requests
         
-    def start_monitoring(self):
-        """Start monitoring tasks"""
+    async def start_monitoring(self):
+        """Restore pending help requests and start monitoring tasks"""
+        try:
+            await self.pending.load(self.bot.owns_guild)
+        except Exception as e:
+            logging.error(f"Could not restore pending help requests: {e}")
+        self.pending.start()
+        
+        # Resume reminders for restored requests
+        for pending in self.pending.records():
+            server = server_cache.get_active(pending.guild_id)
+            if server:
+                self.reminders.schedule(pending, server)
+        self.reminders.start()
         logging.info("Message monitoring started")
         
-        # Start cleanup task for old pending responses
+        # Start expiry task for old pending responses
         asyncio.create_task(self.cleanup_pending_responses())
     
+    async def get_curator_id(self, discord_id):
+        """Resolve a Discord user to a curator id; non-curators cost no query"""
+        if curator_index.loaded:
+            return curator_index.lookup(discord_id)
+        
+        # Index not loaded yet - lookup may need the database
+        return await self.bot.db.run(curator_index.lookup, discord_id)
+    
+    def get_matcher(self, server):
+        """Get the compiled help request matcher, rebuilt only when server settings change"""
+        guild_id = int(server.server_id)
+        cached = self.matchers.get(guild_id)
+        if cached and cached[0] == server.version:
+            return cached[1]
+        
+        matcher = HelpRequestMatcher(server.help_keywords, server.curator_role_id)
+        self.matchers[guild_id] = (server.version, matcher)
+        return matcher
+    
     async def process_message(self, message):
         """Process incoming Discord message"""
         try:
-            with app.app_context():
-                # Find server in database
-                server = DiscordServer.find_by_server_id(str(message.guild.id))
-                if not server or not server.is_active:
-                    return
-                
-                # Check if this is a help request (from any user)
-                content_lower = message.content.lower()
-                is_help_request = any(keyword in content_lower for keyword in self.keywords)
-                
-                # Also check for role mentions
-                if server.curator_role_id:
-                    role_mentioned = f"<@&{server.curator_role_id}>" in message.content
-                    is_help_request = is_help_request or role_mentioned
-                
-                if is_help_request:
-                    await self.handle_help_request(message, server)
-                
-                # Find curator (only track activities for known curators)
-                curator = Curator.query.filter_by(discord_id=str(message.author.id)).first()
-                if not curator:
-                    return  # Skip tracking for unknown users
-                
-                # Check if this is a response to a help request
-                if message.reference and message.reference.message_id:
-                    await self.handle_response_message(message, curator, server)
-                    return  # Don't double-count as both reply and message
-                
-                # Record general message activity
-                activity = Activity()
-                activity.curator_id = curator.id
-                activity.server_id = server.id
-                activity.type = 'message'
-                activity.content = message.content[:500]  # Limit content length
-                activity.points = Config.RATING_POINTS['message']
-                activity.message_id = str(message.id)
-                activity.channel_id = str(message.channel.id)
-                
-                db.session.add(activity)
-                curator.total_points += activity.points
-                
-                # Update curator rating
-                from utils.rating import calculate_curator_rating
-                rating_data = calculate_curator_rating(curator.id)
-                curator.rating_level = rating_data['level']
-                
-                db.session.commit()
-                
-                logging.info(f"Message tracked: {curator.name} posted in {server.name} - points: {activity.points}")
+            # Server settings come from the in-memory config cache
+            server = server_cache.get_active(message.guild.id)
+            if not server:
+                return
+            self.bot.backfill.note_seen(message)
+            
+            # Check if this is a help request (from any user): keywords and role mention in one pass
+            trigger = self.get_matcher(server).match(message.content)
+            if trigger:
+                await self.handle_help_request(message, server, trigger)
+            
+            # Find curator (only track activities for known curators)
+            curator_id = await self.get_curator_id(message.author.id)
+            if curator_id is None:
+                return  # Skip tracking for unknown users
+            
+            # Check if this is a response to a help request
+            if message.reference and message.reference.message_id:
+                await self.handle_response_message(message, curator_id, server)
+                return  # Don't double-count as both reply and message
+            
+            # Record general message activity (written by the ingest queue)
+            activity = self.message_activity(message, server, curator_id)
+            await self.bot.ingest.put_activity(**activity)
+            
+            logging.info(f"Message tracked: {message.author.display_name} posted in {server.name} - points: {activity['points']}")
         
         except Exception as e:
             logging.error(f"Error processing message: {e}")
-            db.session.rollback()
     
-    async def handle_help_request(self, message, server):
+    def message_activity(self, message, server, curator_id, timestamp=None):
+        """Activity row for a curator's message (shared by live tracking and backfill)"""
+        return dict(
+            curator_id=curator_id,
+            server_id=server.id,
+            type='message',
+            content=message.content[:500],  # Limit content length
+            points=Config.RATING_POINTS['message'],
+            message_id=str(message.id),
+            channel_id=str(message.channel.id),
+            timestamp=timestamp or datetime.utcnow()
+        )
+    
+    def reaction_activity(self, message_id, channel_id, emoji, server, curator_id, timestamp=None):
+        """Activity row for a curator's reaction on a message"""
+        return dict(
+            curator_id=curator_id,
+            server_id=server.id,
+            type='reaction',
+            content=f"Reacted with {emoji}",
+            points=Config.RATING_POINTS['reaction'],
+            message_id=str(message_id),
+            channel_id=str(channel_id),
+            timestamp=timestamp or datetime.utcnow()
+        )
+    
+    def response_row(self, curator_id, server, pending, response_message_id, channel_id, response_timestamp=None):
+        """ResponseTracking row for a curator answering a pending help request"""
+        response_timestamp = response_timestamp or datetime.utcnow()
+        return dict(
+            curator_id=curator_id,
+            server_id=server.id,
+            mention_timestamp=pending.timestamp,
+            response_timestamp=response_timestamp,
+            response_time_seconds=max(0, int((response_timestamp - pending.timestamp).total_seconds())),
+            mention_message_id=pending.message_id,
+            response_message_id=response_message_id,
+            channel_id=channel_id,
+            trigger_keywords=pending.trigger or ','.join(server.help_keywords)
+        )
+    
+    async def handle_help_request(self, message, server, trigger=None, timestamp=None):
         """Handle detected help request"""
         try:
             message_id = str(message.id)
             
-            # Prevent duplicate help request handling
-            if message_id in self.pending_responses:
-                return  # Already processing this message
-            
-            # Store pending response for tracking
-            self.pending_responses[message_id] = {
-                'timestamp': datetime.utcnow(),
-                'server_id': server.id,
-                'channel_id': str(message.channel.id),
-                'author_id': str(message.author.id)
-            }
+            # Store pending response for tracking (None if already processing this message)
+            pending = self.pending.add(
+                message_id,
+                guild_id=message.guild.id,
+                channel_id=message.channel.id,
+                author_id=message.author.id,
+                server_id=server.id,
+                trigger=trigger,
+                timestamp=timestamp
+            )
+            if pending is None:
+                return
             
             logging.info(f"Help request detected in {server.name}: {message.content[:100]}")
             
-            # Notify curators if role is configured (start async task)
-            if server.curator_role_id and message_id not in self.notification_tasks:
-                task = asyncio.create_task(self.notify_curators(message, server))
-                self.notification_tasks[message_id] = task
+            # Remind curators while unanswered if a role is configured
+            self.reminders.schedule(pending, server)
         
         except Exception as e:
             logging.error(f"Error handling help request: {e}")
     
-    async def handle_response_message(self, message, curator, server):
+    async def record_response(self, curator_id, server, mention_message_id, response_message_id, channel_id):
+        """Queue response tracking for a pending help request and stop its reminders"""
+        pending = self.pending.pop(mention_message_id)
+        self.reminders.cancel(mention_message_id)
+        
+        response = self.response_row(curator_id, server, pending, response_message_id, channel_id)
+        await self.bot.ingest.put_response(**response)
+        return response['response_time_seconds']
+    
+    async def handle_response_message(self, message, curator_id, server):
         """Handle response to help request"""
         try:
             # Get the original message
             original_message_id = str(message.reference.message_id)
             
-            if original_message_id in self.pending_responses:
-                pending = self.pending_responses[original_message_id]
-                
-                # Calculate response time
-                response_time = datetime.utcnow() - pending['timestamp']
-                response_seconds = int(response_time.total_seconds())
-                
-                # Record response tracking
-                response_tracking = ResponseTracking()
-                response_tracking.curator_id = curator.id
-                response_tracking.server_id = server.id
-                response_tracking.mention_timestamp = pending['timestamp']
-                response_tracking.response_timestamp = datetime.utcnow()
-                response_tracking.response_time_seconds = response_seconds
-                response_tracking.mention_message_id = original_message_id
-                response_tracking.response_message_id = str(message.id)
-                response_tracking.channel_id = str(message.channel.id)
-                response_tracking.trigger_keywords = ','.join(self.keywords)
-                
-                db.session.add(response_tracking)
+            if original_message_id in self.pending:
+                response_seconds = await self.record_response(
+                    curator_id,
+                    server,
+                    original_message_id,
+                    str(message.id),
+                    str(message.channel.id)
+                )
                 
-                # Remove from pending responses and cancel notifications
-                del self.pending_responses[original_message_id]
-                if original_message_id in self.notification_tasks:
-                    self.notification_tasks[original_message_id].cancel()
-                    del self.notification_tasks[original_message_id]
-                
-                # Update curator rating
-                from utils.rating import calculate_curator_rating
-                rating_data = calculate_curator_rating(curator.id)
-                curator.rating_level = rating_data['level']
-                
-                db.session.commit()
-                
-                logging.info(f"Response tracked: {curator.name} responded in {response_seconds}s")
+                logging.info(f"Response tracked: {message.author.display_name} responded in {response_seconds}s")
         
         except Exception as e:
             logging.error(f"Error handling response message: {e}")
-            db.session.rollback()
     
-    async def process_reaction(self, reaction, user, action):
-        """Process reaction add/remove"""
+    async def process_reaction(self, payload, action):
+        """Process reaction add/remove from a raw gateway payload (ids only, no cached message)"""
         try:
-            with app.app_context():
-                # Find server and curator
-                server = DiscordServer.find_by_server_id(str(reaction.message.guild.id))
-                if not server or not server.is_active:
-                    return
+            server = server_cache.get_active(payload.guild_id)
+            if not server:
+                return
+            
+            # Find curator (reactions from other users are not tracked)
+            curator_id = await self.get_curator_id(payload.user_id)
+            if curator_id is None:
+                return
+            
+            # Only track reaction additions for points
+            if action != 'add':
+                return
+            
+            user_name = payload.member.display_name if payload.member else payload.user_id
+            
+            # Check if this reaction is on a help request
+            message_id = str(payload.message_id)
+            if message_id in self.pending:
+                # This is a reaction to a help request - record as response
+                response_seconds = await self.record_response(
+                    curator_id,
+                    server,
+                    message_id,
+                    f"reaction_{payload.emoji}",
+                    str(payload.channel_id)
+                )
                 
-                curator = Curator.query.filter_by(discord_id=str(user.id)).first()
-                if not curator:
-                    # Auto-create curator
-                    curator = Curator()
-                    curator.discord_id = str(user.id)
-                    curator.name = user.display_name
-                    curator.curator_type = 'auto_created'
-                    db.session.add(curator)
-                    db.session.flush()
+                logging.info(f"Reaction tracked: {user_name} reacted with {payload.emoji} in {server.name}")
+                logging.info(f"Response tracked: {user_name} responded in {response_seconds}s")
                 
-                # Only track reaction additions for points
-                if action == 'add':
-                    # Check if this reaction is on a help request
-                    message_id = str(reaction.message.id)
-                    is_help_response = message_id in self.pending_responses
-                    
-                    if is_help_response:
-                        # This is a reaction to a help request - record as response
-                        pending = self.pending_responses[message_id]
-                        response_time = datetime.utcnow() - pending['timestamp']
-                        response_seconds = int(response_time.total_seconds())
-                        
-                        # Record response tracking for reaction
-                        response_tracking = ResponseTracking()
-                        response_tracking.curator_id = curator.id
-                        response_tracking.server_id = server.id
-                        response_tracking.mention_timestamp = pending['timestamp']
-                        response_tracking.response_timestamp = datetime.utcnow()
-                        response_tracking.response_time_seconds = response_seconds
-                        response_tracking.mention_message_id = message_id
-                        response_tracking.response_message_id = f"reaction_{reaction.emoji}"
-                        response_tracking.channel_id = str(reaction.message.channel.id)
-                        response_tracking.trigger_keywords = ','.join(self.keywords)
-                        
-                        db.session.add(response_tracking)
-                        
-                        # Remove from pending responses and cancel notifications
-                        del self.pending_responses[message_id]
-                        if message_id in self.notification_tasks:
-                            self.notification_tasks[message_id].cancel()
-                            del self.notification_tasks[message_id]
-                        
-                        # Update curator rating
-                        from utils.rating import calculate_curator_rating
-                        rating_data = calculate_curator_rating(curator.id)
-                        curator.rating_level = rating_data['level']
-                        
-                        db.session.commit()
-                        
-                        logging.info(f"Reaction tracked: {curator.name} reacted with {reaction.emoji} in {server.name}")
-                        logging.info(f"Response tracked: {curator.name} responded in {response_seconds}s")
-                        
-                        # Don't record this as general reaction activity - it's already a response
-                        return
-                    
-                    # Record general reaction activity
-                    activity = Activity()
-                    activity.curator_id = curator.id
-                    activity.server_id = server.id
-                    activity.type = 'reaction'
-                    activity.content = f"Reacted with {reaction.emoji}"
-                    activity.points = Config.RATING_POINTS['reaction']
-                    activity.message_id = str(reaction.message.id)
-                    activity.channel_id = str(reaction.message.channel.id)
-                    
-                    db.session.add(activity)
-                    curator.total_points += activity.points
-                    
-                    # Recalculate rating
-                    from utils.rating import calculate_curator_rating
-                    rating_data = calculate_curator_rating(curator.id)
-                    curator.rating_level = rating_data['level']
-                    
-                    db.session.commit()
+                # Don't record this as general reaction activity - it's already a response
+                return
+            
+            # Record general reaction activity
+            await self.bot.ingest.put_activity(
+                **self.reaction_activity(payload.message_id, payload.channel_id, payload.emoji, server, curator_id)
+            )
         
         except Exception as e:
             logging.error(f"Error processing reaction: {e}")
-            db.session.rollback()
     
-    async def process_message_edit(self, before, after):
+    async def process_message_edit(self, payload):
         """Process message edits"""
         # Currently just log edits, could be extended for activity tracking
-        logging.debug(f"Message edited by {after.author.display_name}")
+        logging.debug(f"Message {payload.message_id} edited in channel {payload.channel_id}")
     
-    async def process_message_delete(self, message):
+    async def process_message_delete(self, message_id):
         """Process message deletions"""
         # Remove from pending responses if it was a help request
-        message_id = str(message.id)
-        if message_id in self.pending_responses:
-            del self.pending_responses[message_id]
-            if message_id in self.notification_tasks:
-                self.notification_tasks[message_id].cancel()
-                del self.notification_tasks[message_id]
+        message_id = str(message_id)
+        if self.pending.pop(message_id) is not None:
+            self.reminders.cancel(message_id)
             logging.debug(f"Removed deleted message from pending responses")
     
-    async def notify_curators(self, message, server):
-        """Notify curators about help request with repeating reminders"""
-        try:
-            if not server.curator_role_id:
-                return
-            
-            # Get notification settings - refresh server data from DB
-            with app.app_context():
-                fresh_server = DiscordServer.find_by_server_id(str(message.guild.id))
-                if not fresh_server:
-                    return
-                reminder_interval = fresh_server.reminder_interval_seconds or 300  # Default 5 minutes
-                auto_reminder_enabled = fresh_server.auto_reminder_enabled if fresh_server.auto_reminder_enabled is not None else True
-                
-            logging.info(f"Using reminder interval: {reminder_interval}s, auto-reminder: {auto_reminder_enabled}")
-            
-            # Get the role
-            guild = message.guild
-            role = guild.get_role(int(server.curator_role_id))
-            
-            if not role:
-                logging.warning(f"Role {server.curator_role_id} not found in {guild.name}")
-                return
-            
-            # Start reminder loop
-            elapsed_time = 0
-            reminder_count = 0
-            
-            while True:
-                # Wait for the reminder interval
-                await asyncio.sleep(reminder_interval)
-                elapsed_time += reminder_interval
-                reminder_count += 1
-                
-                # Check if the message was already responded to
-                if str(message.id) not in self.pending_responses:
-                    logging.info(f"Help request {message.id} was answered, stopping reminders")
-                    return  # Already responded to
-                
-                # Format elapsed time
-                minutes = elapsed_time // 60
-                seconds = elapsed_time % 60
-                if minutes > 0:
-                    time_text = f"{minutes} минут {seconds} секунд" if seconds > 0 else f"{minutes} минут"
-                else:
-                    time_text = f"{seconds} секунд"
-                
-                # Send notification
-                notification_text = f"⚠️ {role.mention} Запрос помощи без ответа уже {time_text}!\n" \
-                                  f"Сообщение: {message.jump_url}"
-                
-                try:
-                    await message.channel.send(notification_text)
-                    logging.info(f"Reminder #{reminder_count} sent for message {message.id} after {elapsed_time}s")
-                except Exception as e:
-                    logging.error(f"Could not send reminder: {e}")
-                    return
-                
-                # If auto reminder is disabled, send only one notification
-                if not auto_reminder_enabled:
-                    logging.info(f"Auto reminder disabled, sent single notification for {message.id}")
-                    return
-        
-        except Exception as e:
-            logging.error(f"Error in curator notification loop: {e}")
-        except asyncio.CancelledError:
-            logging.info(f"Notification task cancelled for message {message.id}")
-            return
-    
     async def cleanup_pending_responses(self):
-        """Clean up old pending responses"""
+        """Expire pending responses as their deadlines pass"""
         while True:
             try:
-                current_time = datetime.utcnow()
-                expired_responses = []
+                expired_responses = self.pending.expire()
                 
-                for message_id, pending in self.pending_responses.items():
-                    # Remove responses older than 1 hour
-                    if (current_time - pending['timestamp']).total_seconds() > 3600:
-                        expired_responses.append(message_id)
-                
-                for message_id in expired_responses:
-                    del self.pending_responses[message_id]
-                    if message_id in self.notification_tasks:
-                        self.notification_tasks[message_id].cancel()
-                        del self.notification_tasks[message_id]
+                for pending in expired_responses:
+                    self.reminders.cancel(pending.message_id)
                 
                 if expired_responses:
                     logging.info(f"Cleaned up {len(expired_responses)} expired pending responses")
                 
-                # Wait 5 minutes before next cleanup
-                await asyncio.sleep(300)
+                # Sleep until the next deadline (new requests always expire after existing ones)
+                next_expiry = self.pending.next_expiry()
+                if next_expiry is None:
+                    delay = 300
+                else:
+                    delay = (next_expiry - datetime.utcnow()).total_seconds()
+                await asyncio.sleep(min(max(delay, 1), 300))
             
             except Exception as e:
                 logging.error(f"Error in cleanup task: {e}")
-                await asyncio.sleep(60)  # Wait 1 minute on error
\ No newline at end of file
+                await asyncio.sleep(60)  # Wait 1 minute on error
@@ -4,7 +4,8 @@ import logging
 from datetime import datetime
 from models.curator import Curator
 from models.discord_server import DiscordServer
-from app import app
+from database import db
+from utils.server_cache import server_cache
 
 class NotificationManager:
     def __init__(self, bot):
@@ -51,44 +52,42 @@ class NotificationManager:
         try:
             sent_count = 0
             
-            with app.app_context():
-                servers = DiscordServer.get_active_servers()
+            # Active servers come from the config cache - no database query needed
+            for guild_id in server_cache.active_servers():
+                guild = self.bot.get_guild(guild_id)
+                if not guild:
+                    continue
                 
-                for server in servers:
-                    guild = self.bot.get_guild(int(server.server_id))
-                    if not guild:
-                        continue
-                    
-                    # Create embed for system notification
-                    color = {
-                        'info': discord.Color.blue(),
-                        'warning': discord.Color.orange(),
-                        'error': discord.Color.red(),
-                        'success': discord.Color.green()
-                    }.get(notification_type, discord.Color.blue())
-                    
-                    embed = discord.Embed(
-                        title="GovTracker2 System Notification",
-                        description=message,
-                        color=color,
-                        timestamp=datetime.utcnow()
-                    )
-                    
-                    embed.set_footer(text="GovTracker2 Python Migration by Replit Agent")
-                    
-                    # Find suitable channel
-                    channel = None
-                    for ch in guild.text_channels:
-                        if ch.permissions_for(guild.me).send_messages:
-                            channel = ch
-                            break
-                    
-                    if channel:
-                        try:
-                            await channel.send(embed=embed)
-                            sent_count += 1
-                        except Exception as e:
-                            logging.error(f"Failed to send to {guild.name}: {e}")
+                # Create embed for system notification
+                color = {
+                    'info': discord.Color.blue(),
+                    'warning': discord.Color.orange(),
+                    'error': discord.Color.red(),
+                    'success': discord.Color.green()
+                }.get(notification_type, discord.Color.blue())
+                
+                embed = discord.Embed(
+                    title="GovTracker2 System Notification",
+                    description=message,
+                    color=color,
+                    timestamp=datetime.utcnow()
+                )
+                
+                embed.set_footer(text="GovTracker2 Python Migration by Replit Agent")
+                
+                # Find suitable channel
+                channel = None
+                for ch in guild.text_channels:
+                    if ch.permissions_for(guild.me).send_messages:
+                        channel = ch
+                        break
+                
+                if channel:
+                    try:
+                        await channel.send(embed=embed)
+                        sent_count += 1
+                    except Exception as e:
+                        logging.error(f"Failed to send to {guild.name}: {e}")
             
             logging.info(f"System notification sent to {sent_count} servers")
             return sent_count > 0
@@ -120,36 +119,44 @@ class NotificationManager:
     
     async def send_curator_update_notification(self, curator_id, update_type, details=None):
         """Send notification about curator updates"""
+        def load_curator_update():
+            curator = db.session.get(Curator, curator_id)
+            if not curator:
+                return None
+            
+            messages = {
+                'level_up': f"🎉 {curator.name} leveled up to {curator.rating_level}!",
+                'milestone': f"🏆 {curator.name} reached {curator.total_points} points!",
+                'achievement': f"⭐ {curator.name} earned an achievement!"
+            }
+            
+            message = messages.get(update_type, f"📢 Update for {curator.name}")
+            
+            # Servers where curator has activity
+            targets = []
+            for server in DiscordServer.get_active_servers():
+                recent_activity = curator.activities.filter_by(server_id=server.id).first()
+                if recent_activity:
+                    targets.append((
+                        int(server.server_id),
+                        int(server.curator_role_id) if server.curator_role_id else None
+                    ))
+            
+            return message, targets
+        
         try:
-            with app.app_context():
-                curator = Curator.query.get(curator_id)
-                if not curator:
-                    return False
-                
-                messages = {
-                    'level_up': f"🎉 {curator.name} leveled up to {curator.rating_level}!",
-                    'milestone': f"🏆 {curator.name} reached {curator.total_points} points!",
-                    'achievement': f"⭐ {curator.name} earned an achievement!"
-                }
-                
-                message = messages.get(update_type, f"📢 Update for {curator.name}")
-                
-                if details:
-                    message += f"\n{details}"
-                
-                # Send to servers where curator is active
-                servers = DiscordServer.get_active_servers()
-                for server in servers:
-                    # Check if curator has activity in this server
-                    recent_activity = curator.activities.filter_by(server_id=server.id).first()
-                    if recent_activity:
-                        await self.send_curator_notification(
-                            int(server.server_id),
-                            message,
-                            int(server.role_tag_id) if server.role_tag_id else None
-                        )
-                
-                return True
+            result = await self.bot.db.run(load_curator_update)
+            if not result:
+                return False
+            
+            message, targets = result
+            if details:
+                message += f"\n{details}"
+            
+            for guild_id, role_id in targets:
+                await self.send_curator_notification(guild_id, message, role_id)
+            
+            return True
                 
         except Exception as e:
             logging.error(f"Error sending curator update notification: {e}")
@@ -157,53 +164,53 @@ class NotificationManager:
     
     async def send_daily_report(self):
         """Send daily activity report"""
+        def build_daily_report():
+            from datetime import timedelta
+            from sqlalchemy import func
+            from models.curator_server_daily import CuratorServerDaily
+            
+            # Get yesterday's statistics (UTC day) from the daily rollup
+            yesterday = datetime.utcnow() - timedelta(days=1)
+            day = yesterday.date()
+            
+            daily_stats = db.session.query(
+                func.sum(CuratorServerDaily.activity_count).label('total_activities'),
+                func.count(CuratorServerDaily.curator_id.distinct()).label('active_curators'),
+                func.sum(CuratorServerDaily.points).label('total_points')
+            ).filter(
+                CuratorServerDaily.day == day
+            ).first()
+            
+            # Get top curator of the day
+            top_curator_data = db.session.query(
+                CuratorServerDaily.curator_id,
+                func.sum(CuratorServerDaily.points).label('daily_points')
+            ).filter(
+                CuratorServerDaily.day == day
+            ).group_by(CuratorServerDaily.curator_id).order_by(
+                func.sum(CuratorServerDaily.points).desc()
+            ).first()
+            
+            top_curator_name = "None"
+            if top_curator_data:
+                top_curator = db.session.get(Curator, top_curator_data.curator_id)
+                if top_curator:
+                    top_curator_name = f"{top_curator.name} ({top_curator_data.daily_points} pts)"
+            
+            # Create report message
+            report = f"📊 **Daily Activity Report**\n"
+            report += f"**Date:** {yesterday.strftime('%Y-%m-%d')}\n"
+            report += f"**Total Activities:** {daily_stats.total_activities or 0}\n"
+            report += f"**Active Curators:** {daily_stats.active_curators or 0}\n"
+            report += f"**Total Points Earned:** {daily_stats.total_points or 0}\n"
+            report += f"**Top Curator:** {top_curator_name}\n"
+            return report
+        
         try:
-            with app.app_context():
-                from datetime import timedelta
-                from sqlalchemy import func
-                from models.activity import Activity
-                
-                # Get yesterday's statistics
-                yesterday = datetime.utcnow() - timedelta(days=1)
-                today = datetime.utcnow()
-                
-                daily_stats = db.session.query(
-                    func.count(Activity.id).label('total_activities'),
-                    func.count(Activity.curator_id.distinct()).label('active_curators'),
-                    func.sum(Activity.points).label('total_points')
-                ).filter(
-                    Activity.timestamp >= yesterday,
-                    Activity.timestamp < today
-                ).first()
-                
-                # Get top curator of the day
-                top_curator_data = db.session.query(
-                    Activity.curator_id,
-                    func.sum(Activity.points).label('daily_points')
-                ).filter(
-                    Activity.timestamp >= yesterday,
-                    Activity.timestamp < today
-                ).group_by(Activity.curator_id).order_by(
-                    func.sum(Activity.points).desc()
-                ).first()
-                
-                top_curator_name = "None"
-                if top_curator_data:
-                    top_curator = Curator.query.get(top_curator_data.curator_id)
-                    if top_curator:
-                        top_curator_name = f"{top_curator.name} ({top_curator_data.daily_points} pts)"
-                
-                # Create report message
-                report = f"📊 **Daily Activity Report**\n"
-                report += f"**Date:** {yesterday.strftime('%Y-%m-%d')}\n"
-                report += f"**Total Activities:** {daily_stats.total_activities or 0}\n"
-                report += f"**Active Curators:** {daily_stats.active_curators or 0}\n"
-                report += f"**Total Points Earned:** {daily_stats.total_points or 0}\n"
-                report += f"**Top Curator:** {top_curator_name}\n"
-                
-                await self.send_system_notification(report, "info")
-                
-                return True
+            report = await self.bot.db.run(build_daily_report)
+            await self.send_system_notification(report, "info")
+            
+            return True
                 
         except Exception as e:
             logging.error(f"Error sending daily report: {e}")
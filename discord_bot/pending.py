@@ -0,0 +1,199 @@
+# GovTracker2 Python Migration by Replit Agent
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert
+from database import db
+from config import Config
+from models.pending_help_request import PendingHelpRequest
+
+
+class PendingRequest:
+    """A help request waiting for a curator response"""
+
+    __slots__ = (
+        'message_id', 'guild_id', 'channel_id', 'author_id',
+        'server_id', 'trigger', 'timestamp', 'expires_at'
+    )
+
+    def __init__(self, message_id, guild_id, channel_id, author_id, server_id, trigger, timestamp, expires_at):
+        self.message_id = message_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.server_id = server_id
+        self.trigger = trigger
+        self.timestamp = timestamp
+        self.expires_at = expires_at
+
+    def to_row(self):
+        return {
+            'message_id': self.message_id,
+            'guild_id': self.guild_id,
+            'channel_id': self.channel_id,
+            'author_id': self.author_id,
+            'server_id': self.server_id,
+            'trigger': self.trigger[:500] if self.trigger else None,
+            'created_at': self.timestamp,
+            'expires_at': self.expires_at
+        }
+
+    def __repr__(self):
+        return f'<PendingRequest {self.message_id} expires {self.expires_at}>'
+
+
+def write_journal(operations):
+    """Apply queued pending-store changes in order, in one transaction"""
+    table = PendingHelpRequest.__table__
+    for action, value in operations:
+        if action == 'add':
+            db.session.execute(insert(table), value)
+        elif action == 'remove':
+            db.session.execute(delete(table).where(table.c.message_id.in_(value)))
+        elif action == 'expire':
+            db.session.execute(delete(table).where(table.c.expires_at <= value))
+    db.session.commit()
+
+
+class PendingStore:
+    """Pending help requests keyed by message id with a min-heap of expiry times.
+
+    Lookups are dict lookups. Expiring entries pops from the heap, so it costs
+    O(log n) per expired entry instead of a scan over every pending request.
+    Answered requests leave their heap entry behind and it is skipped when it
+    reaches the top; the heap is rebuilt when stale entries pile up.
+
+    Every change is also journaled to the ``pending_help_requests`` table by a
+    background writer (in order, batched) so a restart does not lose
+    in-flight response timing.
+    """
+
+    def __init__(self, db_executor, ttl_seconds=None):
+        self.db = db_executor
+        self.ttl = timedelta(seconds=ttl_seconds or Config.PENDING_RESPONSE_TTL_SECONDS)
+        self._entries = {}
+        self._heap = []  # (expires_at, message_id)
+        self._journal = None
+        self._writer = None
+
+    def __contains__(self, message_id):
+        return message_id in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, message_id):
+        return self._entries.get(message_id)
+
+    def records(self):
+        """Snapshot of all pending requests"""
+        return list(self._entries.values())
+
+    async def load(self, owns_guild=None):
+        """Restore unexpired pending requests saved before the last shutdown.
+
+        ``owns_guild`` limits the restore to guilds handled by this process
+        when the bot runs sharded across processes.
+        """
+        rows = await self.db.run(PendingHelpRequest.load_active)
+        restored = 0
+        for row in rows:
+            record = PendingRequest(*row)
+            if owns_guild is None or owns_guild(record.guild_id):
+                self._track(record)
+                restored += 1
+        logging.info(f"Pending help requests restored: {restored}")
+        return restored
+
+    def start(self):
+        """Start the background journal writer"""
+        if self._writer is None:
+            self._journal = asyncio.Queue()
+            self._writer = asyncio.create_task(self._write_loop())
+
+    async def stop(self):
+        """Write out queued changes and stop the journal writer"""
+        if self._writer is None:
+            return
+        await self._journal.put(None)
+        await self._writer
+        self._writer = None
+
+    def add(self, message_id, guild_id, channel_id, author_id, server_id, trigger=None, timestamp=None):
+        """Track a new help request; returns None if it is already pending"""
+        if message_id in self._entries:
+            return None
+        timestamp = timestamp or datetime.utcnow()
+        record = PendingRequest(
+            message_id, str(guild_id), str(channel_id), str(author_id) if author_id else None,
+            server_id, trigger, timestamp, timestamp + self.ttl
+        )
+        self._track(record)
+        self._log('add', record.to_row())
+        return record
+
+    def pop(self, message_id):
+        """Stop tracking a request (answered or deleted); returns its record or None"""
+        record = self._entries.pop(message_id, None)
+        if record is not None:
+            self._log('remove', [message_id])
+            self._compact()
+        return record
+
+    def expire(self, now=None):
+        """Drop every request whose deadline has passed; returns the dropped records"""
+        now = now or datetime.utcnow()
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, message_id = heapq.heappop(heap)
+            record = self._entries.get(message_id)
+            # Skip heap entries left behind by answered requests
+            if record is not None and record.expires_at == expires_at:
+                del self._entries[message_id]
+                expired.append(record)
+        if expired:
+            self._log('expire', now)
+        return expired
+
+    def next_expiry(self):
+        """Earliest deadline still in the heap (may belong to an answered request)"""
+        return self._heap[0][0] if self._heap else None
+
+    def _track(self, record):
+        self._entries[record.message_id] = record
+        heapq.heappush(self._heap, (record.expires_at, record.message_id))
+
+    def _compact(self):
+        # Answered requests leave stale heap entries; rebuild once they dominate
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [(r.expires_at, r.message_id) for r in self._entries.values()]
+            heapq.heapify(self._heap)
+
+    def _log(self, action, value):
+        if self._journal is not None:
+            self._journal.put_nowait((action, value))
+
+    async def _write_loop(self):
+        while True:
+            operation = await self._journal.get()
+            stopping = operation is None
+            operations = [] if stopping else [operation]
+
+            # Drain whatever else is queued so a burst is written in one transaction
+            while not self._journal.empty():
+                operation = self._journal.get_nowait()
+                if operation is None:
+                    stopping = True
+                else:
+                    operations.append(operation)
+
+            if operations:
+                try:
+                    await self.db.run(write_journal, operations)
+                except Exception as e:
+                    logging.error(f"Error saving pending help requests: {e}")
+
+            if stopping:
+                return
@@ -0,0 +1,81 @@
+# GovTracker2 Python Migration by Replit Agent
+import logging
+import discord
+from config import Config
+
+
+class BotProfile:
+    """discord.py cache and intent settings for one way of running the bot.
+
+    ``default`` keeps discord.py's usual caches, with a 100-message cache.
+    ``lean`` keeps only what tracking needs: message events come with ids
+    and content, reactions and deletes are handled from raw payloads, and
+    server settings and curators are cached by the app itself. So it drops
+    the message cache, member caching, guild chunking and unused intents.
+    """
+
+    def __init__(self, name, intents, max_messages, chunk_guilds_at_startup, member_cache_flags):
+        self.name = name
+        self.intents = intents
+        self.max_messages = max_messages
+        self.chunk_guilds_at_startup = chunk_guilds_at_startup
+        self.member_cache_flags = member_cache_flags
+
+    def client_options(self):
+        """Keyword arguments for discord.Client / commands.Bot"""
+        return {
+            'intents': self.intents,
+            'max_messages': self.max_messages,
+            'chunk_guilds_at_startup': self.chunk_guilds_at_startup,
+            'member_cache_flags': self.member_cache_flags
+        }
+
+    def describe(self):
+        enabled = [name for name, value in self.intents if value]
+        return (f"{self.name}: max_messages={self.max_messages}, chunking={self.chunk_guilds_at_startup}, "
+                f"member_cache={self.member_cache_flags.value}, intents={','.join(enabled)}")
+
+
+def default_profile():
+    # Privileged intents (members, presences) stay off: they require approval in the Developer Portal
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.reactions = True
+    intents.guilds = True
+    return BotProfile(
+        'default',
+        intents,
+        max_messages=Config.BOT_MAX_MESSAGES if Config.BOT_MAX_MESSAGES is not None else 100,
+        chunk_guilds_at_startup=intents.members,
+        member_cache_flags=discord.MemberCacheFlags.from_intents(intents)
+    )
+
+
+def lean_profile():
+    intents = discord.Intents.none()
+    intents.guilds = True  # guild and channel objects, joins and leaves
+    intents.guild_messages = True
+    intents.guild_reactions = True
+    intents.message_content = True
+    return BotProfile(
+        'lean',
+        intents,
+        max_messages=Config.BOT_MAX_MESSAGES,  # None disables the message cache
+        chunk_guilds_at_startup=False,
+        member_cache_flags=discord.MemberCacheFlags.none()
+    )
+
+
+PROFILES = {
+    'default': default_profile,
+    'lean': lean_profile
+}
+
+
+def get_profile(name=None):
+    """Build the named profile (Config.BOT_PROFILE by default)"""
+    name = name or Config.BOT_PROFILE
+    if name not in PROFILES:
+        logging.warning(f"Unknown bot profile '{name}', using default")
+        name = 'default'
+    return PROFILES[name]()
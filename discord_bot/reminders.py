@@ -0,0 +1,141 @@
+# GovTracker2 Python Migration by Replit Agent
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime
+from utils.server_cache import server_cache
+from .dispatcher import ReminderDispatcher
+
+
+class ReminderEntry:
+    """Next reminder for one pending help request"""
+
+    __slots__ = ('message_id', 'fire_at', 'count')
+
+    def __init__(self, message_id, fire_at):
+        self.message_id = message_id
+        self.fire_at = fire_at
+        self.count = 0
+
+
+class ReminderScheduler:
+    """One task that sends curator reminders for every pending help request.
+
+    Next-fire times live in a min-heap ordered by ``time.monotonic()``. The
+    task sleeps until the earliest one (or until an earlier reminder is
+    scheduled). Cancelling a reminder only drops its entry from a dict; the
+    matching heap item is discarded when it reaches the top. Due reminders
+    are handed to a ReminderDispatcher, which merges them per channel.
+    """
+
+    def __init__(self, bot, pending_store):
+        self.bot = bot
+        self.pending = pending_store
+        self._entries = {}
+        self._heap = []  # (fire_at, seq, message_id)
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.dispatcher = ReminderDispatcher(bot, is_pending=pending_store.__contains__, on_failed=self._on_failed)
+        self.stats = {'scheduled': 0, 'fired': 0, 'cancelled': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.dispatcher.stop()
+
+    def schedule(self, pending, server):
+        """Schedule reminders for a pending request if its server has a curator role"""
+        if not server.curator_role_id or pending.message_id in self._entries:
+            return False
+
+        # Restored requests keep their original cadence
+        interval = server.reminder_interval_seconds
+        waited = max(0.0, (datetime.utcnow() - pending.timestamp).total_seconds())
+        if not server.auto_reminder_enabled and waited >= interval:
+            return False  # The single reminder was due before the restart
+        delay = interval - waited % interval if waited else interval
+        entry = ReminderEntry(pending.message_id, time.monotonic() + delay)
+        entry.count = int(waited // interval)
+        self._entries[pending.message_id] = entry
+        self._push(entry)
+        self.stats['scheduled'] += 1
+        return True
+
+    def cancel(self, message_id):
+        """Stop reminders for a request; the heap entry is dropped lazily"""
+        if self._entries.pop(message_id, None) is not None:
+            self.stats['cancelled'] += 1
+
+    def _on_failed(self, message_ids):
+        # Stop reminding when a reminder could not be delivered, as before
+        for message_id in message_ids:
+            self._entries.pop(message_id, None)
+
+    def _push(self, entry):
+        was_first = not self._heap or entry.fire_at < self._heap[0][0]
+        heapq.heappush(self._heap, (entry.fire_at, next(self._seq), entry.message_id))
+        if was_first:
+            self._wakeup.set()
+
+    def _pop_due(self, now):
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            fire_at, _, message_id = heapq.heappop(heap)
+            entry = self._entries.get(message_id)
+            if entry is None or entry.fire_at != fire_at:
+                continue  # Cancelled or rescheduled
+            if message_id not in self.pending:
+                del self._entries[message_id]  # Answered or expired
+                continue
+            due.append(entry)
+        return due
+
+    async def _run(self):
+        while True:
+            try:
+                self._wakeup.clear()
+                timeout = max(0.0, self._heap[0][0] - time.monotonic()) if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+                for entry in self._pop_due(time.monotonic()):
+                    self._fire(entry)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Error in reminder scheduler: {e}")
+                await asyncio.sleep(1)
+
+    def _fire(self, entry):
+        pending = self.pending.get(entry.message_id)
+        server = server_cache.get(pending.guild_id)
+        if not server or not server.curator_role_id:
+            del self._entries[entry.message_id]
+            return
+
+        entry.count += 1
+        self.stats['fired'] += 1
+        self.dispatcher.enqueue(pending, server.curator_role_id)
+
+        # Settings are read on every fire, so interval changes apply to open requests
+        if server.auto_reminder_enabled:
+            entry.fire_at = time.monotonic() + server.reminder_interval_seconds
+            self._push(entry)
+        else:
+            del self._entries[entry.message_id]
+            logging.info(f"Auto reminder disabled, sent single notification for {entry.message_id}")
@@ -0,0 +1,398 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Capture gateway events and replay them through the bot's handlers.
+
+Capture: set EVENT_CAPTURE_PATH and the bot appends every message, reaction,
+edit and delete it handles for tracked servers to a gzip JSONL file.
+
+Replay against a local database, without a Discord connection:
+
+    python -m discord_bot.replay events.jsonl.gz --seed             # as fast as possible
+    python -m discord_bot.replay events.jsonl.gz --speed 1          # recorded pacing
+    python -m discord_bot.replay events.jsonl.gz --speed 10         # 10x recorded pacing
+
+Events are rebuilt as lightweight stand-ins for discord.py objects and fed
+to GovTrackerBot's event handlers, so they take the same path as live
+traffic (config cache, curator index, pending requests, ingest queue).
+The report covers events/sec, per-handler latency and database commits
+per event.
+"""
+import os
+
+if __name__ == '__main__':
+    # The web app must not start its own embedded bot or scheduler in this process
+    os.environ['BOT_MODE'] = 'external'
+    os.environ['APP_COMPONENTS'] = ''
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import threading
+import time
+import discord
+from utils.curator_index import curator_index
+
+# User id the replayed bot pretends to have
+REPLAY_BOT_USER_ID = 1
+
+
+class EventRecorder:
+    """Appends handled gateway events to a gzip JSONL file.
+
+    Each line is one event with ``t``, its offset in seconds from the start
+    of the recording session. Appending starts a new gzip member, so one file
+    can hold several bot runs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+        self._started = time.monotonic()
+        logging.info(f"Recording gateway events to {path}")
+
+    @staticmethod
+    def _is_curator(user_id):
+        # Marks who to create with --seed; never falls back to the database on the event loop
+        return curator_index.loaded and curator_index.lookup(user_id) is not None
+
+    def _write(self, event):
+        event['t'] = round(time.monotonic() - self._started, 4)
+        try:
+            self._file.write(json.dumps(event, ensure_ascii=False) + '\n')
+            self.count += 1
+        except Exception as e:
+            logging.error(f"Error recording event: {e}")
+
+    def message(self, message):
+        self._write({
+            'type': 'message',
+            'id': message.id,
+            'guild_id': message.guild.id,
+            'guild_name': message.guild.name,
+            'channel_id': message.channel.id,
+            'author_id': message.author.id,
+            'author_name': message.author.display_name,
+            'curator': self._is_curator(message.author.id),
+            'content': message.content,
+            'reference_id': message.reference.message_id if message.reference else None
+        })
+
+    def reaction(self, payload, action):
+        self._write({
+            'type': f'reaction_{action}',
+            'guild_id': payload.guild_id,
+            'channel_id': payload.channel_id,
+            'message_id': payload.message_id,
+            'user_id': payload.user_id,
+            'user_name': payload.member.display_name if payload.member else None,
+            'curator': self._is_curator(payload.user_id),
+            'emoji': str(payload.emoji)
+        })
+
+    def edit(self, payload):
+        self._write({
+            'type': 'edit',
+            'guild_id': payload.guild_id,
+            'channel_id': payload.channel_id,
+            'message_id': payload.message_id
+        })
+
+    def delete(self, payload):
+        self._write({
+            'type': 'delete',
+            'guild_id': payload.guild_id,
+            'channel_id': payload.channel_id,
+            'message_id': payload.message_id
+        })
+
+    def close(self):
+        try:
+            self._file.close()
+        except Exception as e:
+            logging.error(f"Error closing event capture: {e}")
+
+
+def read_events(path):
+    """Yield recorded events with ``t`` made monotonic across recording sessions"""
+    offset = 0.0
+    last = 0.0
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event['t'] + offset < last:
+                # A new session started at t=0: continue right after the previous one
+                offset = last
+            event['t'] += offset
+            last = event['t']
+            yield event
+
+
+class FakeGuild:
+    __slots__ = ('id', 'name')
+
+    def __init__(self, guild_id, name=None):
+        self.id = guild_id
+        self.name = name or f'guild {guild_id}'
+
+    def get_role(self, role_id):
+        return None
+
+
+class FakeChannel:
+    __slots__ = ('id', 'guild')
+
+    def __init__(self, channel_id, guild):
+        self.id = channel_id
+        self.guild = guild
+
+
+class FakeUser:
+    __slots__ = ('id', 'display_name', 'bot')
+
+    def __init__(self, user_id, display_name=None, bot=False):
+        self.id = user_id
+        self.display_name = display_name or str(user_id)
+        self.bot = bot
+
+    @property
+    def name(self):
+        return self.display_name
+
+
+class FakeReference:
+    __slots__ = ('message_id',)
+
+    def __init__(self, message_id):
+        self.message_id = message_id
+
+
+class FakeMessage:
+    """The subset of discord.Message the bot's message handlers read"""
+    __slots__ = ('id', 'guild', 'channel', 'author', 'content', 'reference', '_state')
+
+    def __init__(self, message_id, guild, channel, author, content, reference=None, state=None):
+        self.id = message_id
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+        self.content = content
+        self.reference = reference
+        self._state = state
+
+    @property
+    def created_at(self):
+        return discord.utils.snowflake_time(self.id)
+
+    @property
+    def jump_url(self):
+        return f'https://discord.com/channels/{self.guild.id}/{self.channel.id}/{self.id}'
+
+
+class FakePayload:
+    """Raw event payload (reaction, edit, delete): plain attributes"""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class Replayer:
+    """Feeds recorded events to a GovTrackerBot that is not connected to Discord"""
+
+    def __init__(self, bot, speed=None):
+        self.bot = bot
+        self.speed = speed  # None replays as fast as possible
+        self.latencies = []
+        self.counts = {}
+        self.commits = 0
+        self._commit_lock = threading.Lock()
+        self._guilds = {}
+        self._channels = {}
+
+    def _count_commit(self, connection):
+        with self._commit_lock:
+            self.commits += 1
+
+    def guild(self, guild_id, name=None):
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            guild = self._guilds[guild_id] = FakeGuild(guild_id, name)
+        return guild
+
+    def channel(self, channel_id, guild):
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self._channels[channel_id] = FakeChannel(channel_id, guild)
+        return channel
+
+    def build(self, event):
+        """Return (handler, argument) for a recorded event"""
+        bot = self.bot
+        kind = event['type']
+        if kind == 'message':
+            guild = self.guild(event['guild_id'], event.get('guild_name'))
+            message = FakeMessage(
+                event['id'], guild, self.channel(event['channel_id'], guild),
+                FakeUser(event['author_id'], event.get('author_name')),
+                event['content'],
+                FakeReference(event['reference_id']) if event.get('reference_id') else None,
+                bot._connection
+            )
+            return bot.on_message, message
+        if kind in ('reaction_add', 'reaction_remove'):
+            member = FakeUser(event['user_id'], event['user_name']) if event.get('user_name') else None
+            payload = FakePayload(
+                guild_id=event['guild_id'], channel_id=event['channel_id'], message_id=event['message_id'],
+                user_id=event['user_id'], emoji=event['emoji'], member=member
+            )
+            return (bot.on_raw_reaction_add if kind == 'reaction_add' else bot.on_raw_reaction_remove), payload
+        payload = FakePayload(guild_id=event['guild_id'], channel_id=event['channel_id'], message_id=event['message_id'])
+        if kind == 'edit':
+            return bot.on_raw_message_edit, payload
+        return bot.on_raw_message_delete, payload
+
+    async def start(self):
+        """Bring up the parts of the bot that handle events (no gateway connection)"""
+        from sqlalchemy import event as sa_event
+        from app import app
+        from database import db
+
+        with app.app_context():
+            sa_event.listen(db.engine, 'commit', self._count_commit)
+        self.bot._connection.user = FakeUser(REPLAY_BOT_USER_ID, 'replay', bot=True)
+        await self.bot.load_tracked_servers()
+        await self.bot.load_curator_index()
+        if self.bot.ratings is not None:
+            await self.bot.ingest.load_ratings()
+        self.bot.ingest.start()
+        await self.bot.monitor.start_monitoring()
+        if self.bot.watchdog is not None:
+            self.bot.watchdog.start()
+
+    async def run(self, events):
+        await self.start()
+        started = time.perf_counter()
+        for event in events:
+            if self.speed:
+                delay = started + event['t'] / self.speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            handler, argument = self.build(event)
+            handled = time.perf_counter()
+            await handler(argument)
+            self.latencies.append(time.perf_counter() - handled)
+            self.counts[event['type']] = self.counts.get(event['type'], 0) + 1
+        replayed = time.perf_counter()
+
+        # Flush everything still queued so commits and rows are complete
+        ingest_metrics = self.bot.ingest.get_metrics
+        await self.bot.stop_tracking()
+        self.bot.db.shutdown()
+        finished = time.perf_counter()
+        if self.bot.watchdog is not None:
+            self.bot.watchdog.stop()
+        return self.report(replayed - started, finished - started, ingest_metrics())
+
+    def report(self, replay_seconds, total_seconds, ingest_metrics):
+        events = len(self.latencies)
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 3)
+
+        return {
+            'events': events,
+            'by_type': self.counts,
+            'speed': self.speed or 'max',
+            'replay_seconds': round(replay_seconds, 3),
+            'total_seconds': round(total_seconds, 3),  # including the final ingest flush
+            'events_per_sec': round(events / total_seconds) if total_seconds else None,
+            'handler_p50_ms': percentile(0.50),
+            'handler_p99_ms': percentile(0.99),
+            'db_commits': self.commits,
+            'commits_per_event': round(self.commits / events, 4) if events else None,
+            'ingest': ingest_metrics,
+            'loop': self.bot.watchdog.get_metrics() if self.bot.watchdog is not None else None
+        }
+
+
+def seed_database(events):
+    """Create tracked servers and curators referenced by a capture if they are missing"""
+    from database import db
+    from models.curator import Curator
+    from models.discord_server import DiscordServer
+
+    guilds = {}
+    curators = {}
+    for event in events:
+        guilds.setdefault(str(event['guild_id']), event.get('guild_name'))
+        if event.get('curator'):
+            user_id = event.get('author_id') or event.get('user_id')
+            curators.setdefault(str(user_id), event.get('author_name') or event.get('user_name'))
+
+    existing_servers = {row[0] for row in db.session.query(DiscordServer.server_id).filter(DiscordServer.server_id.in_(guilds)).all()}
+    existing_curators = {row[0] for row in db.session.query(Curator.discord_id).filter(Curator.discord_id.in_(curators)).all()}
+    for server_id, name in guilds.items():
+        if server_id not in existing_servers:
+            db.session.add(DiscordServer(server_id=server_id, name=name or f'guild {server_id}', is_active=True))
+    for discord_id, name in curators.items():
+        if discord_id not in existing_curators:
+            db.session.add(Curator(discord_id=discord_id, name=name or discord_id))
+    db.session.commit()
+    return len(guilds) - len(existing_servers), len(curators) - len(existing_curators)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay captured gateway events through the bot handlers')
+    parser.add_argument('path', help='gzip JSONL capture (EVENT_CAPTURE_PATH)')
+    parser.add_argument('--speed', default='max',
+                        help="'max' (no pacing) or a multiplier of the recorded pacing, e.g. 1 or 10")
+    parser.add_argument('--seed', action='store_true',
+                        help='create missing tables, servers and curators from the capture first (for an empty local database)')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    from app import app
+    from discord_bot.bot import GovTrackerBot
+    logging.getLogger().setLevel(logging.WARNING)
+
+    events = list(read_events(args.path))
+    if args.seed:
+        from app import upgrade_database
+        upgrade_database(app)
+        with app.app_context():
+            servers, curators = seed_database(events)
+        print(f"Seeded {servers} servers and {curators} curators")
+
+    speed = None if args.speed == 'max' else float(args.speed)
+
+    async def replay():
+        replayer = Replayer(GovTrackerBot(), speed)
+        return await replayer.run(events)
+
+    report = asyncio.run(replay())
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+        return
+
+    print(f"Replayed {report['events']} events at speed {report['speed']} "
+          f"in {report['total_seconds']}s ({report['replay_seconds']}s + final flush)")
+    print(f"  by type:          {report['by_type']}")
+    print(f"  events/sec:       {report['events_per_sec']}")
+    print(f"  handler latency:  p50 {report['handler_p50_ms']} ms, p99 {report['handler_p99_ms']} ms")
+    print(f"  database commits: {report['db_commits']} ({report['commits_per_event']} per event)")
+    print(f"  ingest:           {report['ingest']}")
+    if report['loop']:
+        loop = report['loop']
+        print(f"  loop lag:         p50 <={loop['lag']['p50_ms']} ms, p99 <={loop['lag']['p99_ms']} ms, "
+              f"max {loop['lag']['max_ms']} ms, stalls {loop['stalls']} {loop['stalls_by_handler']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# GovTracker2 Python Migration by Replit Agent
+import logging
+import multiprocessing
+import os
+import time
+
+# Seconds to wait before restarting a worker that exited
+RESTART_DELAY = 10
+
+
+def partition_shards(shard_count, workers):
+    """Split shard ids 0..shard_count-1 into contiguous groups, one per worker"""
+    workers = max(1, min(workers, shard_count))
+    size, extra = divmod(shard_count, workers)
+    groups = []
+    start = 0
+    for index in range(workers):
+        end = start + size + (1 if index < extra else 0)
+        groups.append(list(range(start, end)))
+        start = end
+    return groups
+
+
+def run_worker(shard_ids, shard_count, profile=None):
+    """Process entry point: run the bot for the given shards"""
+    from discord_bot.bot import start_discord_bot
+
+    logging.info(f"Bot worker {os.getpid()} starting shards {shard_ids} of {shard_count}")
+    start_discord_bot(shard_ids=shard_ids, shard_count=shard_count, profile=profile)
+
+
+def supervise(groups, shard_count, profile=None):
+    """Start one process per shard group and restart any that exit"""
+    context = multiprocessing.get_context('spawn')
+    processes = {}
+
+    def launch(index):
+        process = context.Process(
+            target=run_worker,
+            args=(groups[index], shard_count, profile),
+            name=f"govtracker-bot-{index}"
+        )
+        process.start()
+        processes[index] = process
+
+    for index in range(len(groups)):
+        launch(index)
+
+    try:
+        while True:
+            time.sleep(RESTART_DELAY)
+            for index, process in list(processes.items()):
+                if not process.is_alive():
+                    logging.warning(f"Bot worker for shards {groups[index]} exited with {process.exitcode}, restarting")
+                    launch(index)
+    except KeyboardInterrupt:
+        logging.info("Stopping bot workers")
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join(timeout=30)
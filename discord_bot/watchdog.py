@@ -0,0 +1,186 @@
+# GovTracker2 Python Migration by Replit Agent
+import asyncio
+import bisect
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from config import Config
+
+# Upper bounds (ms) of the loop lag histogram buckets; the last bucket is open-ended
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Coroutines a stall is attributed to when they are on the loop thread's stack
+HANDLERS = {
+    'process_message': 'process_message',
+    'process_reaction': 'process_reaction',
+    'process_message_edit': 'process_message_edit',
+    'process_message_delete': 'process_message_delete',
+    'handle_help_request': 'handle_help_request',
+    'record_response': 'record_response',
+    '_drain': 'send_reminders',
+    '_send': 'send_reminders',
+    '_fire': 'schedule_reminders',
+    '_process_page': 'backfill',
+    'save_shard_status': 'report_shard_health',
+}
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LagHistogram:
+    """Counts of loop lag samples per bucket"""
+
+    def __init__(self, buckets=LAG_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, lag_ms):
+        self.counts[bisect.bisect_left(self.buckets, lag_ms)] += 1
+        self.count += 1
+        self.sum_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (None if open-ended or empty)"""
+        if not self.count:
+            return None
+        rank = p * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else None
+        return None
+
+    def to_dict(self):
+        labels = [f'<={bound}ms' for bound in self.buckets] + [f'>{self.buckets[-1]}ms']
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'samples': self.count,
+            'avg_ms': round(self.sum_ms / self.count, 2) if self.count else None,
+            'max_ms': round(self.max_ms, 1),
+            'p50_ms': self.percentile(0.50),
+            'p99_ms': self.percentile(0.99)
+        }
+
+
+def attribute(frame):
+    """Describe what the loop thread is running: handler, blocking location and project stack"""
+    stack = []
+    innermost = None
+    while frame is not None:
+        code = frame.f_code
+        path = os.path.abspath(code.co_filename)
+        if code.co_name == '_run' and os.path.basename(os.path.dirname(path)) == 'asyncio':
+            break  # the loop's callback runner: everything above is event loop machinery
+        if innermost is None:
+            innermost = f"{os.path.basename(path)}:{frame.f_lineno} in {code.co_name}"
+        if path.startswith(PROJECT_ROOT) and 'site-packages' not in path:
+            stack.append((code, f"{os.path.relpath(path, PROJECT_ROOT)}:{frame.f_lineno} in {code.co_name}"))
+        frame = frame.f_back
+
+    # Innermost known handler; commands and other tasks fall back to the innermost project coroutine
+    handler = next((HANDLERS[code.co_name] for code, _ in stack if code.co_name in HANDLERS), None)
+    if handler is None:
+        handler = next((code.co_name for code, _ in stack if code.co_flags & inspect.CO_COROUTINE), None)
+    return {
+        'handler': handler or 'unknown',
+        'location': stack[0][1] if stack else innermost,
+        'blocking_call': innermost,
+        'stack': [where for _, where in stack[:8]]
+    }
+
+
+class LoopWatchdog:
+    """Measures event loop lag and attributes stalls to the code that caused them.
+
+    A tick task sleeps for a fixed interval and records how late it wakes up
+    in a histogram. A separate thread notices when a tick is overdue and
+    samples the loop thread's stack while the stall is still happening, so
+    each stall is recorded with the handler and line that was blocking.
+    """
+
+    def __init__(self, interval_ms=None, threshold_ms=None, history=50):
+        self.interval = (interval_ms or Config.LOOP_LAG_INTERVAL_MS) / 1000
+        self.threshold_ms = threshold_ms or Config.LOOP_STALL_THRESHOLD_MS
+        self.histogram = LagHistogram()
+        self.stalls = deque(maxlen=history)
+        self.stall_count = 0
+        self.stalls_by_handler = {}
+        self._loop_thread_id = None
+        self._tick_started = None
+        self._sample = None  # (tick start, attribution) taken by the watcher thread
+        self._task = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Start measuring the running loop"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._tick_started = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._thread = threading.Thread(target=self._watch, name='govtracker-loop-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _tick(self):
+        while True:
+            started = time.monotonic()
+            self._tick_started = started
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.monotonic() - started - self.interval) * 1000)
+            self.histogram.add(lag_ms)
+            if lag_ms >= self.threshold_ms:
+                self._record_stall(started, lag_ms)
+
+    def _watch(self):
+        # Check often enough to catch a stall while it is still blocking the loop
+        check = max(0.005, min(self.interval, self.threshold_ms / 1000) / 4)
+        while not self._stopping.wait(check):
+            started = self._tick_started
+            overdue_ms = (time.monotonic() - started - self.interval) * 1000
+            if overdue_ms >= self.threshold_ms / 2 and (self._sample is None or self._sample[0] != started):
+                frame = sys._current_frames().get(self._loop_thread_id)
+                self._sample = (started, attribute(frame))
+
+    def _record_stall(self, started, lag_ms):
+        sample = self._sample
+        if sample is not None and sample[0] == started:
+            attribution = sample[1]
+        else:
+            attribution = {'handler': 'unknown', 'location': None, 'blocking_call': None, 'stack': []}
+
+        self.stall_count += 1
+        handler = attribution['handler']
+        self.stalls_by_handler[handler] = self.stalls_by_handler.get(handler, 0) + 1
+        self.stalls.append({'at': datetime.utcnow().isoformat(), 'lag_ms': round(lag_ms, 1), **attribution})
+        logging.warning(
+            f"Event loop stalled for {lag_ms:.0f}ms in {handler} "
+            f"at {attribution['location']} (blocking in {attribution['blocking_call']})"
+        )
+
+    def get_metrics(self):
+        return {
+            'interval_ms': int(self.interval * 1000),
+            'threshold_ms': self.threshold_ms,
+            'lag': self.histogram.to_dict(),
+            'stalls': self.stall_count,
+            'stalls_by_handler': dict(self.stalls_by_handler),
+            'recent_stalls': list(self.stalls)
+        }
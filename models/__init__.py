@@ -5,6 +5,12 @@ from .discord_server import DiscordServer
 from .response_tracking import ResponseTracking
 from .task_report import TaskReport
 from .user import User
+from .pending_help_request import PendingHelpRequest
+from .bot_shard_status import BotShardStatus
+from .channel_watermark import ChannelWatermark
+from .bot_command import BotCommand
+from .leader_status import LeaderStatus
+from .curator_server_daily import CuratorServerDaily
 
 __all__ = [
     'Curator',
@@ -12,5 +18,11 @@ __all__ = [
     'DiscordServer',
     'ResponseTracking',
     'TaskReport',
-    'User'
+    'User',
+    'PendingHelpRequest',
+    'BotShardStatus',
+    'ChannelWatermark',
+    'BotCommand',
+    'LeaderStatus',
+    'CuratorServerDaily'
 ]
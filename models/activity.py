@@ -1,10 +1,15 @@
 # GovTracker2 Python Migration by Replit Agent
 from database import db
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
 from datetime import datetime
 
 class Activity(db.Model):
     __tablename__ = 'activities'
+    __table_args__ = (
+        # One activity per (message, type, curator): replayed or backfilled events are ignored on insert.
+        # message_id leads so lookups by message id use the same index; NULL ids (manual entries) never conflict.
+        UniqueConstraint('message_id', 'type', 'curator_id', name='uq_activities_message_type_curator'),
+    )
     
     # MySQL compatible AUTO_INCREMENT primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -46,34 +51,79 @@ class Activity(db.Model):
             'server_name': self.discord_server.name if self.discord_server else None
         }
     
+    @classmethod
+    def feed_query(cls):
+        """Activity feed rows: the to_dict() columns plus curator and server names in one joined query"""
+        from models.curator import Curator
+        from models.discord_server import DiscordServer
+        
+        return db.session.query(
+            cls.id, cls.curator_id, cls.server_id, cls.type, cls.content, cls.points,
+            cls.timestamp, cls.message_id, cls.channel_id,
+            Curator.name.label('curator_name'),
+            DiscordServer.name.label('server_name')
+        ).outerjoin(
+            Curator, Curator.id == cls.curator_id
+        ).outerjoin(
+            DiscordServer, DiscordServer.id == cls.server_id
+        )
+    
+    @staticmethod
+    def feed_row_to_dict(row):
+        """Same dictionary as to_dict(), built from a feed_query() row"""
+        return {
+            'id': row.id,
+            'curator_id': row.curator_id,
+            'server_id': row.server_id,
+            'type': row.type,
+            'content': row.content,
+            'points': row.points,
+            'timestamp': row.timestamp.isoformat() if row.timestamp else None,
+            'message_id': row.message_id,
+            'channel_id': row.channel_id,
+            'curator_name': row.curator_name,
+            'server_name': row.server_name
+        }
+    
+    @classmethod
+    def get_feed(cls, limit=100, server_id=None, curator_id=None, activity_type=None):
+        """Newest activities as dictionaries (optionally filtered), without per-row lazy loads"""
+        query = cls.feed_query()
+        
+        if server_id:
+            query = query.filter(cls.server_id == server_id)
+        
+        if curator_id:
+            query = query.filter(cls.curator_id == curator_id)
+        
+        if activity_type:
+            query = query.filter(cls.type == activity_type)
+        
+        rows = query.order_by(cls.timestamp.desc()).limit(limit).all()
+        return [cls.feed_row_to_dict(row) for row in rows]
+    
     @classmethod
     def get_recent_activities(cls, limit=50):
         """Get recent activities"""
         return cls.query.order_by(cls.timestamp.desc()).limit(limit).all()
     
     @classmethod
-    def get_daily_stats(cls, days=30):
-        """Get daily activity statistics"""
-        from sqlalchemy import func
-        from datetime import datetime, timedelta
-        
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+    def get_daily_stats(cls, days=30, server_id=None, curator_id=None):
+        """Get daily activity statistics (from the curator_server_daily rollup)"""
+        from models.curator_server_daily import CuratorServerDaily
         
-        # Group activities by date
-        daily_stats = db.session.query(
-            func.date(cls.timestamp).label('date'),
-            func.count(cls.id).label('count'),
-            cls.type
-        ).filter(
-            cls.timestamp >= cutoff_date
-        ).group_by(
-            func.date(cls.timestamp),
-            cls.type
-        ).all()
+        # Group rollup rows by date
+        daily_stats = CuratorServerDaily.summarize(
+            CuratorServerDaily.day.label('date'),
+            CuratorServerDaily.type,
+            days=days,
+            server_id=server_id,
+            curator_id=curator_id
+        )
         
         # Format results for frontend consumption
         result = {}
-        for stat in daily_stats:
+        for stat in sorted(daily_stats, key=lambda stat: stat.date):
             date_str = str(stat.date)
             if date_str not in result:
                 result[date_str] = {
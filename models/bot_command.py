@@ -0,0 +1,64 @@
+# GovTracker2 Python Migration by Replit Agent
+from database import db
+from sqlalchemy import Column, Integer, DateTime, String, Text
+from datetime import datetime, timedelta
+import json
+
+class BotCommand(db.Model):
+    """Command from the web app to the bot processes (cache invalidation, notifications).
+
+    Every bot process runs every command: shard workers each hold their own
+    caches and their own guilds.
+    """
+    __tablename__ = 'bot_commands'
+
+    # Increasing id doubles as each bot process's read cursor
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    command = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=True)  # JSON arguments
+
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<BotCommand {self.id} {self.command}>'
+
+    def get_payload(self):
+        return json.loads(self.payload) if self.payload else {}
+
+    def to_dict(self):
+        """Convert command to dictionary for JSON responses"""
+        return {
+            'id': self.id,
+            'command': self.command,
+            'payload': self.get_payload(),
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    @classmethod
+    def publish(cls, command, payload=None):
+        """Queue a command for the bot and commit it"""
+        row = cls(
+            command=command,
+            payload=json.dumps(payload, default=str) if payload is not None else None
+        )
+        db.session.add(row)
+        db.session.commit()
+        return row.id
+
+    @classmethod
+    def latest_id(cls):
+        return db.session.query(db.func.max(cls.id)).scalar() or 0
+
+    @classmethod
+    def fetch_after(cls, last_id, limit=1000):
+        """Commands newer than a process's cursor, as plain dicts"""
+        rows = cls.query.filter(cls.id > last_id).order_by(cls.id).limit(limit).all()
+        return [row.to_dict() for row in rows]
+
+    @classmethod
+    def prune(cls, max_age_hours=24):
+        """Delete commands old enough that every running process has read them"""
+        cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+        deleted = cls.query.filter(cls.created_at < cutoff).delete()
+        db.session.commit()
+        return deleted
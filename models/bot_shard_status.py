@@ -0,0 +1,88 @@
+# GovTracker2 Python Migration by Replit Agent
+from database import db
+from sqlalchemy import Column, Integer, DateTime, String
+from datetime import datetime, timedelta
+
+class BotShardStatus(db.Model):
+    """Last reported health of one Discord gateway shard"""
+    __tablename__ = 'bot_shard_status'
+
+    # Discord shard id (one row per shard)
+    shard_id = Column(Integer, primary_key=True, autoincrement=False)
+    shard_count = Column(Integer, nullable=False)
+
+    # Process that owns the shard (hostname:pid)
+    process = Column(String(255), nullable=True)
+
+    # connecting, ready, disconnected, stopped
+    status = Column(String(50), nullable=False, default='connecting')
+    guild_count = Column(Integer, default=0)
+    latency_ms = Column(Integer, nullable=True)
+
+    # Timestamps using DATETIME for MySQL compatibility
+    started_at = Column(DateTime, default=datetime.utcnow)
+    last_heartbeat = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<BotShardStatus {self.shard_id}/{self.shard_count} {self.status}>'
+
+    def is_stale(self, heartbeat_seconds):
+        """True if the owning process missed several heartbeats"""
+        if not self.last_heartbeat:
+            return True
+        return datetime.utcnow() - self.last_heartbeat > timedelta(seconds=heartbeat_seconds * 3)
+
+    def to_dict(self, heartbeat_seconds=None):
+        """Convert shard status to dictionary for JSON responses"""
+        from config import Config
+
+        return {
+            'shard_id': self.shard_id,
+            'shard_count': self.shard_count,
+            'process': self.process,
+            'status': self.status,
+            'guild_count': self.guild_count,
+            'latency_ms': self.latency_ms,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'last_heartbeat': self.last_heartbeat.isoformat() if self.last_heartbeat else None,
+            'stale': self.is_stale(heartbeat_seconds or Config.BOT_SHARD_HEARTBEAT_SECONDS)
+        }
+
+    @classmethod
+    def report(cls, shards, process, started_at=None):
+        """Upsert status rows for the shards owned by one process.
+
+        ``shards`` is a list of dicts with shard_id, shard_count, status,
+        guild_count and latency_ms.
+        """
+        now = datetime.utcnow()
+        existing = {
+            row.shard_id: row
+            for row in cls.query.filter(cls.shard_id.in_([s['shard_id'] for s in shards])).all()
+        }
+
+        for shard in shards:
+            row = existing.get(shard['shard_id'])
+            if row is None:
+                row = cls(shard_id=shard['shard_id'], started_at=started_at or now)
+                db.session.add(row)
+            elif row.process != process:
+                # Shard moved to another process (restart or rebalance)
+                row.started_at = started_at or now
+            row.shard_count = shard['shard_count']
+            row.process = process
+            row.status = shard['status']
+            row.guild_count = shard['guild_count']
+            row.latency_ms = shard['latency_ms']
+            row.last_heartbeat = now
+
+        # Drop rows for shards beyond the current shard count (after resharding)
+        shard_count = shards[0]['shard_count'] if shards else None
+        if shard_count:
+            cls.query.filter(cls.shard_id >= shard_count).delete(synchronize_session=False)
+
+        db.session.commit()
+
+    @classmethod
+    def get_all(cls):
+        return cls.query.order_by(cls.shard_id).all()
@@ -0,0 +1,87 @@
+# GovTracker2 Python Migration by Replit Agent
+from database import db
+from sqlalchemy import Column, Integer, DateTime, String, update, insert, bindparam
+from datetime import datetime
+
+class ChannelWatermark(db.Model):
+    """Newest message the bot has processed in a channel (backfill resume point)"""
+    __tablename__ = 'channel_watermarks'
+
+    channel_id = Column(String(255), primary_key=True)
+    guild_id = Column(String(255), nullable=False, index=True)
+
+    # Snowflake of the newest processed message and its creation time
+    last_message_id = Column(String(255), nullable=False)
+    last_message_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ChannelWatermark {self.channel_id} @ {self.last_message_id}>'
+
+    def to_dict(self):
+        """Convert watermark to dictionary for JSON responses"""
+        return {
+            'channel_id': self.channel_id,
+            'guild_id': self.guild_id,
+            'last_message_id': self.last_message_id,
+            'last_message_at': self.last_message_at.isoformat() if self.last_message_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    @classmethod
+    def get_for_guilds(cls, guild_ids):
+        """Get {channel_id: last_message_id} for the given guilds"""
+        rows = db.session.query(cls.channel_id, cls.last_message_id).filter(
+            cls.guild_id.in_([str(guild_id) for guild_id in guild_ids])
+        ).all()
+        return {channel_id: int(last_message_id) for channel_id, last_message_id in rows}
+
+    @classmethod
+    def advance(cls, marks):
+        """Move watermarks forward; ``marks`` is a list of dicts with
+        channel_id, guild_id, last_message_id (int) and last_message_at.
+
+        Never moves a watermark backwards, so live tracking and backfill can
+        both report the channels they processed.
+        """
+        if not marks:
+            return
+        table = cls.__table__
+        now = datetime.utcnow()
+        existing = cls.get_channels([mark['channel_id'] for mark in marks])
+
+        new_rows = []
+        updates = []
+        for mark in marks:
+            current = existing.get(mark['channel_id'])
+            if current is None:
+                new_rows.append({
+                    'channel_id': mark['channel_id'],
+                    'guild_id': mark['guild_id'],
+                    'last_message_id': str(mark['last_message_id']),
+                    'last_message_at': mark['last_message_at'],
+                    'updated_at': now
+                })
+            elif mark['last_message_id'] > current:
+                updates.append({
+                    'b_channel_id': mark['channel_id'],
+                    'b_message_id': str(mark['last_message_id']),
+                    'b_message_at': mark['last_message_at']
+                })
+
+        if new_rows:
+            db.session.execute(insert(table), new_rows)
+        if updates:
+            db.session.execute(
+                update(table)
+                .where(table.c.channel_id == bindparam('b_channel_id'))
+                .values(last_message_id=bindparam('b_message_id'), last_message_at=bindparam('b_message_at'), updated_at=now),
+                updates
+            )
+        db.session.commit()
+
+    @classmethod
+    def get_channels(cls, channel_ids):
+        rows = db.session.query(cls.channel_id, cls.last_message_id).filter(cls.channel_id.in_(channel_ids)).all()
+        return {channel_id: int(last_message_id) for channel_id, last_message_id in rows}
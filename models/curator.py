@@ -32,8 +32,12 @@ class Curator(db.Model):
     def __repr__(self):
         return f'<Curator {self.name} ({self.discord_id})>'
     
-    def to_dict(self, include_stats=True):
-        """Convert curator to dictionary for JSON responses"""
+    def to_dict(self, include_stats=True, stats=None):
+        """Convert curator to dictionary for JSON responses
+
+        ``stats`` is this curator's entry from load_batch_stats(); without it
+        the stats are queried for this curator alone.
+        """
         data = {
             'id': self.id,
             'discord_id': self.discord_id,
@@ -48,20 +52,16 @@ class Curator(db.Model):
         }
         
         if include_stats:
-            # Get activity statistics
-            stats = self.get_activity_stats(days=30)
+            if stats is None:
+                stats = self.load_batch_stats([self], days=30)[self.id]
             data.update({
                 'total_activities': stats['total_activities'],
                 'messages': stats['messages'],
                 'reactions': stats['reactions'],
                 'replies': stats['replies'],
-                'task_verifications': stats['task_verifications']
+                'task_verifications': stats['task_verifications'],
+                'average_response_time': stats['average_response_time']
             })
-            
-            # Get average response time
-            from models.response_tracking import ResponseTracking
-            avg_response = ResponseTracking.get_curator_avg_response_time(self.id)
-            data['average_response_time'] = avg_response or 0
         else:
             # Default values when stats not included
             data.update({
@@ -77,23 +77,71 @@ class Curator(db.Model):
     
     def get_activity_stats(self, days=30):
         """Get activity statistics for the curator"""
+        return self._activity_type_counts([self.id], days)[self.id]
+    
+    # Curator ids per IN (...) list in the batch stats queries
+    STATS_BATCH_SIZE = 500
+    
+    @classmethod
+    def _activity_type_counts(cls, curator_ids, days=30):
+        """Activity counts by type for the last ``days`` days, one grouped query per batch of ids"""
         from models.activity import Activity
         from datetime import datetime, timedelta
         
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        activities = Activity.query.filter(
-            Activity.curator_id == self.id,
-            Activity.timestamp >= cutoff_date
-        ).all()
+        type_keys = {
+            'message': 'messages',
+            'reaction': 'reactions',
+            'reply': 'replies',
+            'task_verification': 'task_verifications'
+        }
         
         stats = {
-            'total_activities': len(activities),
-            'messages': len([a for a in activities if a.type == 'message']),
-            'reactions': len([a for a in activities if a.type == 'reaction']),
-            'replies': len([a for a in activities if a.type == 'reply']),
-            'task_verifications': len([a for a in activities if a.type == 'task_verification'])
+            curator_id: {'total_activities': 0, 'messages': 0, 'reactions': 0, 'replies': 0, 'task_verifications': 0}
+            for curator_id in curator_ids
         }
+        ids = list(stats)
+        for start in range(0, len(ids), cls.STATS_BATCH_SIZE):
+            rows = db.session.query(
+                Activity.curator_id, Activity.type, func.count(Activity.id)
+            ).filter(
+                Activity.curator_id.in_(ids[start:start + cls.STATS_BATCH_SIZE]),
+                Activity.timestamp >= cutoff_date
+            ).group_by(Activity.curator_id, Activity.type).all()
+            
+            for curator_id, activity_type, count in rows:
+                stats[curator_id]['total_activities'] += count
+                if activity_type in type_keys:
+                    stats[curator_id][type_keys[activity_type]] += count
+        
+        return stats
+    
+    @classmethod
+    def load_batch_stats(cls, curators, days=30):
+        """Stats used by to_dict() for many curators at once: {curator_id: stats}.
+        
+        Two grouped queries (activity counts by type, average response time)
+        per STATS_BATCH_SIZE curators instead of two queries per curator.
+        """
+        from models.response_tracking import ResponseTracking
+        from datetime import datetime, timedelta
+        
+        ids = [curator.id for curator in curators]
+        stats = cls._activity_type_counts(ids, days)
+        for curator_stats in stats.values():
+            curator_stats['average_response_time'] = 0
+        
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        for start in range(0, len(ids), cls.STATS_BATCH_SIZE):
+            rows = db.session.query(
+                ResponseTracking.curator_id, func.avg(ResponseTracking.response_time_seconds)
+            ).filter(
+                ResponseTracking.curator_id.in_(ids[start:start + cls.STATS_BATCH_SIZE]),
+                ResponseTracking.mention_timestamp >= cutoff_date
+            ).group_by(ResponseTracking.curator_id).all()
+            
+            for curator_id, average in rows:
+                stats[curator_id]['average_response_time'] = int(average) if average else 0
         
         return stats
     
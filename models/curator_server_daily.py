@@ -0,0 +1,153 @@
+# GovTracker2 Python Migration by Replit Agent
+from database import db
+from sqlalchemy import Column, Integer, Date, String, ForeignKey, Index, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite, mysql
+from datetime import datetime, timedelta, time
+
+class CuratorServerDaily(db.Model):
+    """Activity count and points per day, curator, server and activity type.
+
+    Rolled up from activities in the same transaction that writes them (the
+    ingest flush, manual activities, deletes and restores), so daily and
+    monthly statistics read one row per day and type instead of scanning
+    activities. rebuild() recomputes it from activities.
+    """
+    __tablename__ = 'curator_server_daily'
+    __table_args__ = (
+        Index('ix_curator_server_daily_curator_day', 'curator_id', 'day'),
+        Index('ix_curator_server_daily_server_day', 'server_id', 'day'),
+    )
+
+    # UTC day of the activity timestamps
+    day = Column(Date, primary_key=True)
+    curator_id = Column(Integer, ForeignKey('curators.id'), primary_key=True)
+    server_id = Column(Integer, ForeignKey('discord_servers.id'), primary_key=True)
+    type = Column(String(100), primary_key=True)
+
+    activity_count = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<CuratorServerDaily {self.day} curator {self.curator_id} server {self.server_id} {self.type}>'
+
+    def to_dict(self):
+        """Convert rollup row to dictionary for JSON responses"""
+        return {
+            'day': self.day.isoformat() if self.day else None,
+            'curator_id': self.curator_id,
+            'server_id': self.server_id,
+            'type': self.type,
+            'activity_count': self.activity_count,
+            'points': self.points
+        }
+
+    @staticmethod
+    def first_day(days):
+        """First day counted by a ``days``-day window ending now (whole UTC days)"""
+        return (datetime.utcnow() - timedelta(days=days)).date()
+
+    @classmethod
+    def record(cls, activities):
+        """Add activity rows (dicts with curator_id, server_id, type, points, timestamp) to the rollup.
+
+        One upsert for the whole batch; runs in the caller's transaction and
+        does not commit, so the rollup commits or rolls back with the rows.
+        """
+        totals = {}
+        for activity in activities:
+            timestamp = activity.get('timestamp') or datetime.utcnow()
+            key = (timestamp.date(), activity['curator_id'], activity['server_id'], activity['type'])
+            count, points = totals.get(key, (0, 0))
+            totals[key] = (count + 1, points + (activity.get('points') or 0))
+        if not totals:
+            return 0
+
+        rows = [
+            {'day': day, 'curator_id': curator_id, 'server_id': server_id, 'type': activity_type,
+             'activity_count': count, 'points': points}
+            for (day, curator_id, server_id, activity_type), (count, points) in totals.items()
+        ]
+        table = cls.__table__
+        dialect = db.session.get_bind().dialect.name
+
+        if dialect in ('postgresql', 'sqlite'):
+            dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            statement = dialect_insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.day, table.c.curator_id, table.c.server_id, table.c.type],
+                set_={
+                    'activity_count': table.c.activity_count + statement.excluded.activity_count,
+                    'points': table.c.points + statement.excluded.points
+                }
+            )
+            db.session.execute(statement, rows)
+        elif dialect in ('mysql', 'mariadb'):
+            statement = mysql.insert(table)
+            statement = statement.on_duplicate_key_update(
+                activity_count=table.c.activity_count + statement.inserted.activity_count,
+                points=table.c.points + statement.inserted.points
+            )
+            db.session.execute(statement, rows)
+        else:
+            for row in rows:
+                updated = db.session.execute(
+                    table.update()
+                    .where(table.c.day == row['day'], table.c.curator_id == row['curator_id'],
+                           table.c.server_id == row['server_id'], table.c.type == row['type'])
+                    .values(activity_count=table.c.activity_count + row['activity_count'],
+                            points=table.c.points + row['points'])
+                ).rowcount
+                if not updated:
+                    db.session.execute(insert(table), row)
+        return len(rows)
+
+    @classmethod
+    def rebuild(cls, since=None):
+        """Recompute the rollup from activities, for all days or from the day of ``since``.
+
+        Does not commit. Activities written while it runs may be counted
+        twice or missed, so run it while the bot is stopped or re-run it.
+        """
+        from models.activity import Activity
+
+        table = cls.__table__
+        delete = table.delete()
+        criteria = [Activity.timestamp.isnot(None)]
+        if since is not None:
+            first_day = since.date() if isinstance(since, datetime) else since
+            delete = delete.where(table.c.day >= first_day)
+            criteria.append(Activity.timestamp >= datetime.combine(first_day, time.min))
+
+        day = func.date(Activity.timestamp)
+        rollup = select(
+            day, Activity.curator_id, Activity.server_id, Activity.type,
+            func.count(Activity.id), func.coalesce(func.sum(Activity.points), 0)
+        ).where(*criteria).group_by(day, Activity.curator_id, Activity.server_id, Activity.type)
+
+        db.session.execute(delete)
+        return db.session.execute(
+            insert(table).from_select(['day', 'curator_id', 'server_id', 'type', 'activity_count', 'points'], rollup)
+        ).rowcount
+
+    @classmethod
+    def summarize(cls, *group_by, days=None, day=None, curator_id=None, server_id=None):
+        """Sum of activity_count (as ``count``) and points grouped by the given columns.
+
+        ``days`` keeps the last ``days`` whole days, ``day`` a single day.
+        """
+        query = db.session.query(
+            *group_by,
+            func.sum(cls.activity_count).label('count'),
+            func.sum(cls.points).label('points')
+        )
+        if days is not None:
+            query = query.filter(cls.day >= cls.first_day(days))
+        if day is not None:
+            query = query.filter(cls.day == day)
+        if curator_id is not None:
+            query = query.filter(cls.curator_id == curator_id)
+        if server_id is not None:
+            query = query.filter(cls.server_id == server_id)
+        if group_by:
+            query = query.group_by(*group_by)
+        return query.all()
@@ -1,7 +1,9 @@
 # GovTracker2 Python Migration by Replit Agent
 from database import db
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
 from datetime import datetime
+import threading
+import time
 
 class DiscordServer(db.Model):
     __tablename__ = 'discord_servers'
@@ -22,6 +24,9 @@ class DiscordServer(db.Model):
     reminder_interval_seconds = Column(Integer, default=300)  # Интервал напоминания в секундах (по умолчанию 5 минут)
     auto_reminder_enabled = Column(Boolean, default=True)  # Включено ли автонапоминание
     
+    # Help request detection
+    help_keywords = Column(Text, nullable=True)  # comma-separated keywords, empty = defaults
+    
     # Server status
     is_active = Column(Boolean, default=True, index=True)
     
@@ -35,8 +40,14 @@ class DiscordServer(db.Model):
     def __repr__(self):
         return f'<DiscordServer {self.name} ({self.server_id})>'
     
-    def to_dict(self):
-        """Convert server to dictionary for JSON responses"""
+    def to_dict(self, metrics=None):
+        """Convert server to dictionary for JSON responses
+
+        ``metrics`` is this server's entry from load_batch_metrics(); without
+        it only this server's metrics are queried (see get_metrics()).
+        """
+        if metrics is None:
+            metrics = self.get_metrics()
         return {
             'id': self.id,
             'server_id': self.server_id,
@@ -46,15 +57,128 @@ class DiscordServer(db.Model):
             'tasks_channel_id': self.tasks_channel_id,
             'reminder_interval_seconds': self.reminder_interval_seconds,
             'auto_reminder_enabled': self.auto_reminder_enabled,
+            'help_keywords': self.get_help_keywords(),
             'is_active': self.is_active,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'activity_count': self.get_activity_count(),
-            'curator_count': self.get_curator_count(),
-            'avg_response_time': self.get_average_response_time(),
-            'reactions_count': self.get_reactions_count()
+            'activity_count': metrics['activity_count'],
+            'curator_count': metrics['curator_count'],
+            'avg_response_time': metrics['avg_response_time'],
+            'reactions_count': metrics['reactions_count']
         }
 
+    EMPTY_METRICS = {'activity_count': 0, 'curator_count': 0, 'avg_response_time': 0, 'reactions_count': 0}
+
+    # Per-process cache of load_batch_metrics(): days -> (expires at, metrics)
+    _metrics_cache = {}
+    _metrics_lock = threading.Lock()
+
+    @classmethod
+    def load_batch_metrics(cls, days=30, max_age=None):
+        """List metrics for every server in one query: {server id: metrics}.
+
+        activity_count, reactions_count and avg_response_time cover the last
+        ``days`` days; curator_count is every curator who was ever active on
+        the server. Results are reused for ``max_age`` seconds
+        (SERVER_METRICS_CACHE_SECONDS by default, 0 disables the cache).
+        """
+        from config import Config
+
+        max_age = Config.SERVER_METRICS_CACHE_SECONDS if max_age is None else max_age
+        if max_age > 0:
+            with cls._metrics_lock:
+                cached = cls._metrics_cache.get(days)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+        metrics = cls._query_batch_metrics(days)
+        if max_age > 0:
+            with cls._metrics_lock:
+                cls._metrics_cache[days] = (time.monotonic() + max_age, metrics)
+        return metrics
+
+    def get_metrics(self, days=30):
+        """Metrics for this server alone, in the same shape as load_batch_metrics().
+
+        Used by single-server responses; lists should pass their entry from
+        load_batch_metrics() to to_dict() instead.
+        """
+        return self._query_batch_metrics(days, server_id=self.id).get(self.id, self.EMPTY_METRICS)
+
+    @classmethod
+    def _query_batch_metrics(cls, days, server_id=None):
+        from models.activity import Activity
+        from models.curator_server_daily import CuratorServerDaily
+        from models.response_tracking import ResponseTracking
+        from sqlalchemy import func, case, select
+        from datetime import timedelta
+
+        since = datetime.utcnow() - timedelta(days=days)
+
+        activities = select(
+            Activity.server_id,
+            func.count(Activity.id).label('activity_count'),
+            func.sum(case((Activity.type == 'reaction', 1), else_=0)).label('reactions_count')
+        ).where(Activity.timestamp >= since)
+
+        # Distinct curators ever active, from the daily rollup instead of all activities
+        curators = select(
+            CuratorServerDaily.server_id,
+            func.count(CuratorServerDaily.curator_id.distinct()).label('curator_count')
+        )
+
+        responses = select(
+            ResponseTracking.server_id,
+            func.avg(ResponseTracking.response_time_seconds).label('avg_response_time')
+        ).where(ResponseTracking.mention_timestamp >= since)
+
+        # A single server filters every aggregate down to its own rows
+        if server_id is not None:
+            activities = activities.where(Activity.server_id == server_id)
+            curators = curators.where(CuratorServerDaily.server_id == server_id)
+            responses = responses.where(ResponseTracking.server_id == server_id)
+
+        activities = activities.group_by(Activity.server_id).subquery()
+        curators = curators.group_by(CuratorServerDaily.server_id).subquery()
+        responses = responses.group_by(ResponseTracking.server_id).subquery()
+
+        servers = (
+            select(
+                cls.id, activities.c.activity_count, activities.c.reactions_count,
+                curators.c.curator_count, responses.c.avg_response_time
+            )
+            .outerjoin(activities, activities.c.server_id == cls.id)
+            .outerjoin(curators, curators.c.server_id == cls.id)
+            .outerjoin(responses, responses.c.server_id == cls.id)
+        )
+        if server_id is not None:
+            servers = servers.where(cls.id == server_id)
+
+        rows = db.session.execute(servers).all()
+
+        return {
+            row_id: {
+                'activity_count': activity_count or 0,
+                'curator_count': curator_count or 0,
+                'avg_response_time': int(avg_response_time) if avg_response_time else 0,
+                'reactions_count': int(reactions_count or 0)
+            }
+            for row_id, activity_count, reactions_count, curator_count, avg_response_time in rows
+        }
+
+    def get_help_keywords(self):
+        """Get help request keywords for this server (defaults if none configured)"""
+        from utils.help_matcher import parse_keywords
+        from config import Config
+        
+        return parse_keywords(self.help_keywords) or list(Config.HELP_KEYWORDS)
+    
+    def set_help_keywords(self, keywords):
+        """Store help request keywords from a list or comma-separated string"""
+        from utils.help_matcher import parse_keywords
+        
+        self.help_keywords = ','.join(parse_keywords(keywords)) or None
+
     def get_curator_count(self):
         """Get number of curators assigned to this server"""
         try:
@@ -80,10 +204,9 @@ class DiscordServer(db.Model):
             
             with db.session.no_autoflush:
                 since = datetime.utcnow() - timedelta(days=days)
-                result = db.session.query(func.avg(ResponseTracking.response_time)).filter(
+                result = db.session.query(func.avg(ResponseTracking.response_time_seconds)).filter(
                     ResponseTracking.server_id == self.id,
-                    ResponseTracking.created_at >= since,
-                    ResponseTracking.response_time.isnot(None)
+                    ResponseTracking.mention_timestamp >= since
                 ).scalar()
                 
                 return int(result) if result else 0
@@ -0,0 +1,67 @@
+# GovTracker2 Python Migration by Replit Agent
+from database import db
+from sqlalchemy import Column, DateTime, String
+from datetime import datetime, timedelta
+
+class LeaderStatus(db.Model):
+    """Process currently holding a leader lock, as reported by that process"""
+    __tablename__ = 'leader_status'
+
+    # Lock name (one row per election)
+    name = Column(String(100), primary_key=True)
+
+    # Leading process (hostname:pid) and the lock backend it holds
+    holder = Column(String(255), nullable=True)
+    backend = Column(String(50), nullable=True)
+
+    # Timestamps using DATETIME for MySQL compatibility
+    acquired_at = Column(DateTime, nullable=True)
+    last_heartbeat = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<LeaderStatus {self.name} {self.holder}>'
+
+    def is_stale(self, check_seconds):
+        """True if the holder missed several checks (it probably died without releasing)"""
+        if not self.last_heartbeat:
+            return True
+        return datetime.utcnow() - self.last_heartbeat > timedelta(seconds=check_seconds * 3)
+
+    def to_dict(self, check_seconds=None):
+        """Convert leader status to dictionary for JSON responses"""
+        from config import Config
+
+        return {
+            'name': self.name,
+            'holder': self.holder,
+            'backend': self.backend,
+            'acquired_at': self.acquired_at.isoformat() if self.acquired_at else None,
+            'last_heartbeat': self.last_heartbeat.isoformat() if self.last_heartbeat else None,
+            'stale': self.holder is not None and self.is_stale(check_seconds or Config.LEADER_CHECK_SECONDS)
+        }
+
+    @classmethod
+    def get(cls, name):
+        return db.session.get(cls, name)
+
+    @classmethod
+    def report(cls, name, holder, backend, acquired_at):
+        """Record that ``holder`` leads ``name`` (called by the leader on every check)"""
+        row = db.session.get(cls, name)
+        if row is None:
+            row = cls(name=name)
+            db.session.add(row)
+        row.holder = holder
+        row.backend = backend
+        row.acquired_at = acquired_at
+        row.last_heartbeat = datetime.utcnow()
+        db.session.commit()
+
+    @classmethod
+    def release(cls, name, holder):
+        """Clear the row if ``holder`` still owns it"""
+        row = db.session.get(cls, name)
+        if row is not None and row.holder == holder:
+            row.holder = None
+            row.last_heartbeat = datetime.utcnow()
+            db.session.commit()
@@ -0,0 +1,60 @@
+# GovTracker2 Python Migration by Replit Agent
+from database import db
+from sqlalchemy import Column, Integer, DateTime, String, ForeignKey
+from datetime import datetime
+
+class PendingHelpRequest(db.Model):
+    """Help request still waiting for a curator response.
+
+    Written by the Discord bot so in-flight response timing survives a
+    restart; rows are deleted once answered, removed or expired.
+    """
+    __tablename__ = 'pending_help_requests'
+
+    # MySQL compatible AUTO_INCREMENT primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Discord message that asked for help
+    message_id = Column(String(255), nullable=False, unique=True)
+    guild_id = Column(String(255), nullable=False)
+    channel_id = Column(String(255), nullable=False)
+    author_id = Column(String(255), nullable=True)
+
+    # Tracked server
+    server_id = Column(Integer, ForeignKey('discord_servers.id'), nullable=False, index=True)
+
+    # Keyword or role mention that triggered tracking
+    trigger = Column(String(500), nullable=True)
+
+    # Timestamps using DATETIME for MySQL compatibility
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<PendingHelpRequest {self.message_id} expires {self.expires_at}>'
+
+    def to_dict(self):
+        """Convert pending help request to dictionary for JSON responses"""
+        return {
+            'id': self.id,
+            'message_id': self.message_id,
+            'guild_id': self.guild_id,
+            'channel_id': self.channel_id,
+            'author_id': self.author_id,
+            'server_id': self.server_id,
+            'trigger': self.trigger,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None
+        }
+
+    @classmethod
+    def load_active(cls, now=None):
+        """Delete expired rows and return the rest as plain tuples"""
+        now = now or datetime.utcnow()
+        cls.query.filter(cls.expires_at <= now).delete(synchronize_session=False)
+        db.session.commit()
+
+        return db.session.query(
+            cls.message_id, cls.guild_id, cls.channel_id, cls.author_id,
+            cls.server_id, cls.trigger, cls.created_at, cls.expires_at
+        ).order_by(cls.expires_at).all()
@@ -2,6 +2,7 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from models.activity import Activity
+from models.curator_server_daily import CuratorServerDaily
 from models.curator import Curator
 from models.discord_server import DiscordServer
 from config import Config
@@ -19,20 +20,9 @@ def get_activities():
         curator_id = request.args.get('curator_id', type=int)
         activity_type = request.args.get('type')
         
-        query = Activity.query
-        
-        # Apply filters
-        if server_id:
-            query = query.filter_by(server_id=server_id)
-        
-        if curator_id:
-            query = query.filter_by(curator_id=curator_id)
-        
-        if activity_type:
-            query = query.filter_by(type=activity_type)
-        
-        activities = query.order_by(Activity.timestamp.desc()).limit(limit).all()
-        activities_data = [activity.to_dict() for activity in activities]
+        activities_data = Activity.get_feed(
+            limit=limit, server_id=server_id, curator_id=curator_id, activity_type=activity_type
+        )
         
         return jsonify(activities_data)
         
@@ -49,20 +39,9 @@ def get_recent_activities():
         curator_id = request.args.get('curator_id', type=int)
         activity_type = request.args.get('type')
         
-        query = Activity.query
-        
-        # Apply filters
-        if server_id:
-            query = query.filter_by(server_id=server_id)
-        
-        if curator_id:
-            query = query.filter_by(curator_id=curator_id)
-        
-        if activity_type:
-            query = query.filter_by(type=activity_type)
-        
-        activities = query.order_by(Activity.timestamp.desc()).limit(limit).all()
-        activities_data = [activity.to_dict() for activity in activities]
+        activities_data = Activity.get_feed(
+            limit=limit, server_id=server_id, curator_id=curator_id, activity_type=activity_type
+        )
         
         return jsonify(activities_data)
         
@@ -78,50 +57,7 @@ def get_daily_activities():
         server_id = request.args.get('server_id', type=int)
         curator_id = request.args.get('curator_id', type=int)
         
-        # Get base daily stats
-        daily_stats = Activity.get_daily_stats(days=days)
-        
-        # Apply additional filtering if needed
-        if server_id or curator_id:
-            from datetime import datetime, timedelta
-            from sqlalchemy import func
-            
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            query = db.session.query(
-                func.date(Activity.timestamp).label('date'),
-                func.count(Activity.id).label('count'),
-                Activity.type
-            ).filter(Activity.timestamp >= cutoff_date)
-            
-            if server_id:
-                query = query.filter(Activity.server_id == server_id)
-            
-            if curator_id:
-                query = query.filter(Activity.curator_id == curator_id)
-            
-            filtered_stats = query.group_by(
-                func.date(Activity.timestamp),
-                Activity.type
-            ).all()
-            
-            # Reformat filtered results
-            result = {}
-            for stat in filtered_stats:
-                date_str = str(stat.date)
-                if date_str not in result:
-                    result[date_str] = {
-                        'date': date_str,
-                        'total': 0,
-                        'messages': 0,
-                        'reactions': 0,
-                        'replies': 0,
-                        'task_verifications': 0
-                    }
-                
-                result[date_str][stat.type + 's'] = stat.count
-                result[date_str]['total'] += stat.count
-            
-            daily_stats = list(result.values())
+        daily_stats = Activity.get_daily_stats(days=days, server_id=server_id, curator_id=curator_id)
         
         return jsonify(daily_stats)
         
@@ -166,6 +102,13 @@ def create_activity():
         activity.timestamp = datetime.utcnow()
         
         db.session.add(activity)
+        CuratorServerDaily.record([{
+            'curator_id': activity.curator_id,
+            'server_id': activity.server_id,
+            'type': activity.type,
+            'points': activity.points,
+            'timestamp': activity.timestamp
+        }])
         
         # Update curator's total points
         curator.total_points += points
@@ -278,7 +221,9 @@ def export_activities():
         from datetime import datetime, timedelta
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        activities = Activity.query.filter(Activity.timestamp >= cutoff_date).order_by(Activity.timestamp.desc()).all()
+        activities = Activity.feed_query().filter(
+            Activity.timestamp >= cutoff_date
+        ).order_by(Activity.timestamp.desc()).all()
         
         if format_type.lower() == 'csv':
             import csv
@@ -294,8 +239,8 @@ def export_activities():
             for activity in activities:
                 writer.writerow([
                     activity.id,
-                    activity.curator.name if activity.curator else '',
-                    activity.discord_server.name if activity.discord_server else '',
+                    activity.curator_name or '',
+                    activity.server_name or '',
                     activity.type,
                     activity.content or '',
                     activity.points,
@@ -310,7 +255,7 @@ def export_activities():
         
         else:
             # JSON format
-            activities_data = [activity.to_dict() for activity in activities]
+            activities_data = [Activity.feed_row_to_dict(activity) for activity in activities]
             return jsonify(activities_data)
         
     except Exception as e:
@@ -3,9 +3,11 @@ from flask import Blueprint, request, jsonify
 from app import db
 from models.curator import Curator
 from models.activity import Activity
+from models.curator_server_daily import CuratorServerDaily
 from models.response_tracking import ResponseTracking
 from models.discord_server import DiscordServer
 from utils.rating import calculate_curator_rating
+from utils import bot_bridge
 import logging
 from datetime import datetime
 
@@ -16,7 +18,8 @@ def get_curators():
     """Get list of all curators"""
     try:
         curators = Curator.query.all()
-        curators_data = [curator.to_dict() for curator in curators]
+        stats = Curator.load_batch_stats(curators)
+        curators_data = [curator.to_dict(stats=stats[curator.id]) for curator in curators]
         return jsonify(curators_data)
     except Exception as e:
         logging.error(f"Error getting curators: {e}")
@@ -84,14 +87,15 @@ def get_curator_stats(curator_id):
         rating_data = calculate_curator_rating(curator_id)
         
         # Recent activities
-        recent_activities = Activity.get_activity_by_curator(curator_id, limit=20)
-        recent_activities_data = [activity.to_dict() for activity in recent_activities]
+        recent_activities_data = Activity.get_feed(limit=20, curator_id=curator_id)
         
-        # Monthly breakdown
-        monthly_activities = Activity.query.filter_by(curator_id=curator_id).all()
+        # Monthly breakdown (from the daily rollup)
+        daily_totals = CuratorServerDaily.summarize(
+            CuratorServerDaily.day, CuratorServerDaily.type, curator_id=curator_id
+        )
         monthly_breakdown = {}
-        for activity in monthly_activities:
-            month_key = activity.timestamp.strftime('%Y-%m')
+        for day_total in daily_totals:
+            month_key = day_total.day.strftime('%Y-%m')
             if month_key not in monthly_breakdown:
                 monthly_breakdown[month_key] = {
                     'messages': 0,
@@ -100,8 +104,9 @@ def get_curator_stats(curator_id):
                     'task_verifications': 0,
                     'total_points': 0
                 }
-            monthly_breakdown[month_key][activity.type + 's'] += 1
-            monthly_breakdown[month_key]['total_points'] += activity.points
+            type_key = day_total.type + 's'
+            monthly_breakdown[month_key][type_key] = monthly_breakdown[month_key].get(type_key, 0) + day_total.count
+            monthly_breakdown[month_key]['total_points'] += day_total.points or 0
         
         stats_data = {
             'curator': curator_data,
@@ -152,6 +157,7 @@ def create_curator():
             curator.assigned_servers = data['assigned_servers'] if data['assigned_servers'] else []
         
         db.session.commit()
+        bot_bridge.curator_changed(curator)
         
         return jsonify(curator.to_dict()), 201
         
@@ -181,6 +187,7 @@ def update_curator(curator_id):
         curator.updated_at = datetime.utcnow()
         
         db.session.commit()
+        bot_bridge.curator_changed(curator)
         
         return jsonify(curator.to_dict())
         
@@ -194,13 +201,16 @@ def delete_curator(curator_id):
     """Delete a curator"""
     try:
         curator = Curator.query.get_or_404(curator_id)
+        discord_id = curator.discord_id
         
-        # Delete associated activities and response tracking
+        # Delete associated activities (with their daily rollup) and response tracking
+        CuratorServerDaily.query.filter_by(curator_id=curator_id).delete()
         Activity.query.filter_by(curator_id=curator_id).delete()
         ResponseTracking.query.filter_by(curator_id=curator_id).delete()
         
         db.session.delete(curator)
         db.session.commit()
+        bot_bridge.curator_removed(discord_id)
         
         return jsonify({'message': 'Curator deleted successfully'})
         
@@ -223,8 +233,9 @@ def search_curators():
                 Curator.discord_id.ilike(f'%{query}%')
             )
         ).limit(20).all()
+        stats = Curator.load_batch_stats(curators)
         
-        return jsonify([curator.to_dict() for curator in curators])
+        return jsonify([curator.to_dict(stats=stats[curator.id]) for curator in curators])
         
     except Exception as e:
         logging.error(f"Error searching curators: {e}")
@@ -249,12 +260,16 @@ def get_leaderboard():
             pass
         
         curators = query.limit(limit).all()
+        stats = Curator.load_batch_stats(curators)
         
         leaderboard_data = []
         for rank, curator in enumerate(curators, 1):
-            curator_data = curator.to_dict()
+            curator_stats = stats[curator.id]
+            curator_data = curator.to_dict(stats=curator_stats)
             curator_data['rank'] = rank
-            curator_data['activity_stats'] = curator.get_activity_stats(days=30)
+            curator_data['activity_stats'] = {
+                key: value for key, value in curator_stats.items() if key != 'average_response_time'
+            }
             leaderboard_data.append(curator_data)
         
         return jsonify(leaderboard_data)
@@ -292,58 +307,30 @@ def get_curator_details(curator_id):
         
         # Recent activities with details
         try:
-            recent_activities = Activity.query.filter_by(curator_id=curator_id).order_by(Activity.timestamp.desc()).limit(50).all()
-            recent_activities_data = []
-            for activity in recent_activities:
-                activity_dict = activity.to_dict()
-                # Add server name
-                if hasattr(activity, 'discord_server') and activity.discord_server:
-                    activity_dict['server_name'] = activity.discord_server.name
-                recent_activities_data.append(activity_dict)
+            recent_activities_data = Activity.get_feed(limit=50, curator_id=curator_id)
         except:
             recent_activities_data = []
         
-        # Monthly performance breakdown
-        from datetime import datetime, timedelta
-        from sqlalchemy import func, extract
-        
-        # Get activities for the last 12 months
-        twelve_months_ago = datetime.utcnow() - timedelta(days=365)
-        monthly_data = db.session.query(
-            extract('year', Activity.timestamp).label('year'),
-            extract('month', Activity.timestamp).label('month'),
-            Activity.type,
-            func.count(Activity.id).label('count'),
-            func.sum(Activity.points).label('points')
-        ).filter(
-            Activity.curator_id == curator_id,
-            Activity.timestamp >= twelve_months_ago
-        ).group_by(
-            extract('year', Activity.timestamp),
-            extract('month', Activity.timestamp),
-            Activity.type
-        ).all()
+        # Monthly performance breakdown for the last 12 months (from the daily rollup)
+        daily_totals = CuratorServerDaily.summarize(
+            CuratorServerDaily.day, CuratorServerDaily.type, days=365, curator_id=curator_id
+        )
         
         # Organize monthly data
         monthly_breakdown = {}
-        for data in monthly_data:
-            month_key = f"{int(data.year)}-{int(data.month):02d}"
+        for day_total in daily_totals:
+            month_key = day_total.day.strftime('%Y-%m')
             if month_key not in monthly_breakdown:
                 monthly_breakdown[month_key] = {
                     'messages': 0, 'reactions': 0, 'replies': 0, 
                     'task_verifications': 0, 'total_points': 0
                 }
-            monthly_breakdown[month_key][f"{data.type}s"] = data.count
-            monthly_breakdown[month_key]['total_points'] += data.points or 0
+            type_key = f"{day_total.type}s"
+            monthly_breakdown[month_key][type_key] = monthly_breakdown[month_key].get(type_key, 0) + day_total.count
+            monthly_breakdown[month_key]['total_points'] += day_total.points or 0
         
         # Server activity breakdown
-        server_activities = db.session.query(
-            Activity.server_id,
-            func.count(Activity.id).label('activity_count'),
-            func.sum(Activity.points).label('total_points')
-        ).filter(
-            Activity.curator_id == curator_id
-        ).group_by(Activity.server_id).all()
+        server_activities = CuratorServerDaily.summarize(CuratorServerDaily.server_id, curator_id=curator_id)
         
         server_breakdown = []
         for server_data in server_activities:
@@ -352,18 +339,21 @@ def get_curator_details(curator_id):
                 server_breakdown.append({
                     'server_id': server.id,
                     'server_name': server.name,
-                    'activity_count': server_data.activity_count,
-                    'total_points': server_data.total_points or 0
+                    'activity_count': server_data.count,
+                    'total_points': server_data.points or 0
                 })
         
         # Assigned servers details
         assigned_servers_details = []
         if curator.assigned_servers:
+            server_metrics = DiscordServer.load_batch_metrics()
             for server_id in curator.assigned_servers:
                 try:
                     server = DiscordServer.query.get(int(server_id))
                     if server:
-                        assigned_servers_details.append(server.to_dict())
+                        assigned_servers_details.append(
+                            server.to_dict(server_metrics.get(server.id, DiscordServer.EMPTY_METRICS))
+                        )
                 except (ValueError, TypeError):
                     continue
         
@@ -50,8 +50,7 @@ def get_dashboard_stats():
             
             # Recent activities
             try:
-                recent_activities = Activity.get_recent_activities(limit=10)
-                recent_activities_data = [activity.to_dict() for activity in recent_activities]
+                recent_activities_data = Activity.get_feed(limit=10)
             except:
                 recent_activities_data = []
             
@@ -97,28 +96,18 @@ def get_dashboard_stats():
 def get_activity_summary():
     """Get activity summary for charts"""
     try:
-        from datetime import datetime, timedelta
-        from sqlalchemy import func
+        from models.curator_server_daily import CuratorServerDaily
         
         # Last 7 days activity summary
-        cutoff_date = datetime.utcnow() - timedelta(days=7)
-        
-        from app import db
-        
-        activity_summary = db.session.query(
-            func.date(Activity.timestamp).label('date'),
-            Activity.type,
-            func.count(Activity.id).label('count')
-        ).filter(
-            Activity.timestamp >= cutoff_date
-        ).group_by(
-            func.date(Activity.timestamp),
-            Activity.type
-        ).all()
+        activity_summary = CuratorServerDaily.summarize(
+            CuratorServerDaily.day.label('date'),
+            CuratorServerDaily.type,
+            days=7
+        )
         
         # Format for frontend charts
         summary_data = {}
-        for item in activity_summary:
+        for item in sorted(activity_summary, key=lambda item: item.date):
             date_str = str(item.date)
             if date_str not in summary_data:
                 summary_data[date_str] = {
@@ -3,6 +3,8 @@ from flask import Blueprint, request, jsonify
 from app import db
 from models.discord_server import DiscordServer
 from models.activity import Activity
+from models.curator_server_daily import CuratorServerDaily
+from utils import bot_bridge
 import logging
 from datetime import datetime
 
@@ -12,13 +14,20 @@ servers_bp = Blueprint('servers', __name__)
 def get_servers():
     """Get list of all Discord servers"""
     try:
-        # Use a separate session to avoid transaction conflicts
         servers = DiscordServer.query.all()
         servers_data = []
         
+        # Statistics for all servers in one query (short-lived cache); the list still loads without them
+        try:
+            metrics = DiscordServer.load_batch_metrics()
+        except Exception as e:
+            logging.warning(f"Error loading server metrics: {e}")
+            db.session.rollback()
+            metrics = {}
+        
         for server in servers:
             try:
-                # Get basic server data with safer statistics calculation
+                server_metrics = metrics.get(server.id, DiscordServer.EMPTY_METRICS)
                 server_dict = {
                     'id': server.id,
                     'server_id': server.server_id,
@@ -28,31 +37,16 @@ def get_servers():
                     'tasks_channel_id': server.tasks_channel_id,
                     'reminder_interval_seconds': server.reminder_interval_seconds or 300,
                     'auto_reminder_enabled': server.auto_reminder_enabled if server.auto_reminder_enabled is not None else True,
+                    'help_keywords': server.get_help_keywords(),
                     'is_active': server.is_active,
                     'created_at': server.created_at.isoformat() if server.created_at else None,
                     'updated_at': server.updated_at.isoformat() if server.updated_at else None,
-                    'activity_count': 0,
-                    'curator_count': 0,
-                    'avg_response_time': 0,
-                    'reactions_count': 0
+                    'activity_count': server_metrics['activity_count'],
+                    'curator_count': server_metrics['curator_count'],
+                    'avg_response_time': server_metrics['avg_response_time'],
+                    'reactions_count': server_metrics['reactions_count']
                 }
                 
-                # Try to get statistics, but don't fail if they error
-                try:
-                    server_dict['activity_count'] = server.get_activity_count()
-                except:
-                    pass
-                    
-                try:
-                    server_dict['curator_count'] = server.get_curator_count()
-                except:
-                    pass
-                    
-                try:
-                    server_dict['reactions_count'] = server.get_reactions_count()
-                except:
-                    pass
-                
                 servers_data.append(server_dict)
                 
             except Exception as e:
@@ -111,12 +105,14 @@ def create_server():
         server.tasks_channel_id = data.get('tasks_channel_id')
         server.reminder_interval_seconds = data.get('reminder_interval_seconds', 300)
         server.auto_reminder_enabled = data.get('auto_reminder_enabled', True)
+        server.set_help_keywords(data.get('help_keywords'))
         server.is_active = data.get('is_active', True)
         server.created_at = datetime.utcnow()
         server.updated_at = datetime.utcnow()
         
         db.session.add(server)
         db.session.commit()
+        bot_bridge.server_changed(server)
         
         return jsonify(server.to_dict()), 201
         
@@ -145,10 +141,13 @@ def update_server(server_id):
             server.reminder_interval_seconds = data['reminder_interval_seconds']
         if 'auto_reminder_enabled' in data:
             server.auto_reminder_enabled = data['auto_reminder_enabled']
+        if 'help_keywords' in data:
+            server.set_help_keywords(data['help_keywords'])
         if 'is_active' in data:
             server.is_active = data['is_active']
         
         db.session.commit()
+        bot_bridge.server_changed(server)
         
         return jsonify(server.to_dict())
         
@@ -162,12 +161,15 @@ def delete_server(server_id):
     """Delete a Discord server"""
     try:
         server = DiscordServer.query.get_or_404(server_id)
+        guild_id = server.server_id
         
-        # Delete associated activities
+        # Delete associated activities and their daily rollup
+        CuratorServerDaily.query.filter_by(server_id=server_id).delete()
         Activity.query.filter_by(server_id=server_id).delete()
         
         db.session.delete(server)
         db.session.commit()
+        bot_bridge.server_removed(guild_id)
         
         return jsonify({'message': 'Server deleted successfully'})
         
@@ -201,39 +203,26 @@ def get_server_stats(server_id):
             for curator in active_curators
         ]
         
-        # Activity breakdown by type
-        from datetime import datetime, timedelta
-        from sqlalchemy import func
-        
-        cutoff_date = datetime.utcnow() - timedelta(days=30)
-        
-        activity_breakdown = db.session.query(
-            Activity.type,
-            func.count(Activity.id).label('count')
-        ).filter(
-            Activity.server_id == server_id,
-            Activity.timestamp >= cutoff_date
-        ).group_by(Activity.type).all()
+        # Activity breakdown by type (last 30 days, from the daily rollup)
+        activity_breakdown = CuratorServerDaily.summarize(
+            CuratorServerDaily.type, days=30, server_id=server_id
+        )
         
         breakdown_data = {}
         for item in activity_breakdown:
             breakdown_data[item.type] = item.count
         
         # Daily activity trend
-        daily_trend = db.session.query(
-            func.date(Activity.timestamp).label('date'),
-            func.count(Activity.id).label('count')
-        ).filter(
-            Activity.server_id == server_id,
-            Activity.timestamp >= cutoff_date
-        ).group_by(func.date(Activity.timestamp)).all()
+        daily_trend = CuratorServerDaily.summarize(
+            CuratorServerDaily.day.label('date'), days=30, server_id=server_id
+        )
         
         trend_data = [
             {
                 'date': str(item.date),
                 'count': item.count
             }
-            for item in daily_trend
+            for item in sorted(daily_trend, key=lambda item: item.date)
         ]
         
         stats_data = {
@@ -258,8 +247,7 @@ def get_server_activities(server_id):
         server = DiscordServer.query.get_or_404(server_id)
         limit = request.args.get('limit', 100, type=int)
         
-        activities = Activity.get_activity_by_server(server_id, limit=limit)
-        activities_data = [activity.to_dict() for activity in activities]
+        activities_data = Activity.get_feed(limit=limit, server_id=server_id)
         
         return jsonify({
             'server_id': server_id,
@@ -276,7 +264,11 @@ def get_active_servers():
     """Get only active servers"""
     try:
         servers = DiscordServer.get_active_servers()
-        servers_data = [server.to_dict() for server in servers]
+        metrics = DiscordServer.load_batch_metrics()
+        servers_data = [
+            server.to_dict(metrics.get(server.id, DiscordServer.EMPTY_METRICS))
+            for server in servers
+        ]
         return jsonify(servers_data)
     except Exception as e:
         logging.error(f"Error getting active servers: {e}")
@@ -313,9 +305,12 @@ def initialize_default_servers():
             server.updated_at = datetime.utcnow()
             
             db.session.add(server)
-            created_servers.append(server_data['name'])
+            created_servers.append(server)
         
         db.session.commit()
+        for server in created_servers:
+            bot_bridge.server_changed(server)
+        created_servers = [server.name for server in created_servers]
         
         return jsonify({
             'message': f'Инициализировано серверов: {len(created_servers)}',
@@ -335,6 +330,7 @@ def toggle_server_status(server_id):
         server.is_active = not server.is_active
         
         db.session.commit()
+        bot_bridge.server_changed(server)
         
         return jsonify({
             'message': f'Server {"activated" if server.is_active else "deactivated"} successfully',
@@ -6,6 +6,9 @@ import os
 
 settings_bp = Blueprint('settings', __name__)
 
+# Upper bound for discord_bot.max_servers (larger deployments run the bot sharded)
+MAX_SERVERS_LIMIT = 10000
+
 # Default settings configuration
 DEFAULT_SETTINGS = {
     'discord_bot': {
@@ -108,8 +111,8 @@ def update_settings():
         if 'discord_bot' in data:
             discord_settings = data['discord_bot']
             if 'max_servers' in discord_settings:
-                if not isinstance(discord_settings['max_servers'], int) or discord_settings['max_servers'] < 1 or discord_settings['max_servers'] > 20:
-                    return jsonify({'error': 'max_servers must be between 1 and 20'}), 400
+                if not isinstance(discord_settings['max_servers'], int) or discord_settings['max_servers'] < 1 or discord_settings['max_servers'] > MAX_SERVERS_LIMIT:
+                    return jsonify({'error': f'max_servers must be between 1 and {MAX_SERVERS_LIMIT}'}), 400
         
         if 'rating_system' in data:
             rating_settings = data['rating_system']
@@ -195,8 +198,8 @@ def validate_settings():
             
             if 'max_servers' in discord_settings:
                 max_servers = discord_settings['max_servers']
-                if not isinstance(max_servers, int) or max_servers < 1 or max_servers > 20:
-                    validation_errors.append('max_servers must be between 1 and 20')
+                if not isinstance(max_servers, int) or max_servers < 1 or max_servers > MAX_SERVERS_LIMIT:
+                    validation_errors.append(f'max_servers must be between 1 and {MAX_SERVERS_LIMIT}')
         
         # Validate rating system settings
         if 'rating_system' in data:
@@ -0,0 +1,65 @@
+# GovTracker2 Python Migration by Replit Agent
+from flask import Blueprint, jsonify
+from models.bot_shard_status import BotShardStatus
+from models.leader_status import LeaderStatus
+from config import Config
+import logging
+
+system_bp = Blueprint('system', __name__)
+
+@system_bp.route('/shards', methods=['GET'])
+def get_shard_status():
+    """Get health of every Discord gateway shard as last reported by the bot processes"""
+    try:
+        shards = [row.to_dict() for row in BotShardStatus.get_all()]
+        healthy = [s for s in shards if s['status'] == 'ready' and not s['stale']]
+
+        return jsonify({
+            'shards': shards,
+            'summary': {
+                'bot_mode': Config.BOT_MODE,
+                'shard_count': shards[0]['shard_count'] if shards else 0,
+                'healthy': len(healthy),
+                'unhealthy': len(shards) - len(healthy),
+                'guild_count': sum(s['guild_count'] or 0 for s in shards),
+                'processes': sorted({s['process'] for s in shards if s['process']}),
+                'heartbeat_seconds': Config.BOT_SHARD_HEARTBEAT_SECONDS
+            }
+        })
+
+    except Exception as e:
+        logging.error(f"Error getting shard status: {e}")
+        return jsonify({'error': 'Failed to get shard status'}), 500
+
+@system_bp.route('/leader', methods=['GET'])
+def get_leader_status():
+    """Get which web process holds leadership (runs the scheduler and the embedded bot)"""
+    try:
+        from utils.leader import leader_election
+
+        row = LeaderStatus.get(Config.LEADER_LOCK_NAME)
+        return jsonify({
+            'enabled': Config.LEADER_ELECTION,
+            'leader': row.to_dict() if row else None,
+            'this_process': leader_election.status() if leader_election else None
+        })
+
+    except Exception as e:
+        logging.error(f"Error getting leader status: {e}")
+        return jsonify({'error': 'Failed to get leader status'}), 500
+
+@system_bp.route('/loop', methods=['GET'])
+def get_loop_health():
+    """Get the embedded bot's event loop lag histogram and recent stalls"""
+    try:
+        from discord_bot.bot import get_bot_instance
+        bot = get_bot_instance()
+        if bot is None or bot.watchdog is None:
+            # With BOT_MODE=external the bot processes log their stalls instead
+            return jsonify({'error': 'Loop watchdog is not running in this process', 'bot_mode': Config.BOT_MODE}), 404
+
+        return jsonify(bot.watchdog.get_metrics())
+
+    except Exception as e:
+        logging.error(f"Error getting loop health: {e}")
+        return jsonify({'error': 'Failed to get loop health'}), 500
@@ -6,16 +6,18 @@ import logging
 import atexit
 
 scheduler = None
+scheduler_app = None  # Flask app the jobs run against
 
 def init_scheduler(app):
     """Initialize APScheduler for background tasks"""
-    global scheduler
+    global scheduler, scheduler_app
     
+    scheduler_app = app
     scheduler = BackgroundScheduler()
     
     # Schedule automatic backup every day at 2 AM
     scheduler.add_job(
-        func=create_automatic_backup,
+        func=run_automatic_backup,
         trigger=CronTrigger(hour=2, minute=0),
         id='daily_backup',
         name='Daily automatic backup',
@@ -35,27 +37,28 @@ def init_scheduler(app):
     logging.info("APScheduler started successfully")
     
     # Shut down the scheduler when exiting the app
-    atexit.register(lambda: scheduler.shutdown())
+    atexit.register(stop_scheduler)
+
+def stop_scheduler():
+    """Stop scheduled jobs (on exit, or when this process stops being the leader)"""
+    global scheduler
+    
+    if scheduler is not None and scheduler.running:
+        scheduler.shutdown(wait=False)
+        logging.info("APScheduler stopped")
+    scheduler = None
+
+def run_automatic_backup():
+    """Create the daily backup inside an app context (jobs run on scheduler threads)"""
+    with scheduler_app.app_context():
+        create_automatic_backup()
 
 def update_curator_ratings():
     """Update curator ratings based on recent activities"""
-    from app import app, db
-    from models.curator import Curator
-    from utils.rating import calculate_curator_rating
+    from utils.rating import update_all_ratings
     
-    with app.app_context():
-        try:
-            curators = Curator.query.all()
-            for curator in curators:
-                rating_data = calculate_curator_rating(curator.id)
-                curator.total_points = rating_data['total_points']
-                curator.rating_level = rating_data['level']
-            
-            db.session.commit()
-            logging.info(f"Updated ratings for {len(curators)} curators")
-        except Exception as e:
-            logging.error(f"Error updating curator ratings: {e}")
-            db.session.rollback()
+    with scheduler_app.app_context():
+        update_all_ratings()
 
 def get_scheduler():
     """Get the global scheduler instance"""
@@ -42,7 +42,7 @@ function updateBotSettings(botSettings) {
             
             <div>
                 <label class="block text-sm font-medium text-gray-700 dark:text-gray-300 mb-2">Максимум серверов</label>
-                <input type="number" value="${botSettings.max_servers || 8}" min="1" max="20" 
+                <input type="number" value="${botSettings.max_servers || 8}" min="1" max="10000" 
                        class="w-full px-3 py-2 border border-gray-300 dark:border-gray-600 rounded-lg focus:ring-2 focus:ring-blue-500 dark:bg-gray-700 dark:text-white"
                        onchange="updateBotSetting('max_servers', this.value)">
                 <p class="text-xs text-gray-500 dark:text-gray-400 mt-1">Максимальное количество серверов для мониторинга</p>
@@ -0,0 +1,21 @@
+# GovTracker2 Python Migration by Replit Agent
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from database import db  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """API-only app on a temporary SQLite database, inside an app context"""
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'govtracker.db'}")
+    app = create_app(components=['api'])
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
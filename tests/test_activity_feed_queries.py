@@ -0,0 +1,94 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Guard the activity feed endpoints against N+1 queries.
+
+Every feed reads curator and server names in one joined query, so the
+number of SQL statements per request must not depend on how many rows,
+curators or servers the feed covers.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from database import db
+from models.activity import Activity
+from models.curator import Curator
+from models.discord_server import DiscordServer
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+
+
+def seed(curators, servers, activities_per_curator):
+    """Add curators and servers with activities spread across all servers; returns the server ids"""
+    offset = Curator.query.count()
+    new_servers = [DiscordServer(server_id=str(9000 + offset + i), name=f'server{offset + i}') for i in range(servers)]
+    new_curators = [Curator(discord_id=str(1000 + offset + i), name=f'curator{offset + i}') for i in range(curators)]
+    db.session.add_all(new_servers + new_curators)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    db.session.add_all([
+        Activity(
+            curator_id=curator.id, server_id=new_servers[n % servers].id, type='message',
+            content='text', points=3, message_id=f'{curator.id}-{n}', timestamp=now - timedelta(minutes=n)
+        )
+        for curator in new_curators for n in range(activities_per_curator)
+    ])
+    db.session.commit()
+    return [server.id for server in new_servers]
+
+
+def get(app, url):
+    client = app.test_client()
+    with count_statements() as statements:
+        response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json(), len(statements)
+
+
+@pytest.mark.parametrize('url, key', [
+    ('/api/activities?limit=100', None),
+    ('/api/activities/recent', None),
+    ('/api/servers/{server_id}/activities', 'activities'),
+])
+def test_feed_statement_count_is_fixed(app, url, key):
+    server_ids = seed(curators=1, servers=1, activities_per_curator=1)
+    _, single_row_count = get(app, url.format(server_id=server_ids[0]))
+
+    server_ids = seed(curators=40, servers=10, activities_per_curator=10)
+    data, count = get(app, url.format(server_id=server_ids[0]))
+
+    rows = data if key is None else data[key]
+    assert len({row['curator_id'] for row in rows}) > 10
+    assert all(row['curator_name'] and row['server_name'] for row in rows)
+    assert count == single_row_count
+    assert count <= 2
+
+
+def test_dashboard_recent_activities_statement_count_is_fixed(app):
+    seed(curators=1, servers=1, activities_per_curator=1)
+    _, single_row_count = get(app, '/api/dashboard/stats')
+
+    seed(curators=40, servers=10, activities_per_curator=10)
+    data, count = get(app, '/api/dashboard/stats')
+
+    assert len({row['curator_id'] for row in data['recentActivities']}) == 10
+    assert all(row['curator_name'] and row['server_name'] for row in data['recentActivities'])
+    assert count == single_row_count
+
+    with count_statements() as statements:
+        Activity.get_feed(limit=10)
+    assert len(statements) == 1
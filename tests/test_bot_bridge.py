@@ -0,0 +1,64 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Changes made by a web worker that does not run the bot reach the bot through bot_commands.
+
+With BOT_MODE=embedded only the leader worker runs the bot. Both sides
+share one process here, so the bot-side caches are reset after each
+request to stand in for the leader's copies.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from config import Config
+from discord_bot.bridge import CommandBridge
+from discord_bot.db_executor import DatabaseExecutor
+from models.bot_command import BotCommand
+from utils import bot_bridge
+from utils.curator_index import curator_index
+from utils.server_cache import server_cache
+
+
+class RecordingNotifications:
+    def __init__(self):
+        self.sent = []
+
+    async def send_backup_notification(self, backup_info, success=True):
+        self.sent.append((backup_info, success))
+
+
+@pytest.fixture
+def bridge(app, monkeypatch):
+    """Bot-side command bridge of the leader, started after the newest command"""
+    monkeypatch.setattr(Config, 'BOT_MODE', 'embedded')
+    server_cache.load([])
+    curator_index.load([])
+    executor = DatabaseExecutor(app, pool_size=1)
+    bot = SimpleNamespace(db=executor, notification_manager=RecordingNotifications())
+    bridge = CommandBridge(bot)
+    bridge.cursor = BotCommand.latest_id()
+    yield bridge
+    executor.shutdown()
+
+
+def test_non_leader_changes_reach_embedded_bot(app, bridge):
+    client = app.test_client()
+    assert bot_bridge._embedded_bot() is None
+
+    response = client.post('/api/servers', json={'server_id': '424242', 'name': 'Tracked'})
+    assert response.status_code == 201
+    response = client.post('/api/curators', json={'discord_id': '777', 'name': 'Curator'})
+    assert response.status_code == 201
+    curator_id = response.get_json()['id']
+    bot_bridge.send_backup_notification({'id': 'backup-1'}, success=True)
+
+    # The leader's caches have not seen the requests above
+    server_cache.invalidate('424242')
+    curator_index.remove('777')
+
+    asyncio.run(bridge.poll())
+
+    assert bridge.stats == {'received': 3, 'failed': 0}
+    assert server_cache.is_tracked('424242')
+    assert curator_index.lookup('777') == curator_id
+    assert bridge.bot.notification_manager.sent == [({'id': 'backup-1'}, True)]
@@ -0,0 +1,60 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Reminders for help requests restored from pending_help_requests after a restart."""
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import insert
+
+from database import db
+from discord_bot.db_executor import DatabaseExecutor
+from discord_bot.pending import PendingRequest, PendingStore
+from discord_bot.reminders import ReminderScheduler
+from models.discord_server import DiscordServer
+from models.pending_help_request import PendingHelpRequest
+from utils.server_cache import server_cache
+
+INTERVAL = 300
+
+
+def restart(app):
+    """Restore pending requests and schedule their reminders as MessageMonitor.start_monitoring does"""
+    async def start():
+        executor = DatabaseExecutor(app, pool_size=1)
+        store = PendingStore(executor)
+        await store.load()
+        executor.shutdown()
+        scheduler = ReminderScheduler(SimpleNamespace(), store)
+        for pending in store.records():
+            scheduler.schedule(pending, server_cache.get_active(pending.guild_id))
+        return scheduler
+
+    return asyncio.run(start())
+
+
+@pytest.mark.parametrize('auto_reminder_enabled, waited, expected', [
+    (False, INTERVAL + 100, 0),  # the single reminder was sent before the restart
+    (False, INTERVAL - 100, 1),  # the single reminder is still due
+    (True, INTERVAL + 100, 1),   # repeats keep their cadence
+])
+def test_restored_request_reminders(app, auto_reminder_enabled, waited, expected):
+    server = DiscordServer(
+        server_id='9001', name='Server', curator_role_id='55',
+        reminder_interval_seconds=INTERVAL, auto_reminder_enabled=auto_reminder_enabled
+    )
+    db.session.add(server)
+    db.session.commit()
+    server_cache.load([server])
+
+    created_at = datetime.utcnow() - timedelta(seconds=waited)
+    pending = PendingRequest('1001', '9001', '77', '88', server.id, 'help', created_at, created_at + timedelta(hours=1))
+    db.session.execute(insert(PendingHelpRequest.__table__), pending.to_row())
+    db.session.commit()
+
+    scheduler = restart(app)
+
+    assert len(scheduler) == expected
+    if expected:
+        entry = scheduler._entries['1001']
+        assert entry.count == waited // INTERVAL
@@ -0,0 +1,39 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Single-server responses compute only that server's metrics.
+
+The all-server aggregate (load_batch_metrics) is for list endpoints; a
+server's own endpoints must not scan every other server's activities.
+"""
+import pytest
+
+from models.discord_server import DiscordServer
+from tests.test_activity_feed_queries import count_statements, seed
+
+
+def fail_batch(*args, **kwargs):
+    raise AssertionError('single-server response ran the all-server aggregate')
+
+
+@pytest.mark.parametrize('method, url', [
+    ('get', '/api/servers/{id}'),
+    ('put', '/api/servers/{id}'),
+    ('post', '/api/servers/{id}/toggle-status'),
+])
+def test_single_server_metrics(app, monkeypatch, method, url):
+    server_ids = seed(curators=5, servers=3, activities_per_curator=6)
+    expected = DiscordServer.load_batch_metrics(max_age=0)[server_ids[1]]
+    monkeypatch.setattr(DiscordServer, 'load_batch_metrics', fail_batch)
+
+    client = app.test_client()
+    with count_statements() as statements:
+        response = getattr(client, method)(url.format(id=server_ids[1]), json={})
+    assert response.status_code == 200, response.get_json()
+
+    data = response.get_json()
+    data = data.get('server', data)
+    assert {key: data[key] for key in expected} == expected
+    assert expected['activity_count'] == 10
+
+    # Every aggregate in the metrics statement is filtered to this server
+    metrics_sql = next(statement for statement in statements if 'avg(' in statement.lower())
+    assert metrics_sql.count('server_id = ?') == 3
@@ -7,6 +7,7 @@ from datetime import datetime
 from database import db
 from models.curator import Curator
 from models.activity import Activity
+from models.curator_server_daily import CuratorServerDaily
 from models.discord_server import DiscordServer
 from models.response_tracking import ResponseTracking
 from models.task_report import TaskReport
@@ -39,15 +40,16 @@ def create_backup(name=None, description="Manual backup", include_files=False):
         
         # Backup curators
         curators = Curator.query.all()
-        backup_data['data']['curators'] = [curator.to_dict() for curator in curators]
+        curator_stats = Curator.load_batch_stats(curators)
+        backup_data['data']['curators'] = [curator.to_dict(stats=curator_stats[curator.id]) for curator in curators]
         
         # Backup discord servers
         servers = DiscordServer.query.all()
         backup_data['data']['discord_servers'] = [server.to_dict() for server in servers]
         
         # Backup activities
-        activities = Activity.query.all()
-        backup_data['data']['activities'] = [activity.to_dict() for activity in activities]
+        activities = Activity.feed_query().order_by(Activity.id).all()
+        backup_data['data']['activities'] = [Activity.feed_row_to_dict(activity) for activity in activities]
         
         # Backup response tracking
         responses = ResponseTracking.query.all()
@@ -170,6 +172,7 @@ def restore_from_backup(backup_id, force=False, is_file_path=False):
             
             # Delete in reverse order to avoid foreign key constraints
             ResponseTracking.query.delete()
+            CuratorServerDaily.query.delete()
             Activity.query.delete()
             TaskReport.query.delete()
             Curator.query.delete()
@@ -256,6 +259,8 @@ def restore_from_backup(backup_id, force=False, is_file_path=False):
                     
                     db.session.add(activity)
             
+            db.session.flush()
+            CuratorServerDaily.rebuild()
             restored_tables.append('activities')
             statistics['activities'] = len(activities_data)
         
@@ -342,6 +347,10 @@ def restore_from_backup(backup_id, force=False, is_file_path=False):
         # Commit all changes
         db.session.commit()
         
+        # Restored rows replace everything the bot has cached
+        from utils import bot_bridge
+        bot_bridge.caches_reloaded()
+        
         logging.info(f"Backup restored successfully: {restored_tables}")
         
         return {
@@ -461,18 +470,10 @@ def create_automatic_backup():
             # Clean up old automatic backups (keep last 10)
             cleanup_old_backups()
             
-            # Send notification if bot is available
+            # Send notification through the bot (in this process or a separate one)
             try:
-                from discord_bot.bot import get_bot_instance
-                bot = get_bot_instance()
-                if bot and bot.notification_manager:
-                    import asyncio
-                    asyncio.create_task(
-                        bot.notification_manager.send_backup_notification(
-                            result['backup_info'], 
-                            success=True
-                        )
-                    )
+                from utils import bot_bridge
+                bot_bridge.send_backup_notification(result['backup_info'], success=True)
             except Exception as e:
                 logging.warning(f"Could not send backup notification: {e}")
         
@@ -481,16 +482,8 @@ def create_automatic_backup():
             
             # Send error notification
             try:
-                from discord_bot.bot import get_bot_instance
-                bot = get_bot_instance()
-                if bot and bot.notification_manager:
-                    import asyncio
-                    asyncio.create_task(
-                        bot.notification_manager.send_backup_notification(
-                            result, 
-                            success=False
-                        )
-                    )
+                from utils import bot_bridge
+                bot_bridge.send_backup_notification(result, success=False)
             except Exception as e:
                 logging.warning(f"Could not send backup error notification: {e}")
         
@@ -0,0 +1,84 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Web app side of the bridge to the Discord bot.
+
+When the bot runs in this process (BOT_MODE=embedded, on the worker that
+won the leader election) it shares this process's caches, so changes are
+applied locally and notifications are handed to the bot's event loop.
+Every other process - the other web workers, or all of them with
+BOT_MODE=external - publishes changes to the bot_commands table, which
+every bot process polls (see discord_bot/bridge.py).
+"""
+import asyncio
+import logging
+from config import Config
+from database import db
+from utils.server_cache import server_cache
+from utils.curator_index import curator_index
+
+
+def _publish(command, payload=None):
+    if _embedded_bot() is not None:
+        return None  # Already applied to the bot's caches in this process
+    from models.bot_command import BotCommand
+    try:
+        return BotCommand.publish(command, payload)
+    except Exception as e:
+        logging.error(f"Error publishing bot command {command}: {e}")
+        db.session.rollback()
+        return None
+
+
+def _embedded_bot():
+    """The bot running in this process, if any"""
+    if Config.BOT_MODE != 'embedded':
+        return None
+    from discord_bot.bot import get_bot_instance
+    bot = get_bot_instance()
+    if bot is None or bot.is_closed() or not bot.loop.is_running():
+        return None
+    return bot
+
+
+def server_changed(server):
+    """A DiscordServer row was created or updated"""
+    server_cache.refresh(server)
+    _publish('refresh_server', {'guild_id': server.server_id})
+
+
+def server_removed(guild_id):
+    server_cache.invalidate(guild_id)
+    _publish('invalidate_server', {'guild_id': str(guild_id)})
+
+
+def curator_changed(curator):
+    """A Curator row was created or updated"""
+    curator_index.add(curator)
+    _publish('refresh_curator', {'discord_id': curator.discord_id})
+
+
+def curator_removed(discord_id):
+    curator_index.remove(discord_id)
+    _publish('remove_curator', {'discord_id': str(discord_id)})
+
+
+def caches_reloaded():
+    """Servers and curators were replaced wholesale (backup restore)"""
+    from models.curator import Curator
+    from models.discord_server import DiscordServer
+    server_cache.load(DiscordServer.query.all())
+    curator_index.load(db.session.query(Curator.id, Curator.discord_id).all())
+    _publish('reload_caches')
+
+
+def send_backup_notification(backup_info, success=True):
+    """Announce a backup result in Discord; safe to call from any thread"""
+    bot = _embedded_bot()
+    if bot is not None:
+        if bot.notification_manager:
+            asyncio.run_coroutine_threadsafe(
+                bot.notification_manager.send_backup_notification(backup_info, success=success),
+                bot.loop
+            )
+        return
+    # Each shard worker announces it in the guilds it holds
+    _publish('backup_notification', {'backup_info': backup_info, 'success': success})
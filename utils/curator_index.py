@@ -0,0 +1,89 @@
+# GovTracker2 Python Migration by Replit Agent
+import threading
+import logging
+
+
+class CuratorIndex:
+    """In-memory map of Discord user id -> curator id.
+
+    Once loaded the index is authoritative, so unknown users are answered
+    without a database round trip. Before that (or if loading failed) misses
+    fall back to a lookup and the result is remembered, including negative
+    answers for users that are not curators.
+    """
+
+    MAX_NEGATIVE_ENTRIES = 100000
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_discord_id = {}
+        self._non_curators = set()
+        self.loaded = False
+
+    def load(self, curators):
+        """Replace the index with rows exposing ``id`` and ``discord_id``"""
+        with self._lock:
+            self._by_discord_id = {
+                str(curator.discord_id): curator.id
+                for curator in curators
+            }
+            self._non_curators = set()
+            self.loaded = True
+            logging.info(f"Curator index loaded: {len(self._by_discord_id)} curators")
+
+    def lookup(self, discord_id):
+        """Get curator id for a Discord user id, or None if the user is not a curator"""
+        discord_id = str(discord_id)
+        curator_id = self._by_discord_id.get(discord_id)
+        if curator_id is not None:
+            return curator_id
+        if self.loaded or discord_id in self._non_curators:
+            return None
+
+        # Index not loaded yet - resolve through the database once
+        from models.curator import Curator
+        curator = Curator.find_by_discord_id(discord_id)
+        if curator:
+            self.add(curator)
+            return curator.id
+        self._remember_non_curator(discord_id)
+        return None
+
+    def is_curator(self, discord_id):
+        return self.lookup(discord_id) is not None
+
+    def add(self, curator):
+        """Register or update a curator"""
+        with self._lock:
+            discord_id = str(curator.discord_id)
+            by_discord_id = dict(self._by_discord_id)
+            # discord_id may have changed for an existing curator
+            for old_discord_id, curator_id in self._by_discord_id.items():
+                if curator_id == curator.id and old_discord_id != discord_id:
+                    del by_discord_id[old_discord_id]
+            by_discord_id[discord_id] = curator.id
+            self._by_discord_id = by_discord_id
+            self._non_curators.discard(discord_id)
+
+    def remove(self, discord_id):
+        """Forget a curator (e.g. after deletion)"""
+        with self._lock:
+            discord_id = str(discord_id)
+            if discord_id not in self._by_discord_id:
+                return
+            by_discord_id = dict(self._by_discord_id)
+            del by_discord_id[discord_id]
+            self._by_discord_id = by_discord_id
+
+    def _remember_non_curator(self, discord_id):
+        with self._lock:
+            if len(self._non_curators) >= self.MAX_NEGATIVE_ENTRIES:
+                self._non_curators.clear()
+            self._non_curators.add(discord_id)
+
+    def __len__(self):
+        return len(self._by_discord_id)
+
+
+# Shared instance used by the Discord bot and the curators API
+curator_index = CuratorIndex()
@@ -0,0 +1,72 @@
+# GovTracker2 Python Migration by Replit Agent
+import re
+from config import Config
+
+
+def parse_keywords(value):
+    """Normalise keywords from a comma-separated string or a list"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    keywords = []
+    for keyword in value:
+        keyword = str(keyword).strip().lower()
+        if keyword and keyword not in keywords:
+            keywords.append(keyword)
+    return keywords
+
+
+def keyword_pattern(keywords):
+    """Regex alternation for keywords, factored by common prefix.
+
+    Longer continuations are tried before a keyword ends, so overlapping
+    keywords report the most specific match.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class HelpRequestMatcher:
+    """Detects help requests with one precompiled regex per server.
+
+    A message is a help request if any keyword starts a word (so "куратора"
+    and "helping" match, "unhelpful" does not) or if it mentions the
+    curator role. Keywords are folded into a prefix tree so the single
+    pattern stays cheap to scan as a server adds keywords.
+    """
+
+    def __init__(self, keywords=None, curator_role_id=None):
+        self.keywords = parse_keywords(keywords) or list(Config.HELP_KEYWORDS)
+        self.curator_role_id = curator_role_id
+        self.role_mention = f'<@&{curator_role_id}>' if curator_role_id else None
+
+        alternatives = [r'(?<!\w)' + keyword_pattern(self.keywords)]
+        if self.role_mention:
+            alternatives.append(re.escape(self.role_mention))
+        self.pattern = re.compile('|'.join(alternatives), re.IGNORECASE)
+
+    def is_help_request(self, content):
+        return self.match(content) is not None
+
+    def match(self, content):
+        """Get the matched keyword or role mention, or None"""
+        if not content:
+            return None
+        found = self.pattern.search(content)
+        return found.group(0) if found else None
@@ -0,0 +1,245 @@
+# GovTracker2 Python Migration by Replit Agent
+"""Leader election between web app processes.
+
+Every gunicorn worker imports app.py, but the scheduler (hourly ratings,
+daily backup) and the embedded bot must run once. Each process campaigns
+for a named lock; the holder runs the singleton work and the others retry
+every LEADER_CHECK_SECONDS, so a replacement takes over after the leader dies.
+
+Locks:
+- PostgreSQL: session advisory lock (pg_try_advisory_lock)
+- MySQL/MariaDB: named lock (GET_LOCK)
+- anything else (SQLite): an flock()ed lock file, which only covers one host
+
+Database locks belong to a connection the leader keeps open; if the process
+dies the server drops the connection and the lock with it.
+"""
+import logging
+import os
+import socket
+import tempfile
+import threading
+import zlib
+from datetime import datetime
+from sqlalchemy import text
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class AdvisoryLock:
+    """PostgreSQL advisory lock or MySQL/MariaDB named lock held on a dedicated connection"""
+
+    def __init__(self, engine, name):
+        self.engine = engine
+        self.name = name
+        self.dialect = engine.dialect.name
+        self.backend = 'pg_advisory_lock' if self.dialect == 'postgresql' else 'mysql_get_lock'
+        self.key = zlib.crc32(name.encode())  # advisory locks take an integer key
+        self.connection = None
+
+    def _scalar(self, connection, sql, **params):
+        value = connection.execute(text(sql), params).scalar()
+        connection.commit()  # session-level lock; do not leave a transaction open
+        return value
+
+    def acquire(self):
+        connection = self.engine.connect()
+        try:
+            if self.dialect == 'postgresql':
+                acquired = self._scalar(connection, 'SELECT pg_try_advisory_lock(:key)', key=self.key)
+            else:
+                acquired = self._scalar(connection, 'SELECT GET_LOCK(:name, 0)', name=self.name[:64]) == 1
+        except Exception:
+            connection.close()
+            raise
+        if acquired:
+            self.connection = connection
+            return True
+        connection.close()
+        return False
+
+    def alive(self):
+        """False if the lock's connection was lost (and the lock with it)"""
+        try:
+            self._scalar(self.connection, 'SELECT 1')
+            return True
+        except Exception as e:
+            logging.warning(f"Leader lock connection lost: {e}")
+            return False
+
+    def release(self):
+        if self.connection is None:
+            return
+        try:
+            if self.dialect == 'postgresql':
+                self._scalar(self.connection, 'SELECT pg_advisory_unlock(:key)', key=self.key)
+            else:
+                self._scalar(self.connection, 'SELECT RELEASE_LOCK(:name)', name=self.name[:64])
+        except Exception as e:
+            logging.debug(f"Could not release leader lock: {e}")
+        finally:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+
+
+class FileLock:
+    """Exclusive flock() on a file; the OS releases it when the process exits"""
+
+    backend = 'lock_file'
+
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+
+    def acquire(self):
+        handle = open(self.path, 'a+')
+        if fcntl is None:
+            logging.warning("fcntl not available: file leader lock cannot exclude other processes")
+        else:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(f"{socket.gethostname()}:{os.getpid()}\n")
+        handle.flush()
+        self.handle = handle
+        return True
+
+    def alive(self):
+        return self.handle is not None
+
+    def release(self):
+        if self.handle is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.handle, fcntl.LOCK_UN)
+            self.handle.close()
+        finally:
+            self.handle = None
+
+
+class LeaderElection:
+    """Campaigns for a named lock and runs callbacks when leadership is won or lost"""
+
+    def __init__(self, app, name=None, check_seconds=None):
+        self.app = app
+        self.name = name or Config.LEADER_LOCK_NAME
+        self.check_seconds = check_seconds or Config.LEADER_CHECK_SECONDS
+        self.identity = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self.acquired_at = None
+        self.lock = None
+        self._on_elected = None
+        self._on_lost = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def _make_lock(self):
+        from database import db
+        engine = db.engine
+        if Config.LEADER_BACKEND == 'file' or engine.dialect.name not in ('postgresql', 'mysql', 'mariadb'):
+            path = Config.LEADER_LOCK_FILE or os.path.join(tempfile.gettempdir(), f'{self.name}.lock')
+            return FileLock(path)
+        return AdvisoryLock(engine, self.name)
+
+    def start(self, on_elected, on_lost=None):
+        """Campaign once now (so a single process leads immediately), then keep checking in a thread"""
+        self._on_elected = on_elected
+        self._on_lost = on_lost
+        with self.app.app_context():
+            self.lock = self._make_lock()
+        self.campaign()
+        self._thread = threading.Thread(target=self._run, name='govtracker-leader', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopping.wait(self.check_seconds):
+            self.campaign()
+
+    def campaign(self):
+        """Check leadership once: heartbeat if leading, try to take the lock otherwise"""
+        with self.app.app_context():
+            try:
+                if self.is_leader:
+                    if self.lock.alive():
+                        self._report()
+                        return
+                    self._step_down("lock lost")
+                if self.lock.acquire():
+                    self.is_leader = True
+                    self.acquired_at = datetime.utcnow()
+                    logging.info(f"{self.identity} is now leader for {self.name} ({self.lock.backend})")
+                    self._report()
+                    self._callback(self._on_elected)
+            except Exception as e:
+                logging.error(f"Error in leader election for {self.name}: {e}")
+
+    def _report(self):
+        from models.leader_status import LeaderStatus
+        try:
+            LeaderStatus.report(self.name, self.identity, self.lock.backend, self.acquired_at)
+        except Exception as e:
+            logging.error(f"Error reporting leader status: {e}")
+            from database import db
+            db.session.rollback()
+
+    def _step_down(self, reason, expected=False):
+        log = logging.info if expected else logging.warning
+        log(f"{self.identity} gave up leadership for {self.name}: {reason}")
+        self.is_leader = False
+        self.acquired_at = None
+        self.lock.release()
+        self._callback(self._on_lost)
+
+    def _callback(self, callback):
+        if callback is None:
+            return
+        try:
+            callback()
+        except Exception as e:
+            logging.error(f"Error in leader election callback: {e}")
+
+    def stop(self):
+        """Release leadership (on shutdown)"""
+        self._stopping.set()
+        if not self.is_leader:
+            return
+        with self.app.app_context():
+            self._step_down("shutting down", expected=True)
+            from models.leader_status import LeaderStatus
+            try:
+                LeaderStatus.release(self.name, self.identity)
+            except Exception as e:
+                logging.debug(f"Could not clear leader status: {e}")
+
+    def status(self):
+        return {
+            'name': self.name,
+            'process': self.identity,
+            'is_leader': self.is_leader,
+            'acquired_at': self.acquired_at.isoformat() if self.acquired_at else None,
+            'backend': self.lock.backend if self.lock else None,
+            'check_seconds': self.check_seconds
+        }
+
+
+# Election of this process (None until app.py starts it)
+leader_election = None
+
+
+def start_leader_election(app, on_elected, on_lost=None):
+    global leader_election
+    leader_election = LeaderElection(app)
+    leader_election.start(on_elected, on_lost)
+    return leader_election
@@ -5,6 +5,7 @@ from models.activity import Activity
 from models.response_tracking import ResponseTracking
 from config import Config
 from database import db
+from sqlalchemy import update, bindparam
 import logging
 
 def calculate_curator_rating(curator_id, days=30):
@@ -133,24 +134,131 @@ def get_rating_distribution():
         logging.error(f"Error getting rating distribution: {e}")
         return {'Ужасно': 0}
 
-def update_all_ratings():
-    """Update ratings for all curators"""
+def _empty_rating():
+    return {
+        'total_points': 0,
+        'base_points': 0,
+        'response_bonus': 0,
+        'level': determine_rating_level(0),
+        'breakdown': {'messages': 0, 'reactions': 0, 'replies': 0, 'task_verifications': 0, 'total_activities': 0}
+    }
+
+def calculate_ratings_bulk(days=30, first_id=None, last_id=None):
+    """Calculate ratings for all curators (or an id range) with two grouped queries.
+
+    Gives the same points and levels as calculate_curator_rating, without
+    loading activity rows. Curators without activities or responses in the
+    period are not in the result (their rating is _empty_rating()).
+    """
+    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    breakdown_keys = {
+        'message': 'messages',
+        'reaction': 'reactions',
+        'reply': 'replies',
+        'task_verification': 'task_verifications'
+    }
+
+    def id_range(column):
+        criteria = []
+        if first_id is not None:
+            criteria.append(column >= first_id)
+        if last_id is not None:
+            criteria.append(column <= last_id)
+        return criteria
+
+    activity_rows = db.session.query(
+        Activity.curator_id,
+        Activity.type,
+        db.func.coalesce(db.func.sum(Activity.points), 0),
+        db.func.count(Activity.id)
+    ).filter(
+        Activity.timestamp >= cutoff_date, *id_range(Activity.curator_id)
+    ).group_by(Activity.curator_id, Activity.type).all()
+
+    response_time = ResponseTracking.response_time_seconds
+    response_rows = db.session.query(
+        ResponseTracking.curator_id,
+        db.func.count(ResponseTracking.id),
+        db.func.sum(db.case((response_time <= Config.RESPONSE_TIME_GOOD, 1), else_=0)),
+        db.func.sum(db.case((response_time >= Config.RESPONSE_TIME_POOR, 1), else_=0))
+    ).filter(
+        ResponseTracking.mention_timestamp >= cutoff_date, *id_range(ResponseTracking.curator_id)
+    ).group_by(ResponseTracking.curator_id).all()
+
+    ratings = {}
+    for curator_id, activity_type, points, count in activity_rows:
+        rating = ratings.setdefault(curator_id, _empty_rating())
+        rating['base_points'] += int(points)
+        rating['breakdown']['total_activities'] += count
+        if activity_type in breakdown_keys:
+            rating['breakdown'][breakdown_keys[activity_type]] += int(points)
+
+    for curator_id, total, good, poor in response_rows:
+        rating = ratings.setdefault(curator_id, _empty_rating())
+        rating['response_bonus'] = calculate_response_bonus({
+            'total_responses': total,
+            'good_responses': int(good or 0),
+            'poor_responses': int(poor or 0)
+        })
+
+    for rating in ratings.values():
+        rating['total_points'] = rating['base_points'] + rating['response_bonus']
+        rating['level'] = determine_rating_level(rating['total_points'])
+
+    return ratings
+
+def update_all_ratings(days=30, chunk_size=None):
+    """Update ratings for all curators.
+
+    Works through curators in id order, chunk_size at a time: one pair of
+    grouped queries per chunk, one executemany UPDATE for the curators whose
+    points or level changed, and a commit, so neither memory nor the
+    transaction grows with the number of curators.
+    """
+    chunk_size = chunk_size or Config.RATING_UPDATE_CHUNK_SIZE
+    curators = Curator.__table__
+    updated_count = 0
+    changed_count = 0
+    last_id = 0
+
     try:
-        curators = Curator.query.all()
-        updated_count = 0
-        
-        for curator in curators:
-            rating_data = calculate_curator_rating(curator.id)
-            curator.total_points = rating_data['total_points']
-            curator.rating_level = rating_data['level']
-            updated_count += 1
-        
-        db.session.commit()
-        logging.info(f"Updated ratings for {updated_count} curators")
-        
+        while True:
+            rows = db.session.query(Curator.id, Curator.total_points, Curator.rating_level).filter(
+                Curator.id > last_id
+            ).order_by(Curator.id).limit(chunk_size).all()
+            if not rows:
+                break
+
+            ratings = calculate_ratings_bulk(days, first_id=rows[0].id, last_id=rows[-1].id)
+            changes = []
+            for curator_id, total_points, rating_level in rows:
+                rating = ratings.get(curator_id) or _empty_rating()
+                if rating['total_points'] != total_points or rating['level'] != rating_level:
+                    changes.append({
+                        'b_id': curator_id,
+                        'b_points': rating['total_points'],
+                        'b_level': rating['level']
+                    })
+
+            if changes:
+                db.session.execute(
+                    update(curators)
+                    .where(curators.c.id == bindparam('b_id'))
+                    .values(total_points=bindparam('b_points'), rating_level=bindparam('b_level')),
+                    changes
+                )
+            db.session.commit()
+
+            updated_count += len(rows)
+            changed_count += len(changes)
+            last_id = rows[-1].id
+
+        logging.info(f"Updated ratings for {updated_count} curators ({changed_count} changed)")
+
         return {
             'success': True,
-            'updated_count': updated_count
+            'updated_count': updated_count,
+            'changed_count': changed_count
         }
         
     except Exception as e:
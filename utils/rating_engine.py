@@ -0,0 +1,222 @@
+# GovTracker2 Python Migration by Replit Agent
+import logging
+from datetime import datetime, timedelta
+from config import Config
+from utils.rating import calculate_response_bonus, determine_rating_level
+
+ACTIVITY_TYPES = ('message', 'reaction', 'reply', 'task_verification')
+EPOCH = datetime(1970, 1, 1)
+
+
+class _Bucket:
+    """Counters for one time slice of a curator's rating window"""
+
+    __slots__ = ('points', 'good', 'poor', 'responses')
+
+    def __init__(self):
+        self.points = dict.fromkeys(ACTIVITY_TYPES, 0)
+        self.good = 0
+        self.poor = 0
+        self.responses = 0
+
+
+class _CuratorWindow:
+    """Sliding window of buckets plus running totals for one curator"""
+
+    __slots__ = ('buckets', 'oldest', 'points', 'good', 'poor', 'responses')
+
+    def __init__(self):
+        self.buckets = {}  # bucket index -> _Bucket
+        self.oldest = None  # lowest bucket index that may still hold data
+        self.points = dict.fromkeys(ACTIVITY_TYPES, 0)
+        self.good = 0
+        self.poor = 0
+        self.responses = 0
+
+    def bucket(self, index):
+        bucket = self.buckets.get(index)
+        if bucket is None:
+            bucket = self.buckets[index] = _Bucket()
+            if self.oldest is None or index < self.oldest:
+                self.oldest = index
+        return bucket
+
+    def expire(self, cutoff_index):
+        """Drop buckets older than cutoff_index, subtracting them from the totals"""
+        if self.oldest is None or self.oldest >= cutoff_index:
+            return
+
+        if cutoff_index - self.oldest > len(self.buckets):
+            # Sparse window - cheaper to walk the buckets that exist
+            expired = [index for index in self.buckets if index < cutoff_index]
+        else:
+            expired = range(self.oldest, cutoff_index)
+
+        for index in expired:
+            bucket = self.buckets.pop(index, None)
+            if bucket is None:
+                continue
+            for activity_type, points in bucket.points.items():
+                self.points[activity_type] -= points
+            self.good -= bucket.good
+            self.poor -= bucket.poor
+            self.responses -= bucket.responses
+
+        self.oldest = cutoff_index if self.buckets else None
+
+
+class IncrementalRatingEngine:
+    """Per-curator rating counters updated in O(1) per event.
+
+    Keeps points by activity type and good/poor response counts in time
+    buckets covering the last ``days`` days. Buckets that fall out of the
+    window are expired lazily when the curator is next touched. The level
+    is derived with the same rules as ``calculate_curator_rating``; the only
+    difference is that the oldest bucket is counted in full, so the window
+    edge is accurate to ``bucket_seconds``.
+
+    Levels are only meaningful once ``loaded``. A resync journals events
+    from ``begin_resync()`` on and replays them onto the counters built
+    from the database snapshot when they are adopted.
+    """
+
+    def __init__(self, days=30, bucket_seconds=None):
+        self.days = days
+        self.bucket_seconds = bucket_seconds or Config.RATING_BUCKET_SECONDS
+        self.window_buckets = int(timedelta(days=days).total_seconds()) // self.bucket_seconds
+        self._curators = {}
+        self._journal = None  # events recorded while a resync snapshot is being read
+        self.loaded = False
+
+    def _index(self, timestamp):
+        # Timestamps are naive UTC throughout the app
+        return int((timestamp - EPOCH).total_seconds()) // self.bucket_seconds
+
+    def _window(self, curator_id, now):
+        window = self._curators.get(curator_id)
+        if window is None:
+            window = self._curators[curator_id] = _CuratorWindow()
+        window.expire(self._index(now) - self.window_buckets)
+        return window
+
+    def record_activity(self, curator_id, activity_type, points, timestamp=None):
+        """Count an activity's points for a curator"""
+        now = datetime.utcnow()
+        timestamp = timestamp or now
+        if self._journal is not None:
+            self._journal.append((self.record_activity, (curator_id, activity_type, points, timestamp)))
+        if self._index(timestamp) < self._index(now) - self.window_buckets:
+            return  # Already outside the window
+
+        window = self._window(curator_id, now)
+        bucket = window.bucket(self._index(timestamp))
+        bucket.points[activity_type] = bucket.points.get(activity_type, 0) + points
+        window.points[activity_type] = window.points.get(activity_type, 0) + points
+
+    def record_response(self, curator_id, response_time_seconds, mention_timestamp=None):
+        """Count a response for a curator; bucketed by mention time like the response stats"""
+        now = datetime.utcnow()
+        mention_timestamp = mention_timestamp or now
+        if self._journal is not None:
+            self._journal.append((self.record_response, (curator_id, response_time_seconds, mention_timestamp)))
+        if self._index(mention_timestamp) < self._index(now) - self.window_buckets:
+            return
+
+        window = self._window(curator_id, now)
+        bucket = window.bucket(self._index(mention_timestamp))
+        bucket.responses += 1
+        window.responses += 1
+        if response_time_seconds <= Config.RESPONSE_TIME_GOOD:
+            bucket.good += 1
+            window.good += 1
+        elif response_time_seconds >= Config.RESPONSE_TIME_POOR:
+            bucket.poor += 1
+            window.poor += 1
+
+    def get_rating(self, curator_id):
+        """Get rating for a curator from the running counters"""
+        window = self._window(curator_id, datetime.utcnow())
+
+        base_points = sum(window.points.values())
+        response_bonus = calculate_response_bonus({
+            'total_responses': window.responses,
+            'good_responses': window.good,
+            'poor_responses': window.poor
+        })
+        total_points = base_points + response_bonus
+
+        return {
+            'total_points': total_points,
+            'base_points': base_points,
+            'response_bonus': response_bonus,
+            'level': determine_rating_level(total_points),
+            'breakdown': {
+                'messages': window.points.get('message', 0),
+                'reactions': window.points.get('reaction', 0),
+                'replies': window.points.get('reply', 0),
+                'task_verifications': window.points.get('task_verification', 0)
+            }
+        }
+
+    def get_level(self, curator_id):
+        return self.get_rating(curator_id)['level']
+
+    def begin_resync(self):
+        """Journal events recorded from now on, for adopt() to replay"""
+        self._journal = []
+
+    def cancel_resync(self):
+        self._journal = None
+
+    def build(self, activities, responses):
+        """New engine with counters from (curator_id, type, points, timestamp) and
+        (curator_id, response_time_seconds, mention_timestamp) rows"""
+        engine = IncrementalRatingEngine(self.days, self.bucket_seconds)
+        for curator_id, activity_type, points, timestamp in activities:
+            engine.record_activity(curator_id, activity_type, points or 0, timestamp)
+        for curator_id, response_time_seconds, mention_timestamp in responses:
+            engine.record_response(curator_id, response_time_seconds, mention_timestamp)
+        engine.loaded = True
+        return engine
+
+    def adopt(self, engine):
+        """Take over the counters of a built engine and replay events journaled since begin_resync().
+
+        Call on the thread that records events, so none arrive between the
+        swap and the replay.
+        """
+        journal, self._journal = self._journal or [], None
+        # Swap whole counters, so readers on other threads never see a partial state
+        self._curators = engine._curators
+        for record, args in journal:
+            record(*args)
+        self.loaded = True
+        if journal:
+            logging.info(f"Rating engine replayed {len(journal)} events recorded during the resync")
+
+    def load(self, activities, responses):
+        """Rebuild all counters from activity and response rows (see build())"""
+        self.adopt(self.build(activities, responses))
+
+    def build_from_db(self):
+        """Engine built from the last ``days`` days of data (needs an app context)"""
+        from database import db
+        from models.activity import Activity
+        from models.response_tracking import ResponseTracking
+
+        cutoff_date = datetime.utcnow() - timedelta(days=self.days)
+        activities = db.session.query(
+            Activity.curator_id, Activity.type, Activity.points, Activity.timestamp
+        ).filter(Activity.timestamp >= cutoff_date).all()
+        responses = db.session.query(
+            ResponseTracking.curator_id, ResponseTracking.response_time_seconds, ResponseTracking.mention_timestamp
+        ).filter(ResponseTracking.mention_timestamp >= cutoff_date).all()
+
+        engine = self.build(activities, responses)
+        logging.info(f"Rating engine loaded: {len(activities)} activities, {len(responses)} responses, "
+                     f"{len(engine._curators)} curators")
+        return engine
+
+    def load_from_db(self):
+        """Rebuild counters from the database when no events are being recorded concurrently"""
+        self.adopt(self.build_from_db())
@@ -0,0 +1,364 @@
+# GovTracker2 Python Migration by Replit Agent
+"""What-if rating simulation: re-score every curator under candidate rule sets.
+
+Activities and responses are loaded once into columnar NumPy arrays. Every
+curator is then scored under each rule set (points per activity type, level
+thresholds, response time thresholds, window length) with array operations
+only, and the result is compared to the baseline (the current Config rules):
+level distribution, level changes and rank movements per rule set.
+
+    python -m utils.rating_simulator rules.json
+    python -m utils.rating_simulator rules.json --json --top 20
+
+rules.json maps a name to a rule set. Every key is optional and defaults to
+the current Config value; without "points" the points stored with each
+activity are used, exactly like calculate_curator_rating:
+
+    {
+        "cheap reactions": {"points": {"reaction": 0}, "levels": {"excellent": 60}},
+        "strict responses": {"response_good": 30, "response_poor": 180},
+        "two weeks": {"days": 14}
+    }
+
+NumPy is only needed here, not by the app: pip install numpy
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+from config import Config
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Level names in the order determine_rating_level checks them, lowest last
+LEVELS = (
+    ('excellent', 'Великолепно'),
+    ('good', 'Хорошо'),
+    ('normal', 'Нормально'),
+    ('poor', 'Плохо'),
+)
+LOWEST_LEVEL = 'Ужасно'
+LEVEL_NAMES = [name for _, name in LEVELS] + [LOWEST_LEVEL]
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("The rating simulator needs NumPy: pip install numpy")
+
+
+class RuleSet:
+    """One candidate configuration of the rating rules"""
+
+    def __init__(self, name, points=None, levels=None, response_good=None, response_poor=None, days=30):
+        self.name = name
+        # None: use the points stored with each activity (what the live rating does)
+        self.points = dict(points) if points is not None else None
+        self.levels = {**Config.RATING_LEVELS, **(levels or {})}
+        self.response_good = Config.RESPONSE_TIME_GOOD if response_good is None else response_good
+        self.response_poor = Config.RESPONSE_TIME_POOR if response_poor is None else response_poor
+        self.days = days
+
+    def __repr__(self):
+        return f'<RuleSet {self.name}>'
+
+    @classmethod
+    def current(cls):
+        """The rules the app applies today"""
+        return cls('current')
+
+    @classmethod
+    def from_dict(cls, name, data):
+        """Rule set from a JSON object; "points" overrides Config.RATING_POINTS per type"""
+        points = data.get('points')
+        return cls(
+            name,
+            points={**Config.RATING_POINTS, **points} if points is not None else None,
+            levels=data.get('levels'),
+            response_good=data.get('response_good'),
+            response_poor=data.get('response_poor'),
+            days=data.get('days', 30)
+        )
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'points': self.points if self.points is not None else 'stored',
+            'levels': self.levels,
+            'response_good': self.response_good,
+            'response_poor': self.response_poor,
+            'days': self.days
+        }
+
+
+class RatingHistory:
+    """Activities and responses as column arrays, indexed by curator position"""
+
+    def __init__(self, curator_ids, curator_names, activity_curators, activity_types, activity_points,
+                 activity_times, response_curators, response_seconds, response_times, type_names, now=None):
+        _require_numpy()
+        self.now = now or datetime.utcnow()
+        self.curator_ids = np.unique(np.concatenate([
+            np.asarray(curator_ids, dtype=np.int64),
+            np.asarray(activity_curators, dtype=np.int64),
+            np.asarray(response_curators, dtype=np.int64)
+        ]))
+        self.curator_names = curator_names or {}
+        self.type_names = list(type_names)
+
+        self.activity_curators = np.searchsorted(self.curator_ids, np.asarray(activity_curators, dtype=np.int64))
+        self.activity_types = np.asarray(activity_types, dtype=np.int64)
+        self.activity_points = np.asarray(activity_points, dtype=np.float64)
+        self.activity_times = self._seconds(activity_times)
+
+        self.response_curators = np.searchsorted(self.curator_ids, np.asarray(response_curators, dtype=np.int64))
+        self.response_seconds = np.asarray(response_seconds, dtype=np.int64)
+        self.response_times = self._seconds(response_times)
+
+    @staticmethod
+    def _seconds(timestamps):
+        # Naive UTC datetimes -> epoch seconds
+        return np.asarray(timestamps, dtype='datetime64[s]').astype(np.int64)
+
+    @property
+    def size(self):
+        return {
+            'curators': len(self.curator_ids),
+            'activities': len(self.activity_types),
+            'responses': len(self.response_seconds)
+        }
+
+    @classmethod
+    def from_rows(cls, curators, activities, responses, now=None):
+        """Build from (id, name), (curator_id, type, points, timestamp) and
+        (curator_id, response_time_seconds, mention_timestamp) rows"""
+        curators = list(curators)
+        type_codes = {}
+        activity_columns = ([], [], [], [])
+        for curator_id, activity_type, points, timestamp in activities:
+            activity_columns[0].append(curator_id)
+            activity_columns[1].append(type_codes.setdefault(activity_type, len(type_codes)))
+            activity_columns[2].append(points or 0)
+            activity_columns[3].append(timestamp)
+        response_columns = ([], [], [])
+        for curator_id, response_time_seconds, mention_timestamp in responses:
+            response_columns[0].append(curator_id)
+            response_columns[1].append(response_time_seconds)
+            response_columns[2].append(mention_timestamp)
+
+        return cls(
+            [curator_id for curator_id, _ in curators], dict(curators),
+            *activity_columns, *response_columns, type_names=type_codes, now=now
+        )
+
+    @classmethod
+    def load_from_db(cls, days=None):
+        """Load the last ``days`` days (everything if None); needs an app context"""
+        from database import db
+        from models.activity import Activity
+        from models.curator import Curator
+        from models.response_tracking import ResponseTracking
+
+        now = datetime.utcnow()
+        activities = db.session.query(Activity.curator_id, Activity.type, Activity.points, Activity.timestamp)
+        responses = db.session.query(
+            ResponseTracking.curator_id, ResponseTracking.response_time_seconds, ResponseTracking.mention_timestamp
+        )
+        if days is not None:
+            cutoff_date = now - timedelta(days=days)
+            activities = activities.filter(Activity.timestamp >= cutoff_date)
+            responses = responses.filter(ResponseTracking.mention_timestamp >= cutoff_date)
+
+        history = cls.from_rows(
+            db.session.query(Curator.id, Curator.name).all(),
+            activities.yield_per(50000),
+            responses.yield_per(50000),
+            now=now
+        )
+        logging.info(f"Rating simulator loaded {history.size}")
+        return history
+
+    def _cutoff(self, days):
+        return self._seconds([self.now - timedelta(days=days)])[0]
+
+    def score(self, rule_sets):
+        """Total points per curator for each rule set, shape (rule sets, curators)"""
+        n = len(self.curator_ids)
+        types = len(self.type_names)
+        scores = np.zeros((len(rule_sets), n), dtype=np.int64)
+
+        for days in sorted({rules.days for rules in rule_sets}):
+            group = [k for k, rules in enumerate(rule_sets) if rules.days == days]
+            cutoff = self._cutoff(days)
+
+            # Activity counts and stored points per (curator, type) are shared by the whole group
+            in_window = self.activity_times >= cutoff
+            cells = self.activity_curators[in_window] * types + self.activity_types[in_window]
+            counts = np.bincount(cells, minlength=n * types).reshape(n, types)
+            stored = np.bincount(cells, weights=self.activity_points[in_window], minlength=n * types).reshape(n, types)
+
+            # Per rule set: points per type, or the stored points for types it does not price
+            weights = np.zeros((len(group), types))
+            use_stored = np.zeros((len(group), types))
+            for row, k in enumerate(group):
+                points = rule_sets[k].points
+                for code, type_name in enumerate(self.type_names):
+                    if points is not None and type_name in points:
+                        weights[row, code] = points[type_name]
+                    else:
+                        use_stored[row, code] = 1
+            base = np.rint(counts @ weights.T + stored @ use_stored.T).astype(np.int64)
+
+            responded = self.response_times >= cutoff
+            curators = self.response_curators[responded]
+            seconds = self.response_seconds[responded]
+            total = np.bincount(curators, minlength=n)
+            for row, k in enumerate(group):
+                rules = rule_sets[k]
+                good = np.bincount(curators[seconds <= rules.response_good], minlength=n)
+                poor = np.bincount(curators[seconds >= rules.response_poor], minlength=n)
+                scores[k] = base[:, row] + response_bonus(total, good, poor)
+
+        return scores
+
+
+def response_bonus(total, good, poor):
+    """Vectorized calculate_response_bonus"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        good_percentage = good / total
+        poor_percentage = poor / total
+    bonus = good - poor
+    bonus = np.where(
+        good_percentage >= 0.8, bonus + np.floor(total * 0.2).astype(np.int64),
+        np.where(poor_percentage >= 0.5, bonus - np.floor(total * 0.3).astype(np.int64), bonus)
+    )
+    bonus = np.maximum(bonus, -total)
+    return np.where(total == 0, 0, bonus)
+
+
+def rating_levels(points, levels):
+    """Index into LEVEL_NAMES per curator, with the same if-chain as determine_rating_level"""
+    codes = np.full(points.shape, len(LEVELS), dtype=np.int64)
+    # Assign from the last check to the first so the first matching check wins
+    for code in reversed(range(len(LEVELS))):
+        codes[points >= levels[LEVELS[code][0]]] = code
+    return codes
+
+
+def ranks(points):
+    """Rank like get_curator_ranking: 1 + number of curators with more points"""
+    ordered = np.sort(points)
+    return len(points) - np.searchsorted(ordered, points, side='right') + 1
+
+
+def simulate(history, rule_sets, baseline=None, top=10):
+    """Score all curators under the baseline and each rule set and compare them"""
+    _require_numpy()
+    baseline = baseline or RuleSet.current()
+    rule_sets = [baseline] + list(rule_sets)
+
+    started = time.perf_counter()
+    scores = history.score(rule_sets)
+    codes = [rating_levels(points, rules.levels) for points, rules in zip(scores, rule_sets)]
+    positions = [ranks(points) for points in scores]
+    seconds = time.perf_counter() - started
+
+    results = []
+    for k, rules in enumerate(rule_sets):
+        points = scores[k]
+        distribution = np.bincount(codes[k], minlength=len(LEVEL_NAMES))
+        result = {
+            'rules': rules.to_dict(),
+            'distribution': dict(zip(LEVEL_NAMES, distribution.tolist())),
+            'mean_points': round(float(points.mean()), 2) if len(points) else 0,
+            'median_points': float(np.median(points)) if len(points) else 0
+        }
+        if k > 0:
+            change = positions[0] - positions[k]  # positive = moved up
+            level_change = codes[0] - codes[k]  # positive = better level
+            movers = np.argsort(-np.abs(change), kind='stable')[:top]
+            result['changes'] = {
+                'level_up': int((level_change > 0).sum()),
+                'level_down': int((level_change < 0).sum()),
+                'rank_up': int((change > 0).sum()),
+                'rank_down': int((change < 0).sum()),
+                'mean_rank_shift': round(float(np.abs(change).mean()), 2) if len(change) else 0,
+                'top_movers': [
+                    {
+                        'curator_id': int(history.curator_ids[i]),
+                        'name': history.curator_names.get(int(history.curator_ids[i])),
+                        'points': int(points[i]),
+                        'baseline_points': int(scores[0][i]),
+                        'rank': int(positions[k][i]),
+                        'baseline_rank': int(positions[0][i]),
+                        'level': LEVEL_NAMES[codes[k][i]],
+                        'baseline_level': LEVEL_NAMES[codes[0][i]]
+                    }
+                    for i in movers if change[i] != 0
+                ]
+            }
+        results.append(result)
+
+    return {
+        **history.size,
+        'seconds': round(seconds, 3),
+        'baseline': results[0],
+        'rule_sets': results[1:]
+    }
+
+
+def load_rule_sets(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return [RuleSet.from_dict(name, rules) for name, rules in data.items()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-score all curators under candidate rating rules')
+    parser.add_argument('rules', nargs='?', help='JSON file mapping names to rule sets (default: baseline only)')
+    parser.add_argument('--top', type=int, default=10, help='curators with the largest rank change to list')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        _require_numpy()
+    except RuntimeError as e:
+        sys.exit(str(e))
+    rule_sets = load_rule_sets(args.rules) if args.rules else []
+
+    from app import create_app
+    app = create_app(components=[])
+    with app.app_context():
+        started = time.perf_counter()
+        history = RatingHistory.load_from_db(days=max([30] + [rules.days for rules in rule_sets]))
+        load_seconds = time.perf_counter() - started
+    report = simulate(history, rule_sets, top=args.top)
+    report['load_seconds'] = round(load_seconds, 3)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"{report['curators']} curators, {report['activities']} activities, {report['responses']} responses "
+          f"(loaded in {report['load_seconds']}s, scored in {report['seconds']}s)")
+    for result in [report['baseline']] + report['rule_sets']:
+        print(f"\n{result['rules']['name']}: mean {result['mean_points']} points, median {result['median_points']}")
+        print("  levels: " + ", ".join(f"{name} {count}" for name, count in result['distribution'].items()))
+        changes = result.get('changes')
+        if changes is None:
+            continue
+        print(f"  vs current: level up {changes['level_up']}, down {changes['level_down']}; "
+              f"rank up {changes['rank_up']}, down {changes['rank_down']}, mean shift {changes['mean_rank_shift']}")
+        for mover in changes['top_movers']:
+            print(f"    {mover['name'] or mover['curator_id']}: rank {mover['baseline_rank']} -> {mover['rank']}, "
+                  f"{mover['baseline_points']} -> {mover['points']} points, "
+                  f"{mover['baseline_level']} -> {mover['level']}")
+
+
+if __name__ == '__main__':
+    main()
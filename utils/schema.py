@@ -0,0 +1,112 @@
+# GovTracker2 Python Migration by Replit Agent
+from sqlalchemy import inspect, text
+from database import db
+import logging
+
+# Columns added after the initial schema: (table, column, DDL type)
+ADDED_COLUMNS = [
+    ('discord_servers', 'help_keywords', 'TEXT'),
+]
+
+# Unique indexes added after the initial schema: (table, index name, columns)
+ADDED_UNIQUE_INDEXES = [
+    ('activities', 'uq_activities_message_type_curator', ('message_id', 'type', 'curator_id')),
+]
+
+
+def upgrade_schema():
+    """Apply additive schema changes that db.create_all() does not handle.
+
+    create_all() only creates missing tables, so columns added to existing
+    models are added here with plain ALTER TABLE statements that work on
+    PostgreSQL, MySQL and SQLite.
+    """
+    inspector = inspect(db.engine)
+    tables = set(inspector.get_table_names())
+    applied = []
+
+    with db.engine.begin() as connection:
+        for table, column, ddl_type in ADDED_COLUMNS:
+            if table not in tables:
+                continue
+            existing = {c['name'] for c in inspector.get_columns(table)}
+            if column not in existing:
+                connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl_type}'))
+                applied.append(f'{table}.{column}')
+
+    for table, name, columns in ADDED_UNIQUE_INDEXES:
+        if table in tables and _add_unique_index(inspector, table, name, columns):
+            applied.append(f'{table}.{name}')
+
+    if applied:
+        logging.info(f"Schema upgraded: added {', '.join(applied)}")
+    return applied
+
+
+def _add_unique_index(inspector, table, name, columns):
+    existing = {index['name'] for index in inspector.get_indexes(table)}
+    existing |= {constraint['name'] for constraint in inspector.get_unique_constraints(table)}
+    if name in existing:
+        return False
+
+    column_list = ', '.join(columns)
+    with db.engine.begin() as connection:
+        duplicates = connection.execute(text(
+            f'SELECT COUNT(*) FROM (SELECT 1 FROM {table} WHERE {columns[0]} IS NOT NULL '
+            f'GROUP BY {column_list} HAVING COUNT(*) > 1) AS duplicate_keys'
+        )).scalar()
+        if duplicates:
+            # Removing rows would change point totals, so leave that decision to an operator
+            logging.warning(
+                f"Unique index {name} not created: {duplicates} duplicate ({column_list}) groups in {table}; "
+                f"ingestion stays non-idempotent until they are removed"
+            )
+            return False
+        connection.execute(text(f'CREATE UNIQUE INDEX {name} ON {table} ({column_list})'))
+    return True
+
+
+def backfill_daily_rollup():
+    """Fill the curator_server_daily rollup from activities when it is still empty (first upgrade)"""
+    from models.activity import Activity
+    from models.curator_server_daily import CuratorServerDaily
+
+    if db.session.query(CuratorServerDaily.day).first() is not None:
+        return 0
+    if db.session.query(Activity.id).first() is None:
+        return 0
+    rows = CuratorServerDaily.rebuild()
+    db.session.commit()
+    logging.info(f"Daily rollup built from existing activities: {rows} rows")
+    return rows
+
+
+def rebuild_daily_rollup(days=None):
+    """Recompute the curator_server_daily rollup from activities (all history, or the last ``days`` days)"""
+    from datetime import datetime, timedelta
+    from models.curator_server_daily import CuratorServerDaily
+
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    rows = CuratorServerDaily.rebuild(since)
+    db.session.commit()
+    logging.info(f"Daily rollup rebuilt: {rows} rows")
+    return rows
+
+
+if __name__ == '__main__':
+    # python -m utils.schema: create missing tables and apply upgrades, nothing else
+    # python -m utils.schema --rebuild-daily-rollup [--days N]: then recompute the daily rollup
+    import argparse
+    from app import create_app, upgrade_database
+
+    parser = argparse.ArgumentParser(description='Create missing tables and apply schema upgrades')
+    parser.add_argument('--rebuild-daily-rollup', action='store_true',
+                        help='recompute curator_server_daily from activities (best with the bot stopped)')
+    parser.add_argument('--days', type=int, help='only rebuild the last DAYS days')
+    args = parser.parse_args()
+
+    app = create_app(components=[])
+    upgrade_database(app)
+    if args.rebuild_daily_rollup:
+        with app.app_context():
+            print(f"Rebuilt {rebuild_daily_rollup(args.days)} daily rollup rows")
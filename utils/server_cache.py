@@ -0,0 +1,94 @@
+# GovTracker2 Python Migration by Replit Agent
+import threading
+import logging
+
+
+class ServerConfig:
+    """Read-only snapshot of a DiscordServer row used on the bot hot path"""
+
+    __slots__ = (
+        'id', 'server_id', 'name', 'curator_role_id', 'notification_channel_id',
+        'tasks_channel_id', 'reminder_interval_seconds', 'auto_reminder_enabled',
+        'help_keywords', 'is_active', 'version'
+    )
+
+    def __init__(self, server, version):
+        self.id = server.id
+        self.server_id = str(server.server_id)
+        self.name = server.name
+        self.curator_role_id = server.curator_role_id
+        self.notification_channel_id = server.notification_channel_id
+        self.tasks_channel_id = server.tasks_channel_id
+        self.reminder_interval_seconds = server.reminder_interval_seconds or 300
+        self.auto_reminder_enabled = server.auto_reminder_enabled if server.auto_reminder_enabled is not None else True
+        self.help_keywords = server.get_help_keywords()
+        self.is_active = bool(server.is_active)
+        self.version = version
+
+    def __repr__(self):
+        return f'<ServerConfig {self.name} ({self.server_id}) v{self.version}>'
+
+
+class ServerConfigCache:
+    """In-process cache of DiscordServer settings keyed by Discord guild id.
+
+    The bot loads it once at startup; API writes refresh or invalidate single
+    entries. Every change bumps ``version`` so dependants can detect staleness.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._servers = {}
+        self.version = 0
+        self.loaded = False
+
+    def load(self, servers):
+        """Replace the cache contents with the given DiscordServer rows"""
+        with self._lock:
+            self.version += 1
+            self._servers = {
+                int(server.server_id): ServerConfig(server, self.version)
+                for server in servers
+            }
+            self.loaded = True
+            logging.info(f"Server config cache loaded: {len(self._servers)} servers (v{self.version})")
+
+    def get(self, guild_id):
+        """Get cached config for a guild, or None if unknown"""
+        return self._servers.get(int(guild_id))
+
+    def get_active(self, guild_id):
+        """Get cached config for a guild only if it is tracked and active"""
+        config = self._servers.get(int(guild_id))
+        if config and config.is_active:
+            return config
+        return None
+
+    def is_tracked(self, guild_id):
+        return self.get_active(guild_id) is not None
+
+    def active_servers(self):
+        """Get {guild_id: ServerConfig} for all active servers"""
+        return {guild_id: config for guild_id, config in self._servers.items() if config.is_active}
+
+    def refresh(self, server):
+        """Insert or update the entry for a DiscordServer row"""
+        with self._lock:
+            self.version += 1
+            servers = dict(self._servers)
+            servers[int(server.server_id)] = ServerConfig(server, self.version)
+            self._servers = servers
+
+    def invalidate(self, guild_id):
+        """Drop the entry for a guild (e.g. after the server was deleted)"""
+        with self._lock:
+            if int(guild_id) not in self._servers:
+                return
+            self.version += 1
+            servers = dict(self._servers)
+            servers.pop(int(guild_id), None)
+            self._servers = servers
+
+
+# Shared instance used by the Discord bot and the servers API
+server_cache = ServerConfigCache()